@@ -0,0 +1,4 @@
+"""Micro-benchmarks of the hot paths of ultz and of the bundled pytz.
+
+Run the whole suite with ``python -m benchmarks``, see :mod:`benchmarks.suite`.
+"""
@@ -0,0 +1,78 @@
+"""Benchmark of the lazy containers of :mod:`pytz.lazy`.
+
+Measures the creation of ``all_timezones``, ``all_timezones_set``,
+``common_timezones`` and ``common_timezones_set`` as :mod:`pytz` does at import, their
+first use, which fills them, and a membership test once they are filled. The names are
+taken from the containers of :mod:`pytz`, and not checked against the zoneinfo files,
+to only time the containers.
+
+Run with ``python -m benchmarks.bench_lazy``.
+"""
+
+import time
+from typing import Callable, List, Tuple
+
+import pytz
+from pytz.lazy import LazyList, LazySet
+
+ROUNDS = 15
+
+NUMBER = 200
+
+ALL = list(pytz.all_timezones)
+
+COMMON = list(pytz.common_timezones)
+
+
+def create() -> Tuple[List[str], List[str]]:
+    """Create the containers of timezone names as :mod:`pytz` does."""
+
+    all_timezones = LazyList(tz for tz in ALL)
+    LazySet(all_timezones)
+    common_timezones = LazyList(tz for tz in COMMON)
+    LazySet(common_timezones)
+    return all_timezones, common_timezones
+
+
+def first_use() -> None:
+    """Create the containers, and use each of them once."""
+
+    all_timezones = LazyList(tz for tz in ALL)
+    all_timezones_set = LazySet(all_timezones)
+    common_timezones = LazyList(tz for tz in COMMON)
+    common_timezones_set = LazySet(common_timezones)
+    len(all_timezones)
+    "UTC" in all_timezones_set  # pylint: disable=pointless-statement
+    len(common_timezones)
+    "UTC" in common_timezones_set  # pylint: disable=pointless-statement
+
+
+def best(function: Callable[[], object], number: int) -> float:
+    """The seconds per call of ``function``, the best of several rounds."""
+
+    times = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        times.append((time.perf_counter() - start) / number)
+    return min(times)
+
+
+def main() -> None:
+    filled = LazySet(LazyList(tz for tz in ALL))
+    len(filled)
+
+    def contains() -> None:
+        for name in COMMON:
+            name in filled  # pylint: disable=pointless-statement
+
+    print(f"{'operation':24}{'best':>12}")
+    print(f"{'create':24}{best(create, NUMBER) * 1e6:10.2f}us")
+    print(f"{'create and first use':24}{best(first_use, NUMBER) * 1e6:10.2f}us")
+    contains_time = best(contains, NUMBER) / len(COMMON)
+    print(f"{'in, filled':24}{contains_time * 1e9:10.2f}ns")
+
+
+if __name__ == "__main__":
+    main()
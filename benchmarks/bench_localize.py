@@ -0,0 +1,63 @@
+"""Benchmark of :py:meth:`pytz.tzinfo.DstTzInfo.localize`.
+
+Compares the localization through the local wall-clock time index to the previous
+implementation probing the transitions a day before and after, still used for the
+times missing from the index.
+
+Run with ``python -m benchmarks.bench_localize``.
+"""
+
+import datetime as dt
+import timeit
+from typing import Callable, List
+
+import pytz
+
+ZONES = ["Europe/Amsterdam", "US/Pacific", "Australia/Lord_Howe", "America/St_Johns"]
+
+NUMBER = 20
+
+
+def sample_times() -> List[dt.datetime]:
+    """Naive times every 5 days and 7 hours from 1970 to 2030, including times in the
+    DST gaps and folds."""
+
+    times = []
+    time = dt.datetime(1970, 1, 1)
+    step = dt.timedelta(days=5, hours=7)
+    while time < dt.datetime(2030, 1, 1):
+        times.append(time)
+        time += step
+    return times
+
+
+def run(
+    localize: Callable[[dt.datetime, bool], dt.datetime], times: List[dt.datetime]
+) -> float:
+    """Seconds per call of ``localize``, the best of 3 rounds."""
+
+    def localize_all() -> None:
+        for time in times:
+            localize(time, False)
+
+    return min(timeit.repeat(localize_all, number=NUMBER, repeat=3)) / (
+        NUMBER * len(times)
+    )
+
+
+def main() -> None:
+    times = sample_times()
+    print(f"{'zone':24}{'probing':>12}{'indexed':>12}{'speedup':>10}")
+    for zone in ZONES:
+        timezone = pytz.timezone(zone)
+        timezone.localize(times[0])  # Build the index
+        probing = run(getattr(timezone, "_localize_probing"), times)
+        indexed = run(timezone.localize, times)
+        print(
+            f"{zone:24}{probing * 1e6:10.2f}us{indexed * 1e6:10.2f}us"
+            f"{probing / indexed:9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Memory used by the timezones of the bundled pytz, when every one of them is loaded.
+
+Compares the zones built independently from their zoneinfo data to the zones loaded by
+:func:`pytz.timezone`, where the links between zones sharing the same data in the
+bundle, like ``Portugal`` and ``Europe/Lisbon``, share their transitions. The memory is
+measured with :mod:`tracemalloc`, after a first load of every zone filling the caches of
+values shared by all the zones, just after loading the zones and once they localized a
+datetime, which builds their local time index.
+
+Run with ``python -m benchmarks.bench_memory``.
+"""
+
+import datetime as dt
+import gc
+import tracemalloc
+from typing import Any, Callable, List
+
+import pytz
+from pytz.tzfile import tzinfo_from_data
+
+# pylint: disable=protected-access
+
+
+SAMPLE = dt.datetime(2020, 6, 1, 12)
+
+
+def independent(zone: str) -> Any:
+    """Build the tzinfo of ``zone`` from its own data."""
+
+    return tzinfo_from_data(zone, pytz._parse_zone(zone))
+
+
+def localized(build: Callable[[str], Any]) -> Callable[[str], Any]:
+    """Build the tzinfo of a zone with ``build``, and localize a datetime with it."""
+
+    def run(zone: str) -> Any:
+        timezone = build(zone)
+        timezone.localize(SAMPLE)
+        return timezone
+
+    return run
+
+
+def clear() -> None:
+    """Forget the zones built."""
+
+    pytz._tzinfo_cache.clear()
+    pytz._bundle_zones.clear()
+    gc.collect()
+
+
+def measure(build: Callable[[str], Any], zones: List[str]) -> int:
+    """The memory allocated to build all the ``zones``, in bytes."""
+
+    clear()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    built = [build(zone) for zone in zones]
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del built
+    return size
+
+
+def main() -> None:
+    for name in pytz.cache_info():
+        pytz.set_cache_capacity(name, None)
+    pytz.disable_persistent_cache()
+    zones = list(pytz.all_timezones)
+    bundle = pytz._get_bundle()
+    locations = {bundle.location(zone) for zone in zones}
+
+    for zone in zones:
+        localized(independent)(zone)
+
+    print(f"{len(zones)} zones, {len(zones) - len(locations)} sharing the data of another")
+    print(f"{'':16}{'independent':>14}{'shared':>14}{'saved':>14}")
+    scenarios = {
+        "loaded": (independent, pytz.timezone),
+        "localized": (localized(independent), localized(pytz.timezone)),
+    }
+    for name, (build_alone, build_shared) in scenarios.items():
+        alone = measure(build_alone, zones)
+        shared = measure(build_shared, zones)
+        print(
+            f"{name:16}{alone / 1024:11.1f}KiB{shared / 1024:11.1f}KiB"
+            f"{(alone - shared) / 1024:11.1f}KiB ({1 - shared / alone:.0%})"
+        )
+
+
+if __name__ == "__main__":
+    main()
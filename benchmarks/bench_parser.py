@@ -0,0 +1,104 @@
+"""Benchmark of the tokenizer of :mod:`ultz.parser`.
+
+Compares :func:`ultz.parser.tokenize` to the previous structure step of
+:func:`ultz.parser.parse_expression`, splitting the expression on both separators,
+stripping every part and splitting the datetime again on spaces. Only the structure of
+the expression is timed, the date and time themselves are parsed the same way by both.
+
+Run with ``python -m benchmarks.bench_parser``.
+"""
+
+import time
+from typing import Callable, List, Optional, Tuple
+
+import ultz.parser as parser
+
+QUERIES = [
+    "Paris",
+    "Europe/Amsterdam",
+    "America/Argentina/Buenos_Aires",
+    "NYC, Tokyo, London",
+    "12:30 in Tokyo",
+    "2019-05-13 12:30 in Europe/Paris",
+    "11-24 in Los Angeles",
+    "Kolkata at 09:45",
+    "Europe/Paris at 2020-12-31 23:59:59",
+    "Sydney, Auckland at 13-05-2019 08:00",
+    "noon in Paris at 12:00",
+]
+
+NUMBER = 50
+
+ROUNDS = 15
+
+
+def split_structure(expr: str) -> Optional[Tuple[str, Optional[Tuple[str, str]]]]:
+    """The previous structure step: the location, and the date and time strings."""
+
+    split_in = list(map(str.strip, expr.split(" in ")))
+    split_at = list(map(str.strip, expr.split(" at ")))
+    if len(split_in) == 1 and len(split_at) == 1:
+        return split_in[0], None
+    if len(split_in) == 2 and len(split_at) == 1:
+        location, datetime_expr = split_in[1], split_in[0]
+    elif len(split_in) == 1 and len(split_at) == 2:
+        location, datetime_expr = split_at[0], split_at[1]
+    else:
+        return None
+    datetime_split = list(map(str.strip, datetime_expr.split(" ")))
+    if len(datetime_split) > 2:
+        return location, None
+    if len(datetime_split) == 2:
+        return location, (datetime_split[0], datetime_split[1])
+    return location, (datetime_split[0], datetime_split[0])
+
+
+def token_structure(expr: str) -> Optional[Tuple[str, Optional[Tuple[str, str]]]]:
+    """The same result from :func:`ultz.parser.tokenize`."""
+
+    _, zone, datetime = parser.tokenize(expr)
+    if zone is None:
+        return None
+    location = expr[zone[0] : zone[1]]
+    if datetime is None:
+        return location, None
+    (date_start, date_end), (time_start, time_end) = datetime
+    return location, (expr[date_start:date_end], expr[time_start:time_end])
+
+
+def corpus() -> List[str]:
+    """The queries and all the prefixes typed on the way to them."""
+
+    return [query[:end] for query in QUERIES for end in range(1, len(query) + 1)]
+
+
+def run(structures: List[Callable[[str], object]], queries: List[str]) -> List[float]:
+    """Seconds per query of each structure step, the best of 15 interleaved rounds.
+
+    The rounds are interleaved to be equally affected by the noise of the machine.
+    """
+
+    best = [float("inf")] * len(structures)
+    for _ in range(ROUNDS):
+        for idx, structure in enumerate(structures):
+            start = time.perf_counter()
+            for _ in range(NUMBER):
+                for query in queries:
+                    structure(query)
+            best[idx] = min(best[idx], time.perf_counter() - start)
+    return [seconds / (NUMBER * len(queries)) for seconds in best]
+
+
+def main() -> None:
+    queries = corpus()
+    for query in queries:
+        assert split_structure(query) == token_structure(query), query
+    split, tokens = run([split_structure, token_structure], queries)
+    print(f"{'structure':24}{'mean':>12}")
+    print(f"{'split':24}{split * 1e6:10.2f}us")
+    print(f"{'tokenize':24}{tokens * 1e6:10.2f}us")
+    print(f"{'speedup':24}{split / tokens:11.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark of the timezone search of :mod:`ultz.search`.
+
+Measures the latency of the lookup of names misspelled by 1 and 2 edits, with the
+trigram index and with a linear scan computing the edit distance to every name, and the
+latency of the prefix completion.
+
+Run with ``python -m benchmarks.bench_search``.
+"""
+
+import random
+import string
+import time
+import timeit
+from typing import Callable, List
+
+import ultz.search as search
+
+SAMPLES = 200
+
+
+def misspell(name: str, edits: int, rand: random.Random) -> str:
+    """Apply ``edits`` random insertions, deletions or substitutions to ``name``."""
+
+    for _ in range(edits):
+        pos = rand.randrange(len(name))
+        char = rand.choice(string.ascii_uppercase)
+        edit = rand.randrange(3)
+        if edit == 0:
+            name = name[:pos] + char + name[pos:]
+        elif edit == 1 and len(name) > 1:
+            name = name[:pos] + name[pos + 1 :]
+        else:
+            name = name[:pos] + char + name[pos + 1 :]
+    return name
+
+
+def linear_scan(query: str, max_distance: int) -> List[str]:
+    """The names close to ``query``, without index."""
+
+    names = search._ensure_index()[0]  # pylint: disable=protected-access
+    return [
+        name
+        for name in names
+        if search.edit_distance(query, name, max_distance) <= max_distance
+    ]
+
+
+def run(lookup: Callable[[str], object], queries: List[str]) -> float:
+    """Seconds per lookup, the best of 3 rounds."""
+
+    def lookup_all() -> None:
+        for query in queries:
+            lookup(query)
+
+    return min(timeit.repeat(lookup_all, number=1, repeat=3)) / len(queries)
+
+
+def main() -> None:
+    # pylint: disable=protected-access
+    search.tzwrap.shorthands()
+    start = time.perf_counter()
+    search._ensure_index()
+    middle = time.perf_counter()
+    search._ensure_trigrams()
+    end = time.perf_counter()
+    print(f"prefix index build: {(middle - start) * 1e3:.2f}ms")
+    print(f"trigram index build: {(end - middle) * 1e3:.2f}ms")
+
+    rand = random.Random(0)
+    names = [name for name in search._ensure_index()[0] if "/" not in name]
+    # pylint: enable=protected-access
+    print(f"{'lookup':24}{'mean':>12}")
+    for distance in (1, 2):
+        queries = [
+            misspell(rand.choice(names), distance, rand) for _ in range(SAMPLES)
+        ]
+        indexed = run(lambda query: search.fuzzy(query, max_distance=distance), queries)
+        linear = run(lambda query: linear_scan(query, distance), queries)
+        print(f"{f'trigrams, distance {distance}':24}{indexed * 1e6:10.1f}us")
+        print(f"{f'linear, distance {distance}':24}{linear * 1e6:10.1f}us")
+
+    prefixes = [rand.choice(names)[: rand.randint(1, 4)] for _ in range(SAMPLES)]
+    print(f"{'prefix':24}{run(search.complete, prefixes) * 1e6:10.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""Import time of the extension, of :mod:`ultz.ultz` and of the bundled pytz.
+
+Each target is imported in a new interpreter run with ``python -X importtime``, several
+times, and the median time of each module imported is kept. The cost of a target is
+split between the modules of the project (``main``, ``ultz`` and ``pytz``), whose time
+is under our control, and the rest of the standard library they import.
+
+The measures can be saved as the baseline checked by ``tests/test_importtime.py``::
+
+    python -m benchmarks.importtime            # Compare to the baseline
+    python -m benchmarks.importtime --save     # Update the baseline
+
+``main`` imports ulauncher, and is skipped where it is not installed.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess  # nosec
+import sys
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+TARGETS = ["main", "ultz.ultz", "pytz"]
+
+RUNS = 7
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+"""The root of the repository, from which the targets are imported."""
+
+BASELINE = os.path.join(ROOT, "benchmarks", "importtime.json")
+
+PROJECT = ("main", "ultz", "pytz")
+"""The top-level packages of the project."""
+
+
+class ModuleTime(NamedTuple):
+    """The import time of a module, in microseconds."""
+
+    own: int
+    """The time spent in the module itself."""
+
+    cumulative: int
+    """The time including the modules it imported."""
+
+
+class ImportTime(NamedTuple):
+    """The import time of a target."""
+
+    total: int
+    """The time to import the target, in microseconds."""
+
+    project: int
+    """The part of ``total`` spent in the modules of the project."""
+
+    modules: Dict[str, ModuleTime]
+    """The time of each module imported by the target."""
+
+
+def is_project(module: str) -> bool:
+    """Tell if ``module`` is part of the project."""
+
+    return module.split(".", 1)[0] in PROJECT
+
+
+def parse_importtime(output: str, target: str) -> Dict[str, ModuleTime]:
+    """Parse the output of ``python -X importtime``.
+
+    :param output: The standard error of the interpreter.
+    :param target: The module imported.
+    :returns: The time of the modules imported by ``target``, which come after the
+              ones imported by the interpreter at startup.
+    """
+
+    modules: Dict[str, ModuleTime] = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # The header
+        name = fields[2].strip()
+        modules[name] = ModuleTime(int(fields[0]), int(fields[1]))
+        # A module at the top level comes after all the modules it imported
+        if fields[2][1:2] != " ":
+            if name == target:
+                return modules
+            modules.clear()
+    raise ValueError(f"{target} not found in the output of -X importtime")
+
+
+def measure_once(target: str) -> Optional[Dict[str, ModuleTime]]:
+    """Import ``target`` in a new interpreter.
+
+    :returns: The time of each module imported, ``None`` if the import failed.
+    """
+
+    process = subprocess.run(  # nosec
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=False,
+    )
+    if process.returncode != 0:
+        return None
+    return parse_importtime(process.stderr, target)
+
+
+def measure(target: str, runs: int = RUNS) -> Optional[ImportTime]:
+    """Measure the import time of ``target``, the median of several runs.
+
+    A first run, not measured, compiles the modules to bytecode if needed.
+
+    :param target: The module to import.
+    :param runs: The number of runs measured.
+    :returns: The median import time, ``None`` if the target cannot be imported, or
+              if none of the runs measured succeeded.
+    """
+
+    if measure_once(target) is None:
+        return None
+    samples: List[Dict[str, ModuleTime]] = []
+    for _ in range(runs):
+        sample = measure_once(target)
+        if sample is not None:
+            samples.append(sample)
+    if not samples:
+        return None
+
+    modules = {}
+    for name in samples[0]:
+        times = [sample[name] for sample in samples if name in sample]
+        modules[name] = ModuleTime(
+            int(statistics.median(time.own for time in times)),
+            int(statistics.median(time.cumulative for time in times)),
+        )
+    totals = [sample[target].cumulative for sample in samples]
+    projects = [
+        sum(time.own for name, time in sample.items() if is_project(name))
+        for sample in samples
+    ]
+    return ImportTime(
+        int(statistics.median(totals)), int(statistics.median(projects)), modules
+    )
+
+
+def load_baseline(path: str = BASELINE) -> Dict[str, Tuple[int, int]]:
+    """Read the baseline.
+
+    :returns: The total and project import times of each target, in microseconds.
+    """
+
+    with open(path) as baseline:
+        targets = json.load(baseline)["targets"]
+    return {
+        target: (times["total"], times["project"]) for target, times in targets.items()
+    }
+
+
+def save_baseline(results: Dict[str, ImportTime], path: str = BASELINE) -> None:
+    """Write the baseline, with the breakdown of the project modules for reference.
+
+    The targets not in ``results``, like ``main`` where ulauncher is missing, keep their
+    previous baseline.
+    """
+
+    targets = {}
+    if os.path.exists(path):
+        with open(path) as baseline:
+            targets = json.load(baseline)["targets"]
+    for target, result in results.items():
+        targets[target] = {
+            "total": result.total,
+            "project": result.project,
+            "modules": {
+                name: list(time)
+                for name, time in sorted(result.modules.items())
+                if is_project(name)
+            },
+        }
+    data = {"python": sys.version.split()[0], "targets": targets}
+    with open(path, "w") as baseline:
+        json.dump(data, baseline, indent=2)
+        baseline.write("\n")
+
+
+def report(target: str, result: ImportTime, top: int) -> None:
+    """Print the import time of ``target`` and of its slowest modules."""
+
+    print(
+        f"{target}: {result.total / 1000:.1f}ms,"
+        f" {result.project / 1000:.1f}ms in the project"
+    )
+    print(f"    {'module':40}{'self':>10}{'cumulative':>12}")
+    slowest = sorted(result.modules.items(), key=lambda item: -item[1].own)
+    for name, time in slowest[:top]:
+        marker = "*" if is_project(name) else " "
+        print(
+            f"  {marker} {name:40}{time.own / 1000:8.2f}ms"
+            f"{time.cumulative / 1000:10.2f}ms"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    arg_parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.importtime",
+        description="Measure the import time of ultz and of pytz.",
+    )
+    arg_parser.add_argument("targets", nargs="*", default=TARGETS)
+    arg_parser.add_argument("--runs", type=int, default=RUNS)
+    arg_parser.add_argument(
+        "--top", type=int, default=15, help="the number of modules listed per target"
+    )
+    arg_parser.add_argument("--save", action="store_true", help="update the baseline")
+    args = arg_parser.parse_args(argv)
+
+    baseline = load_baseline() if os.path.exists(BASELINE) else {}
+    results = {}
+    for target in args.targets:
+        result = measure(target, args.runs)
+        if result is None:
+            print(f"{target}: cannot be imported, skipped")
+            continue
+        results[target] = result
+        report(target, result, args.top)
+        if target in baseline:
+            total, project = baseline[target]
+            print(
+                f"    baseline: {total / 1000:.1f}ms,"
+                f" {project / 1000:.1f}ms in the project"
+                f" ({result.project / project:.2f}x)"
+            )
+        print()
+
+    if args.save:
+        save_baseline(results)
+        print(f"Baseline saved to {BASELINE}")
+
+
+if __name__ == "__main__":
+    main()
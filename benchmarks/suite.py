@@ -0,0 +1,327 @@
+"""Benchmark suite of the query pipeline and of the bundled pytz.
+
+Each benchmark is run for several rounds, and its time per operation is reported as
+the minimum, median and mean over the rounds. The warm benchmarks repeat the call
+``number`` times per round on the caches filled by a first call. The cold ones clear
+the relevant caches before every call, outside of the measured time.
+
+The results can be written as JSON, and compared to the ones of a previous run::
+
+    python -m benchmarks --output before.json
+    python -m benchmarks --compare before.json
+
+Run with ``python -m benchmarks``, see ``--help`` for the options.
+"""
+
+import argparse
+import datetime as dt
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import pytz
+import ultz.tzwrap as tzwrap
+import ultz.ultz as ultz
+from benchmarks.bench_localize import sample_times
+from pytz.tzfile import build_tzinfo
+from ultz.parser import ExprCode
+
+ROUNDS = 5
+
+COLD = 20
+"""The number of calls per round of the cold benchmarks."""
+
+QUERIES = {
+    ExprCode.TZ_ONLY: "Paris",
+    ExprCode.TZ_DATEIN: "2019-05-13 12:30 in Tokyo",
+    ExprCode.TZ_DATEAT: "New_York at 12-24 18:00",
+    ExprCode.ERR: "12:30 in Paris at 13:00",
+}
+"""A query of each format."""
+
+ZONE = "Europe/Paris"
+"""The timezone of the benchmarks of a single timezone."""
+
+
+class Benchmark(NamedTuple):
+    """A measured function."""
+
+    name: str
+
+    run: Callable[[], object]
+    """The measured call."""
+
+    number: int = 1
+    """The number of calls per round."""
+
+    reset: Optional[Callable[[], None]] = None
+    """Clear the caches before each call, for a cold benchmark."""
+
+    batch: int = 1
+    """The number of operations done by a call, to report the time per operation."""
+
+
+def forget_zones() -> None:
+    """Forget the timezones built by pytz, including the ones shared with the aliases
+    of a zone still alive, so that the next call builds them again."""
+
+    pytz._tzinfo_cache.clear()  # pylint: disable=protected-access
+    pytz._bundle_zones.clear()  # pylint: disable=protected-access
+
+
+def clear_zone_caches() -> None:
+    """Forget the timezones built by pytz, and parse them again from the bundle."""
+
+    forget_zones()
+    pytz.disable_persistent_cache()
+
+
+def clear_shorthands() -> None:
+    """Forget the shorthands loaded by :mod:`ultz.tzwrap`, and its index of names."""
+
+    tzwrap._SHORTHANDS = None  # pylint: disable=protected-access
+    tzwrap._NAMES = None  # pylint: disable=protected-access
+
+
+def clear_all_caches() -> None:
+    """Forget everything computed by a previous query."""
+
+    ultz.clear_cache()
+    clear_zone_caches()
+    clear_shorthands()
+
+
+def restart_with_disk_cache(directory: str) -> Callable[[], None]:
+    """Forget the timezones built by pytz, and load them again from the persistent
+    cache in ``directory``, as in a new process."""
+
+    def reset() -> None:
+        forget_zones()
+        pytz.enable_persistent_cache(directory)
+
+    return reset
+
+
+def build_all_zones() -> None:
+    """Build the tzinfo of every timezone from its zoneinfo file."""
+
+    for zone in pytz.all_timezones:
+        with pytz.open_resource(zone) as resource:
+            build_tzinfo(zone, resource)
+
+
+def uncached(text_input: str) -> Callable[[], object]:
+    """Process ``text_input`` without the result cache."""
+
+    def run() -> object:
+        ultz.clear_cache()
+        return ultz.process_input(text_input)
+
+    return run
+
+
+def benchmarks(cache_dir: str) -> List[Benchmark]:
+    """The benchmarks of the suite.
+
+    :param cache_dir: A directory for the persistent cache of pytz.
+    """
+
+    suite = []
+    for code, query in QUERIES.items():
+        name = f"process_input[{code.name}"
+        suite.append(Benchmark(f"{name}]", uncached(query), 200))
+        suite.append(
+            Benchmark(f"{name}, cold]", uncached(query), COLD, clear_all_caches)
+        )
+    suite.append(
+        Benchmark(
+            "process_input[TZ_ONLY, cached]",
+            lambda: ultz.process_input(QUERIES[ExprCode.TZ_ONLY]),
+            1000,
+        )
+    )
+
+    suite.append(Benchmark("tzwrap.timezone", lambda: tzwrap.timezone("Paris"), 1000))
+    suite.append(
+        Benchmark(
+            "tzwrap.timezone[cold]",
+            lambda: tzwrap.timezone("Paris"),
+            COLD,
+            clear_zone_caches,
+        )
+    )
+    suite.append(
+        Benchmark(
+            "tzwrap.timezone[cold, disk cache]",
+            lambda: tzwrap.timezone("Paris"),
+            COLD,
+            restart_with_disk_cache(cache_dir),
+        )
+    )
+    suite.append(Benchmark("build_tzinfo[all zones]", build_all_zones))
+    suite.append(
+        Benchmark(
+            "_populate_shorthands",
+            tzwrap._populate_shorthands,  # pylint: disable=protected-access
+            10,
+        )
+    )
+
+    timezone = pytz.timezone(ZONE)
+    times = sample_times()
+    localized = [timezone.localize(time) for time in times]
+    utc_times = [
+        time.astimezone(pytz.utc).replace(tzinfo=timezone) for time in localized
+    ]
+    shifted = [time + dt.timedelta(hours=6) for time in localized]
+
+    def localize_all() -> None:
+        for time in times:
+            timezone.localize(time)
+
+    def fromutc_all() -> None:
+        for time in utc_times:
+            timezone.fromutc(time)
+
+    def normalize_all() -> None:
+        for time in shifted:
+            timezone.normalize(time)
+
+    count = len(times)
+    suite.append(Benchmark(f"localize[{ZONE}]", localize_all, 5, batch=count))
+    suite.append(Benchmark(f"fromutc[{ZONE}]", fromutc_all, 5, batch=count))
+    suite.append(Benchmark(f"normalize[{ZONE}]", normalize_all, 5, batch=count))
+    return suite
+
+
+def measure(benchmark: Benchmark, rounds: int) -> Dict[str, Any]:
+    """Run ``benchmark`` and compute the statistics of its time per call.
+
+    A first call, not measured, fills the caches of a warm benchmark and the lazily
+    loaded modules.
+
+    :param benchmark: The benchmark.
+    :param rounds: The number of rounds.
+    :returns: The minimum, median and mean time per operation, in seconds, and the
+              settings of the run.
+    """
+
+    run, number, reset = benchmark.run, benchmark.number, benchmark.reset
+    if reset is not None:
+        reset()
+    run()
+
+    times = []
+    for _ in range(rounds):
+        if reset is None:
+            start = time.perf_counter()
+            for _ in range(number):
+                run()
+            elapsed = time.perf_counter() - start
+        else:
+            elapsed = 0.0
+            for _ in range(number):
+                reset()
+                start = time.perf_counter()
+                run()
+                elapsed += time.perf_counter() - start
+        times.append(elapsed / (number * benchmark.batch))
+
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.mean(times),
+        "rounds": rounds,
+        "number": number,
+        "batch": benchmark.batch,
+        "cold": reset is not None,
+    }
+
+
+def run_suite(rounds: int, selected: Optional[str] = None) -> Dict[str, Any]:
+    """Run the benchmarks, printing their results as they go.
+
+    :param rounds: The number of rounds of each benchmark.
+    :param selected: Only run the benchmarks with a name containing it.
+    :returns: The results, by benchmark name, and a description of the environment.
+    """
+
+    results = {}
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for benchmark in benchmarks(cache_dir):
+            if selected and selected not in benchmark.name:
+                continue
+            result = results[benchmark.name] = measure(benchmark, rounds)
+            print(format_result(benchmark.name, result), file=sys.stderr)
+        pytz.disable_persistent_cache()
+
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "date": dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds"),
+        "results": results,
+    }
+
+
+def format_time(seconds: float) -> str:
+    """Format a duration with a readable unit."""
+
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f}{unit}"
+    return f"{seconds / 1e-9:8.2f}ns"
+
+
+def format_result(name: str, result: Dict[str, Any]) -> str:
+    """A line of the table of results."""
+
+    minimum, median = format_time(result["min"]), format_time(result["median"])
+    return f"{name:40}{minimum:>12}{median:>12}"
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """Print the ratio of the median times of ``results`` to the ones of
+    ``baseline``."""
+
+    print(f"{'benchmark':40}{'baseline':>12}{'current':>12}{'ratio':>10}")
+    for name, result in results["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            continue
+        ratio = result["median"] / previous["median"]
+        print(
+            f"{name:40}{format_time(previous['median']):>12}"
+            f"{format_time(result['median']):>12}{ratio:9.2f}x"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    arg_parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark the query pipeline and the bundled pytz.",
+    )
+    arg_parser.add_argument(
+        "--rounds", type=int, default=ROUNDS, help="the number of rounds"
+    )
+    arg_parser.add_argument(
+        "--select", help="only run the benchmarks with a name containing this string"
+    )
+    arg_parser.add_argument("--output", help="write the results as JSON to this file")
+    arg_parser.add_argument(
+        "--compare", help="compare the results to the JSON file of a previous run"
+    )
+    args = arg_parser.parse_args(argv)
+
+    print(f"{'benchmark':40}{'min':>12}{'median':>12}", file=sys.stderr)
+    results = run_suite(args.rounds, args.select)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+    if args.compare:
+        with open(args.compare) as baseline:
+            compare(results, json.load(baseline))
@@ -20,11 +20,18 @@ function main() {
 
     echo ""
 
+    echocol cyan "CHECK THE ZONEINFO BUNDLE..."
+    echocol cyan "============================"
+    python -m pytz.bundle --check
+    echocol cyan "...DONE."
+
+    echo ""
+
     echocol red "LAUNCH TYPE CHECKING WITH MYPY AND TESTS WITH UNITTESTS..."
     echocol red "=========================================================="
     mypy --html-report htmlmypy --strict tests/ ultz/
     echocol red "----------------------------------------------------------"
-    coverage run --branch --source=tests -m unittest discover
+    ULTZ_IMPORTTIME=1 coverage run --branch --source=tests -m unittest discover
     echocol red "...DONE."
 
     echo ""
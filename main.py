@@ -1,37 +1,142 @@
+import threading
+
 from ulauncher.api.client.EventListener import EventListener
 from ulauncher.api.client.Extension import Extension
-from ulauncher.api.shared.action.DoNothingAction import DoNothingAction
-from ulauncher.api.shared.action.RenderResultListAction import RenderResultListAction
-from ulauncher.api.shared.event import KeywordQueryEvent
-from ulauncher.api.shared.item.ExtensionResultItem import ExtensionResultItem
+from ulauncher.api.shared.event import (
+    KeywordQueryEvent,
+    PreferencesEvent,
+    PreferencesUpdateEvent,
+)
+
+# The query pipeline (ultz, and through it the bundled pytz) and the result
+# types are only imported when needed, so that the extension connects to ulauncher as
+# fast as possible. They are then preloaded in the background by warm_up().
+
+
+def warm_up(zones=""):
+    """Import everything needed to answer a query, load the shorthands, and build the
+    comma-separated ``zones``, ahead of the first query."""
+    # pylint: disable=import-outside-toplevel,unused-import
+    import ulauncher.api.shared.action.RenderResultListAction
+    import ulauncher.api.shared.item.ExtensionResultItem
+
+    import ultz.search as search
+    import ultz.tzwrap as tzwrap
+    import ultz.ultz
+
+    tzwrap.warm_up(zone.strip() for zone in zones.split(",") if zone.strip())
+    search.warm_up()
+
+
+def send_response(extension, event, action):
+    """Send the action answering an event to ulauncher.
 
+    ulauncher only sends the action returned by a listener, from the thread of the
+    event. The public API has no way to answer later from another thread, so this goes
+    through the client of the extension, as Extension does with a returned action. It is
+    the only place using this private API."""
+    # pylint: disable=import-outside-toplevel
+    from ulauncher.api.shared.Response import Response
 
-from ultz.ultz import process_input
+    extension._client.send(Response(event, action))  # pylint: disable=protected-access
+
+
+def start_warm_up(zones=""):
+    """Run warm_up() in the background. If the first query arrives before its end, the
+    import lock and tzwrap's own locking make it wait for the parts it needs."""
+    threading.Thread(target=warm_up, args=(zones,), name="warm-up", daemon=True).start()
 
 
 class KeywordQueryEventListener(EventListener):
-    def return_error(self, msg):
-        item = ExtensionResultItem(name=msg)
-        return RenderResultListAction([item])
+    """Answer the queries from a worker thread, so that a slow query never delays the
+    next keystrokes, and only the result of the latest query is rendered."""
+
+    def __init__(self):
+        # Successive queries are parsed incrementally, as they are typed. Only used by
+        # the worker thread.
+        self.parser = None
+        self.dispatcher = None
 
     def on_event(self, event, extension):
+        # pylint: disable=import-outside-toplevel
+        from ulauncher.api.shared.action.DoNothingAction import DoNothingAction
+
+        from ultz.worker import QueryDispatcher
+
+        if self.dispatcher is None:
+            self.dispatcher = QueryDispatcher(self.render, self.send)
+
         expr = event.get_argument()
         if not expr:
+            self.dispatcher.cancel()
             return DoNothingAction()
 
-        result, description, icon = process_input(
-            expr, extension.preferences["date-format"]
+        # The response is sent by the worker thread
+        self.dispatcher.submit((event, extension))
+        return None
+
+    def render(self, query):
+        """Compute the results of a query, in the worker thread."""
+        # pylint: disable=import-outside-toplevel
+        from ulauncher.api.shared.action.RenderResultListAction import (
+            RenderResultListAction,
+        )
+        from ulauncher.api.shared.item.ExtensionResultItem import ExtensionResultItem
+
+        from ultz.parser import IncrementalParser
+        from ultz.ultz import process_query
+
+        event, extension = query
+        if self.parser is None:
+            self.parser = IncrementalParser()
+
+        # One result per matching timezone while the timezone is being typed
+        results = process_query(
+            event.get_argument(), extension.preferences["date-format"], self.parser
         )
 
-        item = ExtensionResultItem(icon=icon, name=result, description=description)
+        items = [
+            ExtensionResultItem(icon=icon, name=result, description=description)
+            for result, description, icon in results
+        ]
+
+        return RenderResultListAction(items)
 
-        return RenderResultListAction([item])
+    @staticmethod
+    def send(query, action):
+        """Send the results of the latest query to ulauncher, from the worker thread."""
+        event, extension = query
+        send_response(extension, event, action)
+
+
+class PreferencesEventListener(EventListener):
+    """Warm up the configured timezones once the preferences are known."""
+
+    def on_event(self, event, extension):
+        start_warm_up(event.preferences.get("warmup-zones", ""))
+
+
+class PreferencesUpdateEventListener(EventListener):
+    """Warm up the newly configured timezones."""
+
+    def on_event(self, event, extension):
+        if event.id == "warmup-zones":
+            start_warm_up(event.new_value)
 
 
 class TzExtension(Extension):
     def __init__(self):
         super(TzExtension, self).__init__()
         self.subscribe(KeywordQueryEvent, KeywordQueryEventListener())
+        self.subscribe(PreferencesEvent, PreferencesEventListener())
+        self.subscribe(PreferencesUpdateEvent, PreferencesUpdateEventListener())
+
+    def run(self):
+        """Start the warm-up in the background just before connecting to ulauncher."""
+        # The preferences are usually only received after connecting, in which case
+        # the zones are warmed up by PreferencesEventListener.
+        start_warm_up(self.preferences.get("warmup-zones", ""))
+        super(TzExtension, self).run()
 
 
 if __name__ == "__main__":
@@ -11,14 +11,19 @@ on how to use these modules.
 import sys
 import datetime
 import os.path
+from io import BytesIO
+from threading import Lock
+from weakref import WeakValueDictionary
 
 from pytz.exceptions import AmbiguousTimeError
 from pytz.exceptions import InvalidTimeError
 from pytz.exceptions import NonExistentTimeError
 from pytz.exceptions import UnknownTimeZoneError
 from pytz.lazy import LazyDict, LazyList, LazySet  # noqa
+from pytz.lru import LRUCache
 from pytz.tzinfo import unpickler, BaseTzInfo
-from pytz.tzfile import build_tzinfo
+from pytz.tzfile import alias_tzinfo, build_tzinfo, parse_tzdata
+from pytz.tzfile import tzinfo_from_data
 
 
 # The IANA (nee Olson) database is updated several times a year.
@@ -29,12 +34,15 @@ __version__ = VERSION
 OLSEN_VERSION = OLSON_VERSION  # Old releases had this misspelling
 
 __all__ = [
-    'timezone', 'utc', 'country_timezones', 'country_names',
+    'timezone', 'canonical_timezone', 'utc', 'country_timezones',
+    'country_names',
     'AmbiguousTimeError', 'InvalidTimeError',
     'NonExistentTimeError', 'UnknownTimeZoneError',
     'all_timezones', 'all_timezones_set',
     'common_timezones', 'common_timezones_set',
     'BaseTzInfo', 'FixedOffset',
+    'enable_persistent_cache', 'disable_persistent_cache',
+    'cache_info', 'set_cache_capacity',
 ]
 
 
@@ -75,10 +83,39 @@ else:  # Python 2.x
         return s.encode('ASCII')
 
 
+_bundle = None
+_bundle_lock = Lock()
+
+
+def _get_bundle():
+    """Return the memory mapped zoneinfo bundle, or None if unavailable.
+
+    The bundle is only used for the zoneinfo data shipped with pytz: it is
+    ignored when PYTZ_TZDATADIR is set, and the loose files are used
+    instead if it is missing or corrupted.
+    """
+    global _bundle
+    if os.environ.get('PYTZ_TZDATADIR', None) is not None:
+        return None
+    if _bundle is None:
+        with _bundle_lock:
+            if _bundle is None:
+                from struct import error as StructError
+                from pytz.bundle import BUNDLE_NAME, ZoneBundle
+                filename = os.path.join(os.path.dirname(__file__),
+                                        BUNDLE_NAME)
+                try:
+                    _bundle = ZoneBundle(filename)
+                except (IOError, ValueError, StructError):
+                    _bundle = False
+    return _bundle or None
+
+
 def open_resource(name):
     """Open a resource from the zoneinfo subdir for reading.
 
-    Uses the pkg_resources module if available and no standard file
+    Reads from the zoneinfo bundle if it is available, else uses
+    the pkg_resources module if available and no standard file
     found at the calculated location.
 
     It is possible to specify different location for zoneinfo
@@ -88,6 +125,11 @@ def open_resource(name):
     for part in name_parts:
         if part == os.path.pardir or os.path.sep in part:
             raise ValueError('Bad path segment: %r' % part)
+    bundle = _get_bundle()
+    if bundle is not None:
+        data = bundle.get('/'.join(name_parts))
+        if data is not None:
+            return BytesIO(data)
     zoneinfo_dir = os.environ.get('PYTZ_TZDATADIR', None)
     if zoneinfo_dir is not None:
         filename = os.path.join(zoneinfo_dir, *name_parts)
@@ -118,13 +160,74 @@ def resource_exists(name):
             # PYTZ_SKIPEXISTSCHECK flag to skip checking
             # for the presence of the resource file on disk.
             return True
+        bundle = _get_bundle()
+        if bundle is not None and name in bundle:
+            return True
         open_resource(name).close()
         return True
     except IOError:
         return False
 
 
-_tzinfo_cache = {}
+def _list_resources(directory):
+    """Return the set of the names of the files under directory.
+
+    A single walk of the directory, with no file opened. The symbolic links
+    to directories are not followed, as they may loop, like the posix -> .
+    link of some system zoneinfo trees. The files the walk misses, there or
+    because of an error, are left to the checks of the caller.
+    """
+    found = set()
+    pending = [('', directory)]
+    while pending:
+        prefix, path = pending.pop()
+        try:
+            entries = os.scandir(path)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(
+                            (prefix + entry.name + '/', entry.path))
+                    elif entry.is_file():
+                        found.add(prefix + entry.name)
+                except OSError:
+                    continue
+    return found
+
+
+def _existing_resources(names):
+    """Yield the names in names for which resource_exists is true.
+
+    The bundle index or a single walk of the zoneinfo directory answer
+    for all the names at once, instead of opening each resource. Only the
+    names they miss are checked one by one, for pkg_resources.
+    """
+    if os.environ.get('PYTZ_SKIPEXISTSCHECK', ''):
+        for name in names:
+            yield name
+        return
+    found = _get_bundle()
+    if found is None:
+        zoneinfo_dir = os.environ.get('PYTZ_TZDATADIR', None)
+        if zoneinfo_dir is None:
+            zoneinfo_dir = os.path.join(os.path.dirname(__file__), 'zoneinfo')
+        found = _list_resources(zoneinfo_dir)
+    for name in names:
+        if name in found or resource_exists(name):
+            yield name
+
+
+# The zones built, with no limit by default so that timezone(zone) is always
+# the same instance. See set_cache_capacity.
+_tzinfo_cache = LRUCache()
+
+# The lock of each zone being built, so that concurrent first requests of a
+# zone build it only once. The built zones are read without locking.
+_tzinfo_build_locks = {}
+_tzinfo_build_locks_lock = Lock()
 
 
 def timezone(zone):
@@ -177,17 +280,152 @@ def timezone(zone):
         raise UnknownTimeZoneError(zone)
 
     zone = _case_insensitive_zone_lookup(_unmunge_zone(zone))
-    if zone not in _tzinfo_cache:
+    tz = _tzinfo_cache.get(zone)
+    if tz is None:
         if zone in all_timezones_set:  # noqa
-            fp = open_resource(zone)
-            try:
-                _tzinfo_cache[zone] = build_tzinfo(zone, fp)
-            finally:
-                fp.close()
+            tz = _build_timezone(zone)
         else:
             raise UnknownTimeZoneError(zone)
 
-    return _tzinfo_cache[zone]
+    return tz
+
+
+def canonical_timezone(zone):
+    r'''Return a timezone from its name, spelled exactly as in all_timezones.
+
+    The fast path of timezone() for callers which already resolved the
+    name, skipping the case insensitive lookup.
+
+    >>> canonical_timezone('US/Eastern') is timezone('us/eastern')
+    True
+    >>> canonical_timezone('UTC') is utc
+    True
+    >>> try:
+    ...     canonical_timezone('us/eastern')
+    ... except UnknownTimeZoneError:
+    ...     print('Unknown')
+    Unknown
+    '''
+    tz = _tzinfo_cache.get(zone)
+    if tz is None:
+        if zone == 'UTC':
+            return utc
+        if zone not in all_timezones_set:  # noqa
+            raise UnknownTimeZoneError(zone)
+        tz = _build_timezone(zone)
+    return tz
+
+
+def _build_timezone(zone):
+    """Build the tzinfo of zone once, the concurrent callers waiting for it"""
+    with _tzinfo_build_locks_lock:
+        lock = _tzinfo_build_locks.setdefault(zone, Lock())
+    try:
+        with lock:
+            tz = _tzinfo_cache.get(zone)
+            if tz is None:
+                tz = _tzinfo_cache[zone] = _load_tzinfo(zone)
+            return tz
+    finally:
+        # Once the zone is cached, the callers coming later never need it.
+        # If the build failed, the next caller starts again with a new lock.
+        with _tzinfo_build_locks_lock:
+            if _tzinfo_build_locks.get(zone) is lock:
+                del _tzinfo_build_locks[zone]
+
+
+_persistent_cache = None  # None: not configured yet, False: disabled
+
+
+def enable_persistent_cache(directory=None):
+    """Cache the parsed zones on disk, to reuse them across processes.
+
+    directory defaults to $XDG_CACHE_HOME/pytz. The cache is keyed on the
+    database version and is automatically invalidated when tzdata.zi
+    changes. It can also be enabled by setting the PYTZ_CACHEDIR
+    environment variable to the cache directory.
+
+    Without a tzdata.zi to version the cache with, the cache is disabled
+    and the zones are parsed in each process, as errors of the cache are
+    never fatal.
+    """
+    global _persistent_cache
+    from pytz.diskcache import TzDataCache, data_version, default_cache_dir
+    if directory is None:
+        directory = default_cache_dir()
+    try:
+        fp = open_resource('tzdata.zi')
+        try:
+            version = data_version(OLSON_VERSION, fp.read())
+        finally:
+            fp.close()
+    except (IOError, OSError):
+        disable_persistent_cache()
+        return
+    _persistent_cache = TzDataCache(directory, version)
+
+
+def disable_persistent_cache():
+    """Stop using the persistent cache enabled by enable_persistent_cache"""
+    global _persistent_cache
+    _persistent_cache = False
+
+
+def _get_persistent_cache():
+    if _persistent_cache is None:
+        directory = os.environ.get('PYTZ_CACHEDIR', '')
+        if directory:
+            enable_persistent_cache(directory)
+        else:
+            disable_persistent_cache()
+    return _persistent_cache or None
+
+
+def _parse_zone(zone):
+    """Parse the zoneinfo file of zone, straight from the bundle if possible"""
+    bundle = _get_bundle()
+    if bundle is not None:
+        data = bundle.get(zone)
+        if data is not None:
+            return parse_tzdata(data)
+    fp = open_resource(zone)
+    try:
+        return parse_tzdata(fp.read())
+    finally:
+        fp.close()
+
+
+# A zone built from each location of the bundle still in use. The links
+# between zones, like Portugal and Europe/Lisbon, share their location.
+_bundle_zones = WeakValueDictionary()
+
+
+def _load_tzinfo(zone):
+    """Build the tzinfo of zone, sharing the data of a loaded alias if any"""
+    bundle = _get_bundle()
+    location = bundle.location(zone) if bundle is not None else None
+    if location is not None:
+        alias = _bundle_zones.get(location)
+        if alias is not None:
+            return alias_tzinfo(zone, alias)
+
+    tz = _build_tzinfo(zone)
+    if location is not None:
+        _bundle_zones[location] = tz
+    return tz
+
+
+def _build_tzinfo(zone):
+    """Build the tzinfo of zone, from the persistent cache if possible"""
+    cache = _get_persistent_cache()
+    if cache is None:
+        return tzinfo_from_data(zone, _parse_zone(zone))
+
+    data = cache.get(zone)
+    if data is None:
+        data = _parse_zone(zone)
+        cache.put(zone, data)
+    return tzinfo_from_data(zone, data)
 
 
 def _unmunge_zone(zone):
@@ -435,7 +673,10 @@ class _FixedOffset(datetime.tzinfo):
         return dt.astimezone(self)
 
 
-def FixedOffset(offset, _tzinfos={}):
+_fixed_offset_cache = LRUCache(128)
+
+
+def FixedOffset(offset):
     """return a fixed-offset timezone based off a number of minutes.
 
         >>> one = FixedOffset(-330)
@@ -491,17 +732,63 @@ def FixedOffset(offset, _tzinfos={}):
     if offset == 0:
         return UTC
 
-    info = _tzinfos.get(offset)
+    info = _fixed_offset_cache.get(offset)
     if info is None:
         # We haven't seen this one before. we need to save it.
 
         # Use setdefault to avoid a race condition and make sure we have
         # only one
-        info = _tzinfos.setdefault(offset, _FixedOffset(offset))
+        info = _fixed_offset_cache.setdefault(offset, _FixedOffset(offset))
 
     return info
 
 
+def _caches():
+    from pytz import tzinfo
+    return {
+        'tzinfo': _tzinfo_cache,
+        'fixed_offset': _fixed_offset_cache,
+        'datetime': tzinfo._datetime_cache,
+        'timedelta': tzinfo._timedelta_cache,
+        'ttinfo': tzinfo._ttinfo_cache,
+    }
+
+
+def cache_info():
+    '''Return the hits, misses, evictions, size and capacity of the caches
+
+    >>> info = cache_info()
+    >>> sorted(info)
+    ['datetime', 'fixed_offset', 'timedelta', 'ttinfo', 'tzinfo']
+    >>> info['tzinfo'].capacity is None
+    True
+    '''
+    return dict((name, cache.info()) for name, cache in _caches().items())
+
+
+def set_cache_capacity(name, capacity):
+    '''Set the maximum number of entries of a cache, None for no limit.
+
+    The least recently used entries are evicted beyond the capacity. The
+    caches are:
+
+    - tzinfo: the zones returned by timezone(), with no limit by default.
+      A zone still in the cache is always returned as the same instance,
+      which pickling relies on. An evicted one is built again when
+      requested, as a new instance: only limit it in long-running processes
+      using many zones.
+    - fixed_offset: the zones returned by FixedOffset(), 128 by default.
+    - datetime, timedelta and ttinfo: the values shared between the zones
+      when they are built, 4096, 1024 and 2048 by default.
+
+    >>> set_cache_capacity('zones', 10)
+    Traceback (most recent call last):
+    ...
+    KeyError: 'zones'
+    '''
+    _caches()[name].capacity = capacity
+
+
 FixedOffset.__safe_for_unpickling__ = True
 
 
@@ -1108,8 +1395,7 @@ all_timezones = \
  'W-SU',
  'WET',
  'Zulu']
-all_timezones = LazyList(
-        tz for tz in all_timezones if resource_exists(tz))
+all_timezones = LazyList(_existing_resources(all_timezones))
         
 all_timezones_set = LazySet(all_timezones)
 common_timezones = \
@@ -1554,6 +1840,6 @@ common_timezones = \
  'US/Pacific',
  'UTC']
 common_timezones = LazyList(
-            tz for tz in common_timezones if tz in all_timezones)
+            tz for tz in common_timezones if tz in all_timezones_set)
         
 common_timezones_set = LazySet(common_timezones)
@@ -1,5 +1,21 @@
 import datetime
-from typing import List, Mapping, Optional, Set, Union
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Set,
+    Union,
+)
+
+from pytz.bundle import ZoneBundle
+from pytz.diskcache import TzDataCache
+from pytz.lru import CacheInfo, LRUCache
 
 class BaseTzInfo(datetime.tzinfo):
     zone: str = ...
@@ -30,7 +46,13 @@ utc: _UTCclass
 UTC: _UTCclass
 
 def timezone(zone: str) -> Union[_UTCclass, _StaticTzInfo, _DstTzInfo]: ...
+def canonical_timezone(zone: str) -> Union[_UTCclass, _StaticTzInfo, _DstTzInfo]: ...
 def FixedOffset(offset: int) -> Union[_UTCclass, datetime.tzinfo]: ...
+def open_resource(name: str) -> BinaryIO: ...
+def enable_persistent_cache(directory: Optional[str] = ...) -> None: ...
+def disable_persistent_cache() -> None: ...
+def cache_info() -> Dict[str, CacheInfo]: ...
+def set_cache_capacity(name: str, capacity: Optional[int]) -> None: ...
 
 all_timezones: List[str]
 all_timezones_set: Set[str]
@@ -41,3 +63,13 @@ country_names: Mapping[str, str]
 ZERO: datetime.timedelta
 HOUR: datetime.timedelta
 VERSION: str
+
+# Internals, used by the tests
+_persistent_cache: Any
+_tzinfo_cache: LRUCache
+_tzinfo_build_locks: Dict[str, Any]
+_bundle_zones: MutableMapping[str, Any]
+def _get_bundle() -> Optional[ZoneBundle]: ...
+def _get_persistent_cache() -> Optional[TzDataCache]: ...
+def _load_tzinfo(zone: str) -> Union[_UTCclass, _StaticTzInfo, _DstTzInfo]: ...
+def _existing_resources(names: Iterable[str]) -> Iterator[str]: ...
@@ -0,0 +1,155 @@
+'''
+Packed zoneinfo bundle.
+
+All the files under the zoneinfo subdir are concatenated into a single
+file, preceded by an index mapping each resource name to its location.
+The bundle is memory mapped so that loading a timezone is a dictionary
+lookup and a zero-copy slice instead of a filesystem round-trip.
+
+Byte-identical resources (links such as Portugal and Europe/Lisbon) are
+stored only once and share the same location.
+
+The bundle is regenerated from the loose files with:
+
+    python -m pytz.bundle
+
+and checked against them with:
+
+    python -m pytz.bundle --check
+'''
+
+import mmap
+import os
+import sys
+from struct import Struct
+
+__all__ = ['ZoneBundle', 'write_bundle']
+
+BUNDLE_NAME = 'zoneinfo.bundle'
+
+_MAGIC = b'PYTZBNDL'
+_FORMAT_VERSION = 1
+
+# magic, format version, number of entries, size of the index in bytes
+_header = Struct('>8s H I I')
+# length of the name, offset of the data, length of the data
+_entry = Struct('>H I I')
+
+
+class ZoneBundle(object):
+    '''A read-only, memory mapped, zoneinfo bundle.'''
+
+    def __init__(self, filename):
+        with open(filename, 'rb') as fp:
+            self._map = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        try:
+            self._index = self._read_index()
+        except Exception:
+            self._view.release()
+            self._map.close()
+            raise
+
+    def _read_index(self):
+        view = self._view
+        magic, version, count, index_size = _header.unpack_from(view, 0)
+        if magic != _MAGIC or version != _FORMAT_VERSION:
+            raise ValueError('Not a zoneinfo bundle: %r' % (magic,))
+
+        index = {}
+        pos = _header.size
+        data_start = pos + index_size
+        for _ in range(count):
+            name_len, offset, length = _entry.unpack_from(view, pos)
+            pos += _entry.size
+            name = bytes(view[pos:pos + name_len]).decode('ASCII')
+            pos += name_len
+            if data_start + offset + length > len(view):
+                raise ValueError('Truncated zoneinfo bundle')
+            index[name] = (data_start + offset, length)
+        return index
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def get(self, name):
+        '''Return a zero-copy memoryview of the resource, or None'''
+        try:
+            start, length = self._index[name]
+        except KeyError:
+            return None
+        return self._view[start:start + length]
+
+    def location(self, name):
+        '''Return the (offset, length) of the resource, or None
+
+        Resources sharing a location are byte-identical.
+        '''
+        return self._index.get(name)
+
+
+def _walk(zoneinfo_dir):
+    '''Yield (resource name, path) for every file under zoneinfo_dir'''
+    for dirpath, dirnames, filenames in os.walk(zoneinfo_dir):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            path = os.path.join(dirpath, filename)
+            name = os.path.relpath(path, zoneinfo_dir)
+            yield name.replace(os.path.sep, '/'), path
+
+
+def _pack(zoneinfo_dir):
+    '''Return the bytes of a bundle of every file under zoneinfo_dir'''
+    entries = []
+    blobs = []
+    locations = {}  # content -> offset, for deduplication
+    size = 0
+    for name, path in _walk(zoneinfo_dir):
+        with open(path, 'rb') as fp:
+            content = fp.read()
+        offset = locations.get(content)
+        if offset is None:
+            offset = locations[content] = size
+            blobs.append(content)
+            size += len(content)
+        entries.append((name.encode('ASCII'), offset, len(content)))
+
+    index = b''.join(_entry.pack(len(name), offset, length) + name
+                     for name, offset, length in entries)
+    header = _header.pack(_MAGIC, _FORMAT_VERSION, len(entries), len(index))
+    return header + index + b''.join(blobs)
+
+
+def write_bundle(zoneinfo_dir, filename):
+    '''Pack every file under zoneinfo_dir into the bundle filename'''
+    data = _pack(zoneinfo_dir)
+    tmp = filename + '.tmp'
+    with open(tmp, 'wb') as fp:
+        fp.write(data)
+    os.rename(tmp, filename)
+    return len(data)
+
+
+def _main(argv):
+    base = os.path.dirname(os.path.abspath(__file__))
+    zoneinfo_dir = os.path.join(base, 'zoneinfo')
+    filename = os.path.join(base, BUNDLE_NAME)
+    if '--check' in argv:
+        with open(filename, 'rb') as fp:
+            up_to_date = fp.read() == _pack(zoneinfo_dir)
+        print('%s is %s' % (filename,
+                            'up to date' if up_to_date else 'STALE'))
+        return 0 if up_to_date else 1
+    size = write_bundle(zoneinfo_dir, filename)
+    print('Wrote %s (%d bytes)' % (filename, size))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(_main(sys.argv[1:]))
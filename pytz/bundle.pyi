@@ -0,0 +1,13 @@
+from typing import Iterator, Optional, Tuple
+
+BUNDLE_NAME: str
+
+class ZoneBundle:
+    def __init__(self, filename: str) -> None: ...
+    def __contains__(self, name: object) -> bool: ...
+    def __iter__(self) -> Iterator[str]: ...
+    def __len__(self) -> int: ...
+    def get(self, name: str) -> Optional[memoryview]: ...
+    def location(self, name: str) -> Optional[Tuple[int, int]]: ...
+
+def write_bundle(zoneinfo_dir: str, filename: str) -> int: ...
@@ -0,0 +1,117 @@
+'''
+Persistent cache of parsed zone data, shared across process restarts.
+
+Each zone is stored as the marshalled result of tzfile.parse_tzdata, so
+restoring it skips the TZif parsing and the DST offset computation.
+
+The cache is a single append-only file per data version: one record
+per zone, each record being a 4 bytes length followed by the marshalled
+(zone, data) pair. The data version is derived from the database
+version and a checksum of tzdata.zi, so an updated database
+automatically uses a fresh file and the stale ones are removed.
+'''
+
+import marshal
+import os
+from struct import Struct
+from threading import Lock
+from zlib import crc32
+
+__all__ = ['TzDataCache', 'default_cache_dir', 'data_version']
+
+# Bump when the layout of the cached data changes
+_FORMAT_VERSION = 2
+
+_PREFIX = 'tzdata-'
+_SUFFIX = '.cache'
+
+_length = Struct('>I')
+
+
+def default_cache_dir():
+    '''Return $XDG_CACHE_HOME/pytz, defaulting to ~/.cache/pytz'''
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(
+        os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'pytz')
+
+
+def data_version(olson_version, tzdata):
+    '''Key identifying the zone data, from the raw bytes of tzdata.zi'''
+    return '%s-%08x-%d' % (olson_version, crc32(tzdata) & 0xffffffff,
+                           _FORMAT_VERSION)
+
+
+class TzDataCache(object):
+    '''Persistent mapping of zone names to their parsed data.
+
+    Errors while reading or writing the cache are never fatal: the zone
+    is simply parsed again.
+    '''
+
+    def __init__(self, directory, version):
+        self.directory = directory
+        self.version = version
+        self.filename = os.path.join(directory, _PREFIX + version + _SUFFIX)
+        self._data = None
+        self._lock = Lock()
+
+    def _load(self):
+        data = {}
+        try:
+            with open(self.filename, 'rb') as fp:
+                content = fp.read()
+        except (IOError, OSError):
+            self._remove_stale()
+            return data
+
+        pos = 0
+        while pos + _length.size <= len(content):
+            size, = _length.unpack_from(content, pos)
+            pos += _length.size
+            if pos + size > len(content):
+                break  # Truncated by an interrupted write
+            try:
+                zone, zone_data = marshal.loads(content[pos:pos + size])
+            except (EOFError, ValueError, TypeError):
+                break
+            data[zone] = zone_data
+            pos += size
+        return data
+
+    def _remove_stale(self):
+        '''Remove the cache files of the other data versions'''
+        try:
+            names = os.listdir(self.directory)
+        except (IOError, OSError):
+            return
+        current = os.path.basename(self.filename)
+        for name in names:
+            if (name.startswith(_PREFIX) and name.endswith(_SUFFIX) and
+                    name != current):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except (IOError, OSError):
+                    pass
+
+    def get(self, zone):
+        '''Return the cached data of zone, or None'''
+        if self._data is None:
+            with self._lock:
+                if self._data is None:
+                    self._data = self._load()
+        return self._data.get(zone)
+
+    def put(self, zone, data):
+        '''Store the data of zone, in memory and on disk'''
+        record = marshal.dumps((zone, data))
+        with self._lock:
+            if self._data is None:
+                self._data = self._load()
+            self._data[zone] = data
+            try:
+                if not os.path.isdir(self.directory):
+                    os.makedirs(self.directory)
+                with open(self.filename, 'ab') as fp:
+                    fp.write(_length.pack(len(record)) + record)
+            except (IOError, OSError):
+                pass
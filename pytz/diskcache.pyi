@@ -0,0 +1,14 @@
+from typing import Any, Optional, Tuple
+
+_TzData = Tuple[Any, ...]
+
+def default_cache_dir() -> str: ...
+def data_version(olson_version: str, tzdata: bytes) -> str: ...
+
+class TzDataCache:
+    directory: str
+    version: str
+    filename: str
+    def __init__(self, directory: str, version: str) -> None: ...
+    def get(self, zone: str) -> Optional[_TzData]: ...
+    def put(self, zone: str, data: _TzData) -> None: ...
@@ -9,63 +9,78 @@ except ImportError:  # Python < 3.3
 
 
 # With lazy loading, we might end up with multiple threads triggering
-# it at the same time. We need a lock.
-_fill_lock = RLock()
+# it at the same time. Each container has its own lock, so filling one
+# does not block the threads using another.
 
 
 class LazyDict(DictMixin):
     """Dictionary populated on first use."""
     data = None
 
-    def __getitem__(self, key):
-        if self.data is None:
-            _fill_lock.acquire()
-            try:
+    def __init__(self):
+        self._fill_lock = RLock()
+
+    def _filled(self):
+        '''Return the data, filling it first if needed'''
+        data = self.data
+        if data is None:
+            with self._fill_lock:
                 if self.data is None:
                     self._fill()
-            finally:
-                _fill_lock.release()
-        return self.data[key.upper()]
+                data = self.data
+        return data
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_fill_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._fill_lock = RLock()
+
+    def __getitem__(self, key):
+        return self._filled()[key.upper()]
 
     def __contains__(self, key):
-        if self.data is None:
-            _fill_lock.acquire()
-            try:
-                if self.data is None:
-                    self._fill()
-            finally:
-                _fill_lock.release()
-        return key in self.data
+        return key in self._filled()
 
     def __iter__(self):
-        if self.data is None:
-            _fill_lock.acquire()
-            try:
-                if self.data is None:
-                    self._fill()
-            finally:
-                _fill_lock.release()
-        return iter(self.data)
+        return iter(self._filled())
 
     def __len__(self):
-        if self.data is None:
-            _fill_lock.acquire()
-            try:
-                if self.data is None:
-                    self._fill()
-            finally:
-                _fill_lock.release()
-        return len(self.data)
+        return len(self._filled())
 
     def keys(self):
-        if self.data is None:
-            _fill_lock.acquire()
-            try:
-                if self.data is None:
-                    self._fill()
-            finally:
-                _fill_lock.release()
-        return self.data.keys()
+        return self._filled().keys()
+
+
+def _unfilled_class(base, lazy, props, fill):
+    '''Return the class of the lazy containers not filled yet.
+
+    Each method in props fills the container, then calls the method of
+    base. Filling the container changes its class to lazy, which does not
+    override any method of base: the containers filled cost nothing more
+    than a plain list or set.
+    '''
+
+    def method(name):
+        base_method = getattr(base, name)
+
+        def _lazy(self, *args, **kw):
+            if self._fill_iter is not None:
+                with self._fill_lock:
+                    if self._fill_iter is not None:
+                        fill(self, self._fill_iter)
+                        self._fill_iter = None
+                        self.__class__ = lazy
+            return base_method(self, *args, **kw)
+        _lazy.__name__ = name
+        return _lazy
+
+    namespace = dict((name, method(name)) for name in props
+                     if getattr(base, name, None) is not None)
+    return type('Unfilled' + lazy.__name__, (lazy,), namespace)
 
 
 class LazyList(list):
@@ -73,11 +88,12 @@ class LazyList(list):
 
     _props = [
         '__str__', '__repr__', '__unicode__',
-        '__hash__', '__sizeof__', '__cmp__',
+        '__sizeof__', '__cmp__',
         '__lt__', '__le__', '__eq__', '__ne__', '__gt__', '__ge__',
-        'append', 'count', 'index', 'extend', 'insert', 'pop', 'remove',
-        'reverse', 'sort', '__add__', '__radd__', '__iadd__', '__mul__',
-        '__rmul__', '__imul__', '__contains__', '__len__', '__nonzero__',
+        'append', 'clear', 'copy', 'count', 'index', 'extend', 'insert',
+        'pop', 'remove', 'reverse', 'sort', '__add__', '__radd__',
+        '__iadd__', '__mul__', '__rmul__', '__imul__', '__contains__',
+        '__len__', '__nonzero__', '__bool__',
         '__getitem__', '__setitem__', '__delitem__', '__iter__',
         '__reversed__', '__getslice__', '__setslice__', '__delslice__']
 
@@ -86,36 +102,19 @@ class LazyList(list):
         if fill_iter is None:
             return list()
 
-        # We need a new class as we will be dynamically messing with its
-        # methods.
-        class LazyList(list):
-            pass
-
-        fill_iter = [fill_iter]
-
-        def lazy(name):
-            def _lazy(self, *args, **kw):
-                _fill_lock.acquire()
-                try:
-                    if len(fill_iter) > 0:
-                        list.extend(self, fill_iter.pop())
-                        for method_name in cls._props:
-                            delattr(LazyList, method_name)
-                finally:
-                    _fill_lock.release()
-                return getattr(list, name)(self, *args, **kw)
-            return _lazy
-
-        for name in cls._props:
-            setattr(LazyList, name, lazy(name))
-
-        new_list = LazyList()
+        new_list = list.__new__(_UnfilledList)
+        new_list._fill_iter = fill_iter
+        new_list._fill_lock = RLock()
         return new_list
 
-# Not all versions of Python declare the same magic methods.
-# Filter out properties that don't exist in this version of Python
-# from the list.
-LazyList._props = [prop for prop in LazyList._props if hasattr(list, prop)]
+    def __init__(self, fill_iter=None):
+        pass  # Filled on first use, not by list.__init__
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+
+_UnfilledList = _unfilled_class(list, LazyList, LazyList._props, list.extend)
 
 
 class LazySet(set):
@@ -123,9 +122,9 @@ class LazySet(set):
 
     _props = (
         '__str__', '__repr__', '__unicode__',
-        '__hash__', '__sizeof__', '__cmp__',
+        '__sizeof__', '__cmp__',
         '__lt__', '__le__', '__eq__', '__ne__', '__gt__', '__ge__',
-        '__contains__', '__len__', '__nonzero__',
+        '__contains__', '__len__', '__nonzero__', '__bool__',
         '__getitem__', '__setitem__', '__delitem__', '__iter__',
         '__sub__', '__and__', '__xor__', '__or__',
         '__rsub__', '__rand__', '__rxor__', '__ror__',
@@ -141,32 +140,16 @@ class LazySet(set):
         if fill_iter is None:
             return set()
 
-        class LazySet(set):
-            pass
-
-        fill_iter = [fill_iter]
-
-        def lazy(name):
-            def _lazy(self, *args, **kw):
-                _fill_lock.acquire()
-                try:
-                    if len(fill_iter) > 0:
-                        for i in fill_iter.pop():
-                            set.add(self, i)
-                        for method_name in cls._props:
-                            delattr(LazySet, method_name)
-                finally:
-                    _fill_lock.release()
-                return getattr(set, name)(self, *args, **kw)
-            return _lazy
-
-        for name in cls._props:
-            setattr(LazySet, name, lazy(name))
-
-        new_set = LazySet()
+        new_set = set.__new__(_UnfilledSet)
+        new_set._fill_iter = fill_iter
+        new_set._fill_lock = RLock()
         return new_set
 
-# Not all versions of Python declare the same magic methods.
-# Filter out properties that don't exist in this version of Python
-# from the list.
-LazySet._props = [prop for prop in LazySet._props if hasattr(set, prop)]
+    def __init__(self, fill_iter=None):
+        pass  # Filled on first use, not by set.__init__
+
+    def __reduce__(self):
+        return (set, (set(iter(self)),))
+
+
+_UnfilledSet = _unfilled_class(set, LazySet, LazySet._props, set.update)
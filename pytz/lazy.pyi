@@ -0,0 +1,16 @@
+from typing import Any, Iterable, Iterator, List, Mapping, Optional, Set, TypeVar
+
+_T = TypeVar("_T")
+
+class LazyDict(Mapping[Any, Any]):
+    data: Optional[Mapping[Any, Any]]
+    def __init__(self) -> None: ...
+    def __getitem__(self, key: Any) -> Any: ...
+    def __iter__(self) -> Iterator[Any]: ...
+    def __len__(self) -> int: ...
+
+class LazyList(List[_T]):
+    def __init__(self, fill_iter: Optional[Iterable[_T]] = ...) -> None: ...
+
+class LazySet(Set[_T]):
+    def __init__(self, fill_iter: Optional[Iterable[_T]] = ...) -> None: ...
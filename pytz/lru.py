@@ -0,0 +1,128 @@
+'''
+Bounded caches evicting the least recently used entries.
+
+The caches of pytz would otherwise keep every zone, offset and transition
+ever used for the lifetime of the process.
+
+Reading an entry takes no lock: the lookup and the update of its recency
+are each a single call of OrderedDict, which the GIL keeps atomic. Only
+the insertions and evictions are serialized. As a consequence, the hit
+and miss counters may miss a few concurrent updates.
+'''
+
+from collections import OrderedDict, namedtuple
+from threading import Lock
+
+__all__ = ['LRUCache', 'CacheInfo']
+
+CacheInfo = namedtuple(
+    'CacheInfo', ['hits', 'misses', 'evictions', 'size', 'capacity'])
+
+_missing = object()
+
+
+class LRUCache(object):
+    '''Mapping keeping at most capacity entries, None for no limit.
+
+    >>> cache = LRUCache(2)
+    >>> cache['a'] = 1
+    >>> cache['b'] = 2
+    >>> cache.get('a')
+    1
+    >>> cache['c'] = 3
+    >>> 'b' in cache, 'a' in cache
+    (False, True)
+    >>> cache.info()
+    CacheInfo(hits=1, misses=0, evictions=1, size=2, capacity=2)
+    '''
+
+    def __init__(self, capacity=None):
+        self._data = OrderedDict()
+        self._capacity = capacity
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        '''Return the value of key, marking it as the most recently used'''
+        value = self._data.get(key, _missing)
+        if value is _missing:
+            self.misses += 1
+            return default
+        self.hits += 1
+        try:
+            self._data.move_to_end(key)
+        except KeyError:
+            pass  # Evicted in the meantime
+        return value
+
+    def __getitem__(self, key):
+        value = self.get(key, _missing)
+        if value is _missing:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._evict()
+
+    def setdefault(self, key, value):
+        '''Return the value of key, first setting it to value if missing.
+
+        Concurrent callers all get the same value.
+        '''
+        with self._lock:
+            current = self._data.get(key, _missing)
+            if current is not _missing:
+                self._data.move_to_end(key)
+                return current
+            self._data[key] = value
+            self._evict()
+            return value
+
+    def _evict(self):
+        if self._capacity is None:
+            return
+        while len(self._data) > self._capacity:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def __iter__(self):
+        return iter(list(self._data))
+
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    @capacity.setter
+    def capacity(self, capacity):
+        if capacity is not None and capacity < 0:
+            raise ValueError('Negative capacity: %r' % (capacity,))
+        with self._lock:
+            self._capacity = capacity
+            self._evict()
+
+    def info(self):
+        '''Return the counters and the size of the cache'''
+        return CacheInfo(self.hits, self.misses, self.evictions,
+                         len(self._data), self._capacity)
+
+    def reset_counters(self):
+        self.hits = self.misses = self.evictions = 0
@@ -0,0 +1,29 @@
+from typing import Any, Iterator, NamedTuple, Optional
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    capacity: Optional[int]
+
+class LRUCache:
+    hits: int
+    misses: int
+    evictions: int
+    def __init__(self, capacity: Optional[int] = ...) -> None: ...
+    def get(self, key: Any, default: Any = ...) -> Any: ...
+    def __getitem__(self, key: Any) -> Any: ...
+    def __setitem__(self, key: Any, value: Any) -> None: ...
+    def setdefault(self, key: Any, value: Any) -> Any: ...
+    def __contains__(self, key: object) -> bool: ...
+    def __len__(self) -> int: ...
+    def __iter__(self) -> Iterator[Any]: ...
+    def pop(self, key: Any, default: Any = ...) -> Any: ...
+    def clear(self) -> None: ...
+    @property
+    def capacity(self) -> Optional[int]: ...
+    @capacity.setter
+    def capacity(self, capacity: Optional[int]) -> None: ...
+    def info(self) -> CacheInfo: ...
+    def reset_counters(self) -> None: ...
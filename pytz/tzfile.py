@@ -2,11 +2,12 @@
 $Id: tzfile.py,v 1.8 2004/06/03 00:15:24 zenzen Exp $
 '''
 
-from datetime import datetime
-from struct import unpack, calcsize
+from array import array
+from struct import unpack_from, calcsize
 
 from pytz.tzinfo import StaticTzInfo, DstTzInfo, memorized_ttinfo
-from pytz.tzinfo import memorized_datetime, memorized_timedelta
+from pytz.tzinfo import memorized_timedelta
+from pytz.tzrule import PosixRule
 
 
 def _byte_string(s):
@@ -15,6 +16,9 @@ def _byte_string(s):
 
 _NULL = _byte_string('\0')
 
+# datetime.min, in seconds since the epoch
+_DATETIME_MIN = -62135596800
+
 
 def _std_string(s):
     """Cast a string or byte string to an ASCII string."""
@@ -22,24 +26,62 @@ def _std_string(s):
 
 
 def build_tzinfo(zone, fp):
+    return build_tzinfo_from_buffer(zone, fp.read())
+
+
+def build_tzinfo_from_buffer(zone, buf):
+    """Build a tzinfo from a TZif buffer (bytes, or a memoryview slice)"""
+    return tzinfo_from_data(zone, parse_tzdata(buf))
+
+
+def parse_tzdata(buf):
+    """Parse a TZif buffer into the plain data needed to build a tzinfo.
+
+    Returns a (transitions, transition_info, tz_string) tuple, made only of
+    ints and strings so that it can be marshalled:
+
+    - transitions: the UTC transition times, in seconds since the epoch.
+      Empty for a StaticTzInfo.
+    - transition_info: one (utcoffset, dst, tzname) per transition, the
+      offsets being in seconds. The only entry of a StaticTzInfo.
+    - tz_string: the POSIX TZ string describing the transitions after the
+      last one, from the footer of version 2+ files. Empty otherwise.
+    """
     head_fmt = '>4s c 15x 6l'
     head_size = calcsize(head_fmt)
     (magic, format, ttisgmtcnt, ttisstdcnt, leapcnt, timecnt,
-        typecnt, charcnt) = unpack(head_fmt, fp.read(head_size))
+        typecnt, charcnt) = unpack_from(head_fmt, buf)
 
     # Make sure it is a tzfile(5) file
     assert magic == _byte_string('TZif'), 'Got magic %s' % repr(magic)
 
+    # Version 2+ files repeat the data with 64-bit transition times, which
+    # go beyond 1901-2038, followed by a POSIX TZ string footer.
+    time_fmt = 'l'
+    pos = head_size
+    if format >= _byte_string('2'):
+        pos += (timecnt * 5 + typecnt * 6 + charcnt + leapcnt * 8 +
+                ttisstdcnt + ttisgmtcnt)
+        (magic, format, ttisgmtcnt, ttisstdcnt, leapcnt, timecnt,
+            typecnt, charcnt) = unpack_from(head_fmt, buf, pos)
+        assert magic == _byte_string('TZif'), 'Got magic %s' % repr(magic)
+        time_fmt = 'q'
+        pos += head_size
+
     # Read out the transition times, localtime indices and ttinfo structures.
-    data_fmt = '>%(timecnt)dl %(timecnt)dB %(ttinfo)s %(charcnt)ds' % dict(
-        timecnt=timecnt, ttinfo='lBB' * typecnt, charcnt=charcnt)
-    data_size = calcsize(data_fmt)
-    data = unpack(data_fmt, fp.read(data_size))
+    data_fmt = '>%(timecnt)d%(time)s %(timecnt)dB %(ttinfo)s %(charcnt)ds' % (
+        dict(timecnt=timecnt, time=time_fmt, ttinfo='lBB' * typecnt,
+             charcnt=charcnt))
+    data = unpack_from(data_fmt, buf, pos)
+
+    tz_string = ''
+    if time_fmt == 'q':
+        pos += (calcsize(data_fmt) + leapcnt * 12 + ttisstdcnt + ttisgmtcnt)
+        tz_string = _std_string(bytes(buf[pos:]).strip())
 
     # make sure we unpacked the right number of values
     assert len(data) == 2 * timecnt + 3 * typecnt + 1
-    transitions = [memorized_datetime(trans)
-                   for trans in data[:timecnt]]
+    transitions = list(data[:timecnt])
     lindexes = list(data[timecnt:2 * timecnt])
     ttinfo_raw = data[2 * timecnt:-1]
     tznames_raw = data[-1]
@@ -63,63 +105,128 @@ def build_tzinfo(zone, fp):
                        tznames[tzname_offset]))
         i += 3
 
-    # Now build the timezone object
+    # A StaticTzInfo
     if len(ttinfo) == 1 or len(transitions) == 0:
-        ttinfo[0][0], ttinfo[0][2]
-        cls = type(zone, (StaticTzInfo,), dict(
-            zone=zone,
-            _utcoffset=memorized_timedelta(ttinfo[0][0]),
-            _tzname=ttinfo[0][2]))
+        return [], [(ttinfo[0][0], 0, ttinfo[0][2])], ''
+
+    # Early dates use the first standard time ttinfo
+    i = 0
+    while ttinfo[i][1]:
+        i += 1
+    if ttinfo[i] == ttinfo[lindexes[0]]:
+        transitions[0] = _DATETIME_MIN
     else:
-        # Early dates use the first standard time ttinfo
-        i = 0
-        while ttinfo[i][1]:
-            i += 1
-        if ttinfo[i] == ttinfo[lindexes[0]]:
-            transitions[0] = datetime.min
+        transitions.insert(0, _DATETIME_MIN)
+        lindexes.insert(0, i)
+
+    # calculate transition info
+    transition_info = []
+    for i in range(len(transitions)):
+        inf = ttinfo[lindexes[i]]
+        utcoffset = inf[0]
+        if not inf[1]:
+            dst = 0
         else:
-            transitions.insert(0, datetime.min)
-            lindexes.insert(0, i)
-
-        # calculate transition info
-        transition_info = []
-        for i in range(len(transitions)):
-            inf = ttinfo[lindexes[i]]
-            utcoffset = inf[0]
-            if not inf[1]:
-                dst = 0
-            else:
-                for j in range(i - 1, -1, -1):
-                    prev_inf = ttinfo[lindexes[j]]
-                    if not prev_inf[1]:
-                        break
-                dst = inf[0] - prev_inf[0]  # dst offset
-
-                # Bad dst? Look further. DST > 24 hours happens when
-                # a timzone has moved across the international dateline.
-                if dst <= 0 or dst > 3600 * 3:
-                    for j in range(i + 1, len(transitions)):
-                        stdinf = ttinfo[lindexes[j]]
-                        if not stdinf[1]:
-                            dst = inf[0] - stdinf[0]
-                            if dst > 0:
-                                break  # Found a useful std time.
-
-            tzname = inf[2]
-
-            # Round utcoffset and dst to the nearest minute or the
-            # datetime library will complain. Conversions to these timezones
-            # might be up to plus or minus 30 seconds out, but it is
-            # the best we can do.
-            utcoffset = int((utcoffset + 30) // 60) * 60
-            dst = int((dst + 30) // 60) * 60
-            transition_info.append(memorized_ttinfo(utcoffset, dst, tzname))
+            for j in range(i - 1, -1, -1):
+                prev_inf = ttinfo[lindexes[j]]
+                if not prev_inf[1]:
+                    break
+            dst = inf[0] - prev_inf[0]  # dst offset
+
+            # Bad dst? Look further. DST > 24 hours happens when
+            # a timzone has moved across the international dateline.
+            if dst <= 0 or dst > 3600 * 3:
+                for j in range(i + 1, len(transitions)):
+                    stdinf = ttinfo[lindexes[j]]
+                    if not stdinf[1]:
+                        dst = inf[0] - stdinf[0]
+                        if dst > 0:
+                            break  # Found a useful std time.
+
+        tzname = inf[2]
+
+        # Round utcoffset and dst to the nearest minute or the
+        # datetime library will complain. Conversions to these timezones
+        # might be up to plus or minus 30 seconds out, but it is
+        # the best we can do.
+        utcoffset = int((utcoffset + 30) // 60) * 60
+        dst = int((dst + 30) // 60) * 60
+        transition_info.append((utcoffset, dst, tzname))
+
+    return transitions, transition_info, tz_string
+
+
+def _posix_rule(tz_string, transition_info):
+    """The DST rule of tz_string, None if it has none or is unsupported"""
+    if ',' not in tz_string:
+        # No DST: the last transition is in effect forever
+        return None
+    try:
+        return PosixRule(tz_string, transition_info)
+    except ValueError:
+        return None
+
+
+def tzinfo_from_data(zone, data):
+    """Build the tzinfo of zone from the result of parse_tzdata"""
+    transitions, transition_info, tz_string = data
 
+    # Now build the timezone object
+    if not transitions:
+        utcoffset, dst, tzname = transition_info[0]
+        cls = type(zone, (StaticTzInfo,), dict(
+            zone=zone,
+            _utcoffset=memorized_timedelta(utcoffset),
+            _tzname=tzname))
+    else:
         cls = type(zone, (DstTzInfo,), dict(
             zone=zone,
-            _utc_transition_times=transitions,
-            _transition_info=transition_info))
+            _utc_transition_epochs=array('q', transitions),
+            _utc_offsets=array('l', [inf[0] for inf in transition_info]),
+            _transition_info=[
+                memorized_ttinfo(*inf) for inf in transition_info],
+            _tz_rule=_posix_rule(tz_string, transition_info)))
+
+    return cls()
+
+
+# The class attributes holding the data of a zone
+_ZONE_DATA = ('_utcoffset', '_tzname', '_utc_transition_epochs',
+              '_utc_offsets', '_transition_info', '_tz_rule')
+
+# The class attributes of a DstTzInfo computed on first use
+_LAZY_ZONE_DATA = ('_utc_transition_times', '_local_index')
+
+
+class _SharedData(object):
+    """Data of a zone computed on first use, read from the class of an alias.
+
+    The data is computed once, and stored in both classes.
+    """
+    def __init__(self, cls, name):
+        self.cls = cls
+        self.name = name
+
+    def __get__(self, instance, owner):
+        value = getattr(self.cls, self.name)
+        setattr(owner, self.name, value)
+        return value
+
+
+def alias_tzinfo(zone, tz):
+    """Build the tzinfo of zone, an alias of tz with the same zoneinfo data.
 
+    The new class reports its own zone name but shares the transitions of
+    tz, and the data computed on first use, instead of copies.
+    """
+    base = type(tz)
+    namespace = dict((name, base.__dict__[name])
+                     for name in _ZONE_DATA if name in base.__dict__)
+    if issubclass(base, DstTzInfo):
+        for name in _LAZY_ZONE_DATA:
+            namespace[name] = base.__dict__.get(name) or _SharedData(base, name)
+    namespace['zone'] = zone
+    cls = type(zone, base.__bases__, namespace)
     return cls()
 
 if __name__ == '__main__':
@@ -0,0 +1,11 @@
+from typing import IO, Any, List, Tuple, Union
+
+from pytz import BaseTzInfo
+
+_TzData = Tuple[List[int], List[Tuple[int, int, str]], str]
+
+def build_tzinfo(zone: str, fp: IO[bytes]) -> BaseTzInfo: ...
+def build_tzinfo_from_buffer(zone: str, buf: Union[bytes, memoryview]) -> BaseTzInfo: ...
+def parse_tzdata(buf: Union[bytes, memoryview]) -> _TzData: ...
+def tzinfo_from_data(zone: str, data: Any) -> BaseTzInfo: ...
+def alias_tzinfo(zone: str, tz: BaseTzInfo) -> BaseTzInfo: ...
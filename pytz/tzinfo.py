@@ -1,5 +1,6 @@
 '''Base classes and helpers for building zone specific tzinfo classes'''
 
+from array import array
 from datetime import datetime, timedelta, tzinfo
 from bisect import bisect_right
 try:
@@ -9,51 +10,49 @@ except NameError:
 
 import pytz
 from pytz.exceptions import AmbiguousTimeError, NonExistentTimeError
+from pytz.lru import LRUCache
 
 __all__ = []
 
-_timedelta_cache = {}
+_timedelta_cache = LRUCache(1024)
 
 
 def memorized_timedelta(seconds):
     '''Create only one instance of each distinct timedelta'''
-    try:
-        return _timedelta_cache[seconds]
-    except KeyError:
-        delta = timedelta(seconds=seconds)
-        _timedelta_cache[seconds] = delta
-        return delta
+    delta = _timedelta_cache.get(seconds)
+    if delta is None:
+        delta = _timedelta_cache.setdefault(
+            seconds, timedelta(seconds=seconds))
+    return delta
 
 _epoch = datetime.utcfromtimestamp(0)
-_datetime_cache = {0: _epoch}
+_datetime_cache = LRUCache(4096)
+_datetime_cache[0] = _epoch
 
 
 def memorized_datetime(seconds):
     '''Create only one instance of each distinct datetime'''
-    try:
-        return _datetime_cache[seconds]
-    except KeyError:
+    dt = _datetime_cache.get(seconds)
+    if dt is None:
         # NB. We can't just do datetime.utcfromtimestamp(seconds) as this
         # fails with negative values under Windows (Bug #90096)
-        dt = _epoch + timedelta(seconds=seconds)
-        _datetime_cache[seconds] = dt
-        return dt
+        dt = _datetime_cache.setdefault(
+            seconds, _epoch + timedelta(seconds=seconds))
+    return dt
 
-_ttinfo_cache = {}
+_ttinfo_cache = LRUCache(2048)
 
 
 def memorized_ttinfo(*args):
     '''Create only one instance of each distinct tuple'''
-    try:
-        return _ttinfo_cache[args]
-    except KeyError:
-        ttinfo = (
+    ttinfo = _ttinfo_cache.get(args)
+    if ttinfo is None:
+        ttinfo = _ttinfo_cache.setdefault(args, (
             memorized_timedelta(args[0]),
             memorized_timedelta(args[1]),
             args[2]
-        )
-        _ttinfo_cache[args] = ttinfo
-        return ttinfo
+        ))
+    return ttinfo
 
 _notime = memorized_timedelta(0)
 
@@ -63,6 +62,148 @@ def _to_seconds(td):
     return td.seconds + td.days * 24 * 60 * 60
 
 
+def _epoch_seconds(dt):
+    '''Convert a naive datetime to whole seconds since the epoch'''
+    delta = dt - _epoch
+    return delta.seconds + delta.days * 24 * 60 * 60
+
+
+class _TransitionTimes(object):
+    '''The transition times of a DstTzInfo, as datetimes.
+
+    DstTzInfo only relies on the compact _utc_transition_epochs. This list
+    of datetimes is only built, once per zone, for code still using the
+    _utc_transition_times attribute.
+    '''
+    def __get__(self, instance, owner):
+        epochs = owner._utc_transition_epochs
+        if epochs is None:
+            return None
+        times = [memorized_datetime(seconds) for seconds in epochs]
+        owner._utc_transition_times = times
+        return times
+
+
+# Kinds of the segments of the local wall-clock time index
+_UNIQUE = 0     # A single possible utcoffset
+_GAP = 1        # Skipped by a transition moving the clock forward
+_FOLD = 2       # Repeated by a transition moving the clock back
+_IRREGULAR = 3  # Close transitions: localize() probes the transitions
+
+_DAY = 24 * 60 * 60
+
+# localize() finds the candidate utcoffsets by probing a day before and
+# after the time: the index only describes the times where this reliably
+# finds all of them, i.e. around periods longer than 4 days.
+_MIN_PERIOD = 4 * _DAY
+
+# Gaps are resolved by moving the time 6 hours at a time
+_GAP_STEP = 6 * 60 * 60
+
+_LOCAL_MIN = _epoch_seconds(datetime.min) + 2 * _DAY
+_LOCAL_MAX = _epoch_seconds(datetime.max) - 2 * _DAY
+
+
+def _build_local_index(cls):
+    '''Index the local wall-clock times of a DstTzInfo class.
+
+    Each info of _transition_info is in effect during a window of local
+    times. Sweeping these windows splits the local time line in segments
+    with either a single info (_UNIQUE), none (_GAP) or two (_FOLD),
+    allowing localize() to resolve a time with a single bisect.
+
+    Returns the sorted segment starts, in seconds since the epoch, and the
+    corresponding (kind, info, other info) segments. Past the last
+    explicit transition, the segments are _IRREGULAR if the zone has a
+    rule.
+    '''
+    epochs = cls._utc_transition_epochs
+    offsets = cls._utc_offsets
+    infos = cls._transition_info
+    last = len(epochs) - 1
+    has_rule = cls._tz_rule is not None
+
+    def regular(j):
+        if j == 0:
+            return True
+        if j == last:
+            return not has_rule
+        return epochs[j + 1] - epochs[j] > _MIN_PERIOD
+
+    # Window j starts at epochs[j] + offsets[j] and ends at
+    # epochs[j + 1] + offsets[j]. The first and last ones are unbounded.
+    events = []
+    for j in range(1, last + 1):
+        events.append((epochs[j] + offsets[j - 1], -1, j - 1))
+        events.append((epochs[j] + offsets[j], 1, j))
+    events.sort()
+
+    active = set([0])
+    bounds = [_LOCAL_MIN]
+    actives = [frozenset(active)]
+    for seconds, change, j in events:
+        if change > 0:
+            active.add(j)
+        else:
+            active.discard(j)
+        seconds = min(max(seconds, _LOCAL_MIN), _LOCAL_MAX)
+        if bounds[-1] == seconds:
+            actives[-1] = frozenset(active)
+        else:
+            bounds.append(seconds)
+            actives.append(frozenset(active))
+
+    segments = []
+    for current in actives:
+        if not all(regular(j) for j in current):
+            segments.append((_IRREGULAR, None, None))
+        elif len(current) == 1:
+            j, = current
+            segments.append((_UNIQUE, infos[j], None))
+        elif len(current) == 2:
+            # The first info by UTC has the largest utcoffset
+            before, after = sorted(current, key=lambda j: -offsets[j])
+            segments.append((_FOLD, infos[before], infos[after]))
+        elif len(current) == 0:
+            segments.append((_GAP, None, None))
+        else:
+            segments.append((_IRREGULAR, None, None))
+
+    # A gap is resolved to the info of the segment preceding or following
+    # it, if reached by moving the time 6 hours at a time.
+    bounds.append(_LOCAL_MAX)
+    for idx, segment in enumerate(segments):
+        if segment[0] != _GAP:
+            continue
+        if (0 < idx < len(segments) - 1 and
+                segments[idx - 1][0] == _UNIQUE and
+                segments[idx + 1][0] == _UNIQUE and
+                bounds[idx] - bounds[idx - 1] >= _GAP_STEP and
+                bounds[idx + 2] - bounds[idx + 1] >= _GAP_STEP):
+            segments[idx] = (
+                _GAP, segments[idx - 1][1], segments[idx + 1][1])
+        else:
+            segments[idx] = (_IRREGULAR, None, None)
+    bounds.pop()
+
+    # Times too close to datetime.min or datetime.max for the probes
+    bounds[0] = -2 ** 63
+    segments[0] = (_IRREGULAR, None, None)
+    bounds.append(_LOCAL_MAX)
+    segments.append((_IRREGULAR, None, None))
+    return array('q', bounds), segments
+
+
+class _LocalIndex(object):
+    '''The local wall-clock time index of a DstTzInfo, built on first use
+    once per zone by _build_local_index.
+    '''
+    def __get__(self, instance, owner):
+        index = _build_local_index(owner)
+        owner._local_index = index
+        return index
+
+
 class BaseTzInfo(tzinfo):
     # Overridden in subclass
     _utcoffset = None
@@ -162,13 +303,28 @@ class DstTzInfo(BaseTzInfo):
     '''
     # Overridden in subclass
 
-    # Sorted list of DST transition times, UTC
-    _utc_transition_times = None
+    # Sorted array('q') of DST transition times, UTC seconds since the epoch
+    _utc_transition_epochs = None
+
+    # array('l') of the utcoffset, in seconds, corresponding to
+    # _utc_transition_epochs entries
+    _utc_offsets = None
 
     # [(utcoffset, dstoffset, tzname)] corresponding to
-    # _utc_transition_times entries
+    # _utc_transition_epochs entries
     _transition_info = None
 
+    # Sorted list of DST transition times, UTC, as datetimes. Computed
+    # from _utc_transition_epochs on first access.
+    _utc_transition_times = _TransitionTimes()
+
+    # Segments of the local time line, see _build_local_index
+    _local_index = _LocalIndex()
+
+    # tzrule.PosixRule giving the transitions after the last one of
+    # _utc_transition_epochs, or None if the last one is in effect forever
+    _tz_rule = None
+
     zone = None
 
     # Set in __init__
@@ -177,6 +333,13 @@ class DstTzInfo(BaseTzInfo):
     _dst = None  # DST offset
 
     def __init__(self, _inf=None, _tzinfos=None):
+        cls = self.__class__
+        if cls._utc_transition_epochs is None:
+            # A subclass only defining the datetime transition times
+            cls._utc_transition_epochs = array('q', [
+                _epoch_seconds(dt) for dt in cls._utc_transition_times])
+            cls._utc_offsets = array('l', [
+                _to_seconds(inf[0]) for inf in cls._transition_info])
         if _inf:
             self._tzinfos = _tzinfos
             self._utcoffset, self._dst, self._tzname = _inf
@@ -189,6 +352,11 @@ class DstTzInfo(BaseTzInfo):
             for inf in self._transition_info[1:]:
                 if inf not in _tzinfos:
                     _tzinfos[inf] = self.__class__(inf, _tzinfos)
+            if self._tz_rule is not None:
+                for raw in (self._tz_rule.std_info, self._tz_rule.dst_info):
+                    inf = memorized_ttinfo(*raw)
+                    if inf not in _tzinfos:
+                        _tzinfos[inf] = self.__class__(inf, _tzinfos)
 
     def fromutc(self, dt):
         '''See datetime.tzinfo.fromutc'''
@@ -196,10 +364,38 @@ class DstTzInfo(BaseTzInfo):
                 getattr(dt.tzinfo, '_tzinfos', None) is not self._tzinfos):
             raise ValueError('fromutc: dt.tzinfo is not self')
         dt = dt.replace(tzinfo=None)
-        idx = max(0, bisect_right(self._utc_transition_times, dt) - 1)
-        inf = self._transition_info[idx]
+        inf = self._find_info(_epoch_seconds(dt))
         return (dt + inf[0]).replace(tzinfo=self._tzinfos[inf])
 
+    def _find_info(self, seconds):
+        '''(utcoffset, dstoffset, tzname) at seconds since the epoch'''
+        epochs = self._utc_transition_epochs
+        if self._tz_rule is not None and seconds > epochs[-1]:
+            return memorized_ttinfo(*self._tz_rule.info_at(seconds))
+        return self._transition_info[
+            max(0, bisect_right(epochs, seconds) - 1)]
+
+    def utcoffset_at(self, seconds):
+        '''UTC offset, in seconds, at a UTC time in seconds since the epoch
+
+        An integer-only alternative to fromutc(...).utcoffset()
+
+        >>> from pytz import timezone
+        >>> timezone('Europe/Amsterdam').utcoffset_at(1096761600)
+        7200
+        >>> timezone('Europe/Amsterdam').utcoffset_at(1104537600)
+        3600
+
+        Far-future dates follow the daylight saving time rule of the zone
+
+        >>> timezone('Europe/Amsterdam').utcoffset_at(2382004800)
+        7200
+        '''
+        epochs = self._utc_transition_epochs
+        if self._tz_rule is not None and seconds > epochs[-1]:
+            return self._tz_rule.info_at(seconds)[0]
+        return self._utc_offsets[max(0, bisect_right(epochs, seconds) - 1)]
+
     def normalize(self, dt):
         '''Correct the timezone information on the given datetime
 
@@ -317,13 +513,37 @@ class DstTzInfo(BaseTzInfo):
         if dt.tzinfo is not None:
             raise ValueError('Not naive datetime (tzinfo is already set)')
 
+        bounds, segments = self._local_index
+        idx = bisect_right(bounds, _epoch_seconds(dt)) - 1
+        kind, inf, other = segments[idx]
+        if kind == _UNIQUE:
+            return dt.replace(tzinfo=self._tzinfos[inf])
+        if kind == _FOLD:
+            if is_dst is None:
+                raise AmbiguousTimeError(dt)
+            # Same resolution as in _localize_probing, inf being the first
+            # by UTC
+            if (bool(inf[1]) == is_dst) != (bool(other[1]) == is_dst):
+                if bool(inf[1]) != is_dst:
+                    inf = other
+            elif not is_dst:
+                inf = other
+            return dt.replace(tzinfo=self._tzinfos[inf])
+        if kind == _GAP:
+            if is_dst is None:
+                raise NonExistentTimeError(dt)
+            if is_dst:
+                inf = other
+            return dt.replace(tzinfo=self._tzinfos[inf])
+        return self._localize_probing(dt, is_dst)
+
+    def _localize_probing(self, dt, is_dst):
+        '''localize() for the times missing from the local time index'''
         # Find the two best possibilities.
         possible_loc_dt = set()
-        for delta in [timedelta(days=-1), timedelta(days=1)]:
-            loc_dt = dt + delta
-            idx = max(0, bisect_right(
-                self._utc_transition_times, loc_dt) - 1)
-            inf = self._transition_info[idx]
+        seconds = _epoch_seconds(dt)
+        for delta in [-24 * 60 * 60, 24 * 60 * 60]:
+            inf = self._find_info(seconds + delta)
             tzinfo = self._tzinfos[inf]
             loc_dt = tzinfo.normalize(dt.replace(tzinfo=tzinfo))
             if loc_dt.replace(tzinfo=None) == dt:
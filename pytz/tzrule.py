@@ -0,0 +1,168 @@
+'''
+POSIX TZ rules, as found in the footer of TZif version 2+ files.
+
+The footer describes the transitions following the last explicit one of
+the file, e.g. 'CET-1CEST,M3.5.0,M10.5.0/3'. Rather than expanding years
+of transitions up front, the transitions of a year are computed the
+first time a date of that year is queried.
+'''
+
+import re
+from bisect import bisect_right
+from datetime import date, MINYEAR, MAXYEAR
+
+__all__ = ['PosixRule']
+
+_NAME = r'([A-Za-z]{3,}|<[A-Za-z0-9+-]+>)'
+_OFFSET = r'([+-]?\d{1,3}(?::\d{1,2}){0,2})'
+_DATE = r'(J\d{1,3}|\d{1,3}|M\d{1,2}\.\d\.\d)'
+_TIME = r'(?:/([+-]?\d{1,3}(?::\d{1,2}){0,2}))?'
+
+_tz_string_re = re.compile(
+    '^' + _NAME + _OFFSET +
+    '(?:' + _NAME + _OFFSET + '?' +
+    ',' + _DATE + _TIME + ',' + _DATE + _TIME + ')?$')
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_MIN_ORDINAL = date.min.toordinal()
+_MAX_ORDINAL = date.max.toordinal()
+_DAY = 24 * 60 * 60
+
+
+def _seconds(s):
+    '''Convert a POSIX [+-]hh[:mm[:ss]] to seconds'''
+    sign = -1 if s.startswith('-') else 1
+    parts = [int(part) for part in s.lstrip('+-').split(':')]
+    parts += [0] * (3 - len(parts))
+    return sign * (parts[0] * 3600 + parts[1] * 60 + parts[2])
+
+
+def _round(seconds):
+    '''Round to the nearest minute, as tzfile does for transition_info'''
+    return int((seconds + 30) // 60) * 60
+
+
+def _year(seconds):
+    '''The UTC year of seconds since the epoch'''
+    ordinal = _EPOCH_ORDINAL + seconds // _DAY
+    return date.fromordinal(
+        min(max(ordinal, _MIN_ORDINAL), _MAX_ORDINAL)).year
+
+
+def _is_leap(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def _day_ordinal(rule, year):
+    '''The proleptic Gregorian ordinal of the day described by rule'''
+    if rule.startswith('J'):
+        # Julian day 1..365, February 29th is never counted
+        day = int(rule[1:])
+        if _is_leap(year) and day >= 60:
+            day += 1
+        return date(year, 1, 1).toordinal() + day - 1
+    if rule.startswith('M'):
+        # Day d (0 is Sunday) of week w (5 is the last) of month m
+        month, week, weekday = [int(part) for part in rule[1:].split('.')]
+        first = date(year, month, 1)
+        first_weekday = (first.weekday() + 1) % 7
+        day = 1 + (weekday - first_weekday) % 7 + (week - 1) * 7
+        if month == 12:
+            days_in_month = 31
+        else:
+            days_in_month = (date(year, month + 1, 1) - first).days
+        while day > days_in_month:
+            day -= 7
+        return first.toordinal() + day - 1
+    # Zero-based day of the year, February 29th is counted
+    return date(year, 1, 1).toordinal() + int(rule)
+
+
+class PosixRule(object):
+    '''The daylight saving time rule of a POSIX TZ string.
+
+    std_info and dst_info are the (utcoffset, dst, tzname) tuples in effect
+    outside and during daylight saving time, with the offsets in seconds.
+    They are matched against known_infos when possible, so that the
+    computed transitions continue the explicit ones seamlessly.
+    '''
+
+    def __init__(self, tz_string, known_infos=()):
+        match = _tz_string_re.match(tz_string)
+        if match is None or match.group(3) is None:
+            raise ValueError('No DST rule in TZ string: %r' % (tz_string,))
+        (std_name, std_offset, dst_name, dst_offset,
+            self._start, start_time, self._end, end_time) = match.groups()
+
+        # POSIX offsets are positive west of Greenwich
+        self._std_offset = -_seconds(std_offset)
+        if dst_offset is None:
+            self._dst_offset = self._std_offset + 3600
+        else:
+            self._dst_offset = -_seconds(dst_offset)
+        self._start_time = _seconds(start_time or '2')
+        self._end_time = _seconds(end_time or '2')
+
+        self.std_info = self._info(
+            self._std_offset, 0, std_name.strip('<>'), known_infos)
+        self.dst_info = self._info(
+            self._dst_offset, self._dst_offset - self._std_offset,
+            dst_name.strip('<>'), known_infos)
+
+        self._years = {}
+
+    @staticmethod
+    def _info(utcoffset, dst, tzname, known_infos):
+        utcoffset = _round(utcoffset)
+        for info in reversed(known_infos):
+            if info[0] == utcoffset and info[2] == tzname:
+                return info
+        return (utcoffset, _round(dst), tzname)
+
+    def transitions(self, year):
+        '''Sorted [(utc seconds, info)] of the two transitions of year'''
+        start = ((_day_ordinal(self._start, year) - _EPOCH_ORDINAL) * _DAY +
+                 self._start_time - self._std_offset)
+        end = ((_day_ordinal(self._end, year) - _EPOCH_ORDINAL) * _DAY +
+               self._end_time - self._dst_offset)
+        return sorted([(start, self.dst_info), (end, self.std_info)])
+
+    def _around(self, year):
+        '''Transitions from year - 1 to year + 1, as two parallel lists
+
+        The neighbouring years are limited to the range of datetime.date.
+        '''
+        try:
+            return self._years[year]
+        except KeyError:
+            pass
+        merged = []
+        for neighbour in range(max(year - 1, MINYEAR),
+                               min(year + 1, MAXYEAR) + 1):
+            merged.extend(self.transitions(neighbour))
+        merged.sort()
+        around = ([seconds for seconds, _ in merged],
+                  [info for _, info in merged])
+        self._years[year] = around
+        return around
+
+    def info_at(self, seconds):
+        '''The info in effect at UTC seconds since the epoch'''
+        year = _year(seconds)
+        times, infos = self._around(year)
+        idx = bisect_right(times, seconds) - 1
+        if idx < 0:
+            # Before the first transition computed: in the previous year
+            if year - 2 < MINYEAR:
+                return self.std_info
+            return self.transitions(year - 2)[-1][1]
+        return infos[idx]
+
+    def transitions_between(self, start, end):
+        '''[(utc seconds, info)] of the transitions in [start, end)'''
+        result = []
+        for year in range(_year(start), _year(end) + 1):
+            for seconds, info in self.transitions(year):
+                if start <= seconds < end:
+                    result.append((seconds, info))
+        return result
@@ -0,0 +1,117 @@
+import bisect
+import datetime as dt
+import unittest
+import unittest.mock as mock
+from typing import Any, Iterable, List, Tuple
+
+import pytz
+import ultz
+import ultz.bulk as bulk
+
+# From 1900 to 2060, every month and a bit, to hit both sides of transitions.
+EPOCHS = list(range(-2208988800, 2840140800, 2718281))
+
+
+def expected(epochs: List[int], zone: str) -> Tuple[List[int], List[int], List[bool]]:
+    tz = pytz.timezone(zone)
+    offsets = []
+    local = []
+    dsts = []
+    for epoch in epochs:
+        utc = dt.datetime(1970, 1, 1, tzinfo=pytz.utc) + dt.timedelta(seconds=epoch)
+        there = utc.astimezone(tz)
+        offset = int(there.utcoffset().total_seconds())  # type: ignore
+        offsets.append(offset)
+        local.append(epoch + offset)
+        dsts.append(bool(there.dst()))
+    return offsets, local, dsts
+
+
+class FakeArray(List[Any]):
+    """The few operations of a NumPy array used by :mod:`ultz.bulk`."""
+
+    def __getitem__(self, index: Any) -> Any:
+        item = super().__getitem__
+        if isinstance(index, list):
+            return FakeArray(item(idx) for idx in index)
+        return item(index)
+
+    def __add__(self, other: Any) -> "FakeArray":
+        return FakeArray(left + right for left, right in zip(self, other))
+
+
+class FakeNumPy:
+    """The few functions of NumPy used by :mod:`ultz.bulk`, to test it without NumPy."""
+
+    int64 = int
+    max = max
+
+    @staticmethod
+    def asarray(values: Iterable[Any], dtype: Any) -> FakeArray:
+        return FakeArray(dtype(value) for value in values)
+
+    @staticmethod
+    def searchsorted(array: List[int], values: List[int], side: str) -> FakeArray:
+        search = bisect.bisect_right if side == "right" else bisect.bisect_left
+        return FakeArray(search(array, value) for value in values)
+
+    @staticmethod
+    def subtract(array: List[int], value: int, out: List[int]) -> None:
+        out[:] = [item - value for item in array]
+
+    @staticmethod
+    def maximum(array: List[int], value: int, out: List[int]) -> None:
+        out[:] = [max(item, value) for item in array]
+
+
+class TestConvertMany(unittest.TestCase):
+    def check(self, zone: str, use_numpy: bool) -> None:
+        offsets, local, dsts = expected(EPOCHS, zone)
+        # Use pytz directly, as some tzwrap shorthands are deliberately swapped.
+        result = bulk.convert_many(EPOCHS, pytz.timezone(zone), use_numpy)
+        self.assertEqual(list(result.offsets), offsets)
+        self.assertEqual(list(result.local), local)
+        self.assertEqual(list(result.dst), dsts)
+
+    def test_python(self) -> None:
+        for zone in ("Europe/Amsterdam", "US/Pacific", "Australia/Lord_Howe", "UTC"):
+            with self.subTest(zone=zone):
+                self.check(zone, False)
+
+    def test_static(self) -> None:
+        self.check("Etc/GMT+5", False)
+
+    @unittest.skipIf(bulk.numpy is None, "NumPy is not installed")
+    def test_numpy(self) -> None:
+        for zone in ("Europe/Amsterdam", "US/Pacific", "Etc/GMT+5", "UTC"):
+            with self.subTest(zone=zone):
+                self.check(zone, True)
+
+    def test_numpy_branch(self) -> None:
+        with mock.patch("ultz.bulk.numpy", FakeNumPy()):
+            for zone in ("Europe/Amsterdam", "Etc/GMT+5"):
+                with self.subTest(zone=zone):
+                    self.check(zone, True)
+            self.assertEqual(bulk.convert_many([], "UTC"), ([], [], []))
+
+    def test_missing_numpy(self) -> None:
+        with mock.patch("ultz.bulk.numpy", None):
+            with self.assertRaises(ImportError):
+                bulk.convert_many(EPOCHS, "UTC", True)
+            self.assertEqual(
+                bulk.convert_many(EPOCHS, "UTC"),
+                bulk.convert_many(EPOCHS, "UTC", False),
+            )
+
+    def test_shorthand(self) -> None:
+        self.assertEqual(
+            bulk.convert_many(EPOCHS, "Tokyo", False),
+            bulk.convert_many(EPOCHS, pytz.timezone("Asia/Tokyo"), False),
+        )
+
+    def test_unknown(self) -> None:
+        with self.assertRaises(pytz.UnknownTimeZoneError):
+            bulk.convert_many(EPOCHS, "ChozoPlanet")
+
+    def test_package_export(self) -> None:
+        self.assertIs(ultz.convert_many, bulk.convert_many)
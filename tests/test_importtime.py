@@ -0,0 +1,69 @@
+import os
+import unittest
+import unittest.mock as mock
+
+from benchmarks import importtime
+
+THRESHOLD = 1.5
+"""The import time of the project modules may grow by this factor over the baseline
+before failing, to absorb the noise of the measures."""
+
+ENV_VAR = "ULTZ_IMPORTTIME"
+"""The environment variable enabling the check of the import time budget, which
+imports each target several times in new interpreters."""
+
+SLACK = 10000
+"""An allowance in microseconds, added to the threshold, for the small targets."""
+
+
+class TestImportTime(unittest.TestCase):
+    def test_parse(self) -> None:
+        output = "\n".join(
+            [
+                "import time: self [us] | cumulative | imported package",
+                "import time:       100 |        100 | site",
+                "import time:        20 |         20 |     pytz.lazy",
+                "import time:        30 |         50 |   pytz",
+                "import time:        10 |         60 | ultz",
+            ]
+        )
+
+        modules = importtime.parse_importtime(output, "ultz")
+
+        self.assertEqual(
+            modules,
+            {
+                "pytz.lazy": importtime.ModuleTime(20, 20),
+                "pytz": importtime.ModuleTime(30, 50),
+                "ultz": importtime.ModuleTime(10, 60),
+            },
+        )
+
+    def test_failed_runs(self) -> None:
+        sample = {"pytz": importtime.ModuleTime(30, 50)}
+        with mock.patch.object(
+            importtime, "measure_once", side_effect=[sample, None, None]
+        ):
+            self.assertIsNone(importtime.measure("pytz", runs=2))
+
+    @unittest.skipUnless(
+        os.environ.get(ENV_VAR), f"Slow and machine-dependent, set {ENV_VAR}=1 to run"
+    )
+    def test_budget(self) -> None:
+        baseline = importtime.load_baseline()
+        for target, (total, project) in baseline.items():
+            with self.subTest(target=target):
+                result = importtime.measure(target, runs=3)
+                if result is None:
+                    self.skipTest(f"{target} cannot be imported")
+                    continue
+                # The standard library modules, imported in the same run, give the
+                # speed of this machine relative to the one of the baseline.
+                speed = (result.total - result.project) / max(total - project, 1)
+                self.assertLessEqual(
+                    result.project,
+                    project * speed * THRESHOLD + SLACK,
+                    f"The import of {target} takes {result.project}us in the project"
+                    f" modules, against {project}us in benchmarks/importtime.json,"
+                    f" times {speed:.2f} for the speed of this machine",
+                )
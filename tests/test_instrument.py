@@ -0,0 +1,116 @@
+import unittest
+import unittest.mock as mock
+
+from freezegun import freeze_time
+
+import ultz.instrument as instrument
+import ultz.ultz as ultz
+
+
+class TestHistogram(unittest.TestCase):
+    def test_empty(self) -> None:
+        histogram = instrument.Histogram()
+        self.assertEqual(histogram.mean(), 0.0)
+        self.assertEqual(histogram.percentile(0.5), 0.0)
+
+    def test_percentile(self) -> None:
+        histogram = instrument.Histogram()
+        for _ in range(90):
+            histogram.add(3e-6)
+        for _ in range(10):
+            histogram.add(1e-3)
+
+        self.assertEqual(histogram.count, 100)
+        self.assertAlmostEqual(histogram.mean(), (90 * 3e-6 + 10 * 1e-3) / 100)
+        self.assertEqual(histogram.maximum, 1e-3)
+        # 3us is in the bucket from 2 to 4us
+        self.assertAlmostEqual(histogram.percentile(0.5), 4e-6)
+        self.assertAlmostEqual(histogram.percentile(0.9), 4e-6)
+        self.assertAlmostEqual(histogram.percentile(0.95), 1e-3)
+
+    def test_overflow(self) -> None:
+        histogram = instrument.Histogram()
+        histogram.add(3600.0)
+        self.assertEqual(histogram.buckets[-1], 1)
+        self.assertEqual(histogram.percentile(0.5), 3600.0)
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self) -> None:
+        ultz.clear_cache()
+        instrument.reset()
+        self.addCleanup(instrument.enable, instrument.is_enabled())
+
+    def test_disabled(self) -> None:
+        instrument.enable(False)
+        ultz.process_input("Europe/Paris")
+        self.assertIsNone(instrument.stopwatch())
+        self.assertEqual(instrument.histograms(), {})
+
+    @freeze_time("2021-06-01 12:00")
+    def test_stages(self) -> None:
+        instrument.enable()
+        ultz.process_input("Europe/Paris, Asia/Tokyo at 2021-05-04 12:00")
+        ultz.process_input("12:00 in Europe/Paris")
+
+        histograms = instrument.histograms()
+        for stage in [
+            instrument.PARSE,
+            instrument.TIMEZONE,
+            instrument.LOCALIZE,
+            instrument.CONVERT,
+            instrument.FORMAT,
+        ]:
+            self.assertIn(stage, histograms)
+        self.assertEqual(histograms[instrument.TOTAL].count, 2)
+        self.assertEqual(histograms[instrument.LOCALIZE].count, 1)
+        self.assertNotIn(instrument.CACHE, histograms)
+        self.assertGreaterEqual(
+            histograms[instrument.TOTAL].total, histograms[instrument.PARSE].total
+        )
+        self.assertEqual(len(instrument.summary()), len(histograms))
+
+    @freeze_time("2021-06-01 12:00")
+    def test_cached(self) -> None:
+        instrument.enable()
+        ultz.process_input("Europe/Paris")
+        ultz.process_input("Europe/Paris")
+
+        histograms = instrument.histograms()
+        self.assertEqual(histograms[instrument.CACHE].count, 1)
+        self.assertEqual(histograms[instrument.TOTAL].count, 2)
+
+    @freeze_time("2021-06-01 12:00")
+    def test_suggestions(self) -> None:
+        instrument.enable()
+        ultz.process_query("Europe/Pa")
+
+        histograms = instrument.histograms()
+        self.assertEqual(histograms[instrument.SEARCH].count, 1)
+        self.assertEqual(histograms[instrument.TOTAL].count, 1)
+
+    @freeze_time("2021-06-01 12:00")
+    def test_known_zone_query(self) -> None:
+        instrument.enable()
+        with mock.patch.object(
+            instrument, "stopwatch", wraps=instrument.stopwatch
+        ) as started:
+            ultz.process_query("Europe/Paris")
+
+        # The stopwatch of the query is the one of its results
+        self.assertEqual(started.call_count, 1)
+        self.assertEqual(instrument.histograms()[instrument.TOTAL].count, 1)
+
+    def test_log(self) -> None:
+        instrument.enable()
+        with self.assertLogs("ultz.instrument", "DEBUG") as logs:
+            ultz.process_input("Europe/Paris")
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("'Europe/Paris'", logs.output[0])
+        self.assertIn("total=", logs.output[0])
+
+    def test_environment(self) -> None:
+        # pylint: disable=protected-access
+        for value, enabled in [("1", True), ("0", False), ("", False)]:
+            with mock.patch.dict("os.environ", {instrument.ENV_VAR: value}):
+                self.assertEqual(instrument._from_environment(), enabled)
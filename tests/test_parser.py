@@ -1,5 +1,8 @@
 import datetime as dt
+import random
 import unittest
+import unittest.mock as mock
+from typing import Tuple
 
 from freezegun import freeze_time
 
@@ -29,6 +32,23 @@ class TestParseTime(unittest.TestCase):
         parsed = parser.parse_time("89:9")
         self.assertIsNone(parsed)
 
+    def test_offset(self) -> None:
+        tzinfo = dt.timezone(-dt.timedelta(hours=5, minutes=30))
+        expected = dt.time(8, 15, 2, 250000, tzinfo)
+
+        parsed = parser.parse_time("08:15:02.250-05:30")
+
+        self.assertEqual(parsed, expected)
+
+    def test_partial(self) -> None:
+        for user_input in ["1", "12:", "12:3", "12:30:", "12:30+", "12:30+01", "24:00"]:
+            with self.subTest(user_input=user_input):
+                self.assertIsNone(parser.parse_time(user_input))
+
+    def test_not_a_date(self) -> None:
+        # Accepted as 10:00-12:00 by datetime.time.fromisoformat since Python 3.11
+        self.assertIsNone(parser.parse_time("10-12"))
+
 
 class TestParseDate(unittest.TestCase):
     @freeze_time("2002-01-23 15:42")
@@ -89,6 +109,19 @@ class TestParseDate(unittest.TestCase):
         parsed = parser.parse_date("02-15", "ALT")
         self.assertIsNone(parsed)
 
+    @freeze_time("2023-03-01 12:00")
+    def test_leap_day(self) -> None:
+        self.assertIsNone(parser.parse_date("02-29"))
+        self.assertIsNone(parser.parse_date("29-02-2023", "ALT"))
+        self.assertEqual(parser.parse_date("2024-02-29"), dt.date(2024, 2, 29))
+        self.assertEqual(parser.parse_date("29-02-2024", "ALT"), dt.date(2024, 2, 29))
+
+    def test_partial(self) -> None:
+        for form in ["ISO", "ALT"]:
+            for user_input in ["2", "20", "201", "2019-", "2019-0", "05-", "05-13-"]:
+                with self.subTest(form=form, user_input=user_input):
+                    self.assertIsNone(parser.parse_date(user_input, form))
+
 
 class TestParseDateTime(unittest.TestCase):
     @freeze_time("2005-04-23 12:23")
@@ -137,3 +170,109 @@ class TestParseDateTime(unittest.TestCase):
     def test_incorrect_syntax(self) -> None:
         parsed = parser.parse_datetime("07-25 07:25 12:30")
         self.assertIsNone(parsed)
+
+
+class TestTokenize(unittest.TestCase):
+    def components(self, expr: str) -> Tuple[object, ...]:
+        code, zone, datetime = parser.tokenize(expr)
+        if zone is None:
+            return code, None, None
+        if datetime is None:
+            return code, expr[zone[0] : zone[1]], None
+        return (
+            code,
+            expr[zone[0] : zone[1]],
+            tuple(expr[start:end] for start, end in datetime),
+        )
+
+    def test_zone_only(self) -> None:
+        self.assertEqual(
+            self.components("  Europe/Paris "),
+            (parser.ExprCode.TZ_ONLY, "Europe/Paris", None),
+        )
+
+    def test_date_in(self) -> None:
+        self.assertEqual(
+            self.components(" 2019-05-13 12:30 in  Tokyo"),
+            (parser.ExprCode.TZ_DATEIN, "Tokyo", ("2019-05-13", "12:30")),
+        )
+
+    def test_date_at(self) -> None:
+        self.assertEqual(
+            self.components("Tokyo at 12:30"),
+            (parser.ExprCode.TZ_DATEAT, "Tokyo", ("12:30", "12:30")),
+        )
+
+    def test_too_many_components(self) -> None:
+        self.assertEqual(
+            self.components("Tokyo at 05-13 12:30 UTC"),
+            (parser.ExprCode.TZ_DATEAT, "Tokyo", None),
+        )
+
+    def test_invalid(self) -> None:
+        for expr in [
+            "",
+            "12:30 in Paris at 13:30",
+            "Paris at 12:30 at 13:30",
+            "Paris in at 12:30",
+        ]:
+            self.assertEqual(parser.tokenize(expr), (parser.ExprCode.ERR, None, None))
+
+
+class TestIncrementalParser(unittest.TestCase):
+    EXPRESSIONS = [
+        "Asia/Tokyo at 15:30",
+        "2020-05-01 12:00 in America/New_York",
+        "12:29 in America/New_York at 01:12",
+        "Antarctica/Casey in in at  at",
+        "in at in 10:10 at  in",
+    ]
+
+    def assert_same(self, incremental: parser.IncrementalParser, expr: str) -> None:
+        for form in ("ISO", "ALT"):
+            self.assertEqual(
+                incremental.parse_parts(expr, form),
+                parser.parse_expression_parts(expr, form),
+                expr,
+            )
+
+    @freeze_time("2020-03-04 12:00")
+    def test_typing(self) -> None:
+        incremental = parser.IncrementalParser()
+        for expr in self.EXPRESSIONS:
+            for end in range(len(expr) + 1):
+                self.assert_same(incremental, expr[:end])
+            # Then erasing it
+            for end in range(len(expr), -1, -1):
+                self.assert_same(incremental, expr[:end])
+
+    @freeze_time("2020-03-04 12:00")
+    def test_editing(self) -> None:
+        rand = random.Random(42)
+        incremental = parser.IncrementalParser()
+        expr = ""
+        for _ in range(2000):
+            pos = rand.randint(0, len(expr))
+            if expr and rand.random() < 0.3:
+                expr = expr[:pos] + expr[pos + 1 :]
+            else:
+                expr = expr[:pos] + rand.choice(" inat1:") + expr[pos:]
+            self.assert_same(incremental, expr)
+
+    def test_reuse(self) -> None:
+        incremental = parser.IncrementalParser()
+        with mock.patch(
+            "ultz.parser.parse_datetime_parts", wraps=parser.parse_datetime_parts
+        ) as parse_datetime_parts:
+            expr = "15:30 in Asia/Tokyo"
+            for end in range(len("15:30 in A"), len(expr) + 1):
+                incremental.parse_parts(expr[:end])
+            parse_datetime_parts.assert_called_once_with("15:30", "ISO")
+
+    @freeze_time("2020-03-04 12:00:00")
+    def test_completed(self) -> None:
+        incremental = parser.IncrementalParser()
+        self.assertEqual(
+            incremental.parse("Asia/Tokyo at 15:30"),
+            parser.parse_expression("Asia/Tokyo at 15:30"),
+        )
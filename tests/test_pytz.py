@@ -0,0 +1,509 @@
+import datetime as dt
+import io
+import os
+import pickle  # nosec
+import random
+import tempfile
+import threading
+import time
+import unittest
+import unittest.mock as mock
+import weakref
+from typing import Any, Dict, Iterator, List, Optional
+
+import pytz
+import pytz.bundle as bundle
+import pytz.diskcache as diskcache
+import pytz.tzfile as tzfile
+from pytz.lazy import LazyList, LazySet
+from pytz.lru import CacheInfo, LRUCache
+
+try:
+    import zoneinfo
+
+    HAS_ZONEINFO = True
+except ImportError:  # Python < 3.9
+    HAS_ZONEINFO = False
+
+
+class TestBundle(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.directory: str = self.tmp.name
+
+    def test_roundtrip(self) -> None:
+        zoneinfo_dir = os.path.join(self.directory, "zoneinfo")
+        os.makedirs(os.path.join(zoneinfo_dir, "Europe"))
+        contents = {"Europe/Lisbon": b"lisbon", "Portugal": b"lisbon", "UTC": b"utc"}
+        for name, content in contents.items():
+            with open(os.path.join(zoneinfo_dir, name), "wb") as resource:
+                resource.write(content)
+        filename = os.path.join(self.directory, "test.bundle")
+        bundle.write_bundle(zoneinfo_dir, filename)
+
+        zones = bundle.ZoneBundle(filename)
+        self.assertEqual(sorted(zones), sorted(contents))
+        for name, content in contents.items():
+            self.assertEqual(zones.get(name), content)
+        self.assertIsNone(zones.get("Europe/Paris"))
+        # Identical resources are stored once
+        self.assertEqual(zones.location("Portugal"), zones.location("Europe/Lisbon"))
+
+    def check_fallback(self, filename: str) -> None:
+        with mock.patch("pytz._bundle", None), mock.patch(
+            "pytz.bundle.BUNDLE_NAME", filename
+        ), mock.patch("pytz._tzinfo_cache", LRUCache()):
+            self.assertIsNone(pytz._get_bundle())
+            paris = pytz.timezone("Europe/Paris")
+        self.assertEqual(
+            paris.localize(dt.datetime(2020, 7, 1)).utcoffset(), dt.timedelta(hours=2)
+        )
+
+    def test_missing(self) -> None:
+        self.check_fallback(os.path.join(self.directory, "missing.bundle"))
+
+    def test_corrupted(self) -> None:
+        for content in [b"", b"PYTZ", b"NOTABUNDLE" + bytes(20)]:
+            with self.subTest(content=content):
+                filename = os.path.join(self.directory, "corrupted.bundle")
+                with open(filename, "wb") as corrupted:
+                    corrupted.write(content)
+                self.check_fallback(filename)
+
+
+class TestPersistentCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory: str = self.tmp.name
+
+    def tearDown(self) -> None:
+        pytz.disable_persistent_cache()
+        self.tmp.cleanup()
+
+    @mock.patch("pytz._bundle_zones", weakref.WeakValueDictionary())
+    @mock.patch("pytz._tzinfo_cache", {})
+    def test_roundtrip(self) -> None:
+        zone: str = "Europe/Lisbon"
+        pytz.enable_persistent_cache(self.directory)
+        built: Any = pytz.timezone(zone)
+
+        # A new process would only see what is on disk.
+        cache = diskcache.TzDataCache(self.directory, pytz._persistent_cache.version)
+        data = cache.get(zone)
+        self.assertIsNotNone(data)
+
+        restored: Any = tzfile.tzinfo_from_data(zone, data)
+        self.assertEqual(restored._utc_transition_times, built._utc_transition_times)
+        self.assertEqual(restored._transition_info, built._transition_info)
+
+    def test_invalidation(self) -> None:
+        old = diskcache.TzDataCache(self.directory, "old")
+        old.put("Europe/Paris", ([], [(3600, 0, "CET")]))
+        self.assertTrue(os.path.exists(old.filename))
+
+        new = diskcache.TzDataCache(self.directory, "new")
+        self.assertIsNone(new.get("Europe/Paris"))
+        self.assertFalse(os.path.exists(old.filename))
+
+    def test_version(self) -> None:
+        self.assertNotEqual(
+            diskcache.data_version("2020d", b"# version 2020d"),
+            diskcache.data_version("2020d", b"# version 2020e"),
+        )
+
+    def test_truncated(self) -> None:
+        cache = diskcache.TzDataCache(self.directory, "v")
+        cache.put("Europe/Paris", ([], [(3600, 0, "CET")]))
+        with open(cache.filename, "ab") as cache_file:
+            cache_file.write(b"\x00\x00\x01\x00garbage")
+
+        reloaded = diskcache.TzDataCache(self.directory, "v")
+        self.assertEqual(reloaded.get("Europe/Paris"), ([], [(3600, 0, "CET")]))
+
+    @mock.patch("pytz._bundle_zones", weakref.WeakValueDictionary())
+    @mock.patch("pytz._tzinfo_cache", {})
+    @mock.patch("pytz._persistent_cache", None)
+    def test_missing_tzdata(self) -> None:
+        with tempfile.TemporaryDirectory() as tzdata:
+            os.mkdir(os.path.join(tzdata, "Europe"))
+            with pytz.open_resource("Europe/Paris") as source, open(
+                os.path.join(tzdata, "Europe", "Paris"), "wb"
+            ) as copy:
+                copy.write(source.read())
+            environ = {"PYTZ_TZDATADIR": tzdata, "PYTZ_CACHEDIR": self.directory}
+            with mock.patch.dict("os.environ", environ):
+                paris: Any = pytz.timezone("Europe/Paris")
+                self.assertEqual(paris.zone, "Europe/Paris")
+                self.assertIsNone(pytz._get_persistent_cache())
+
+
+class TestSingleFlight(unittest.TestCase):
+    THREADS = 32
+
+    def setUp(self) -> None:
+        self.zones = pytz.common_timezones[::8]
+        self.builds: Dict[str, int] = {}
+        self.builds_lock = threading.Lock()
+
+    def load(self, zone: str) -> Any:
+        with self.builds_lock:
+            self.builds[zone] = self.builds.get(zone, 0) + 1
+        # Widen the window in which the other threads ask for the same zone
+        time.sleep(0.001)
+        return self.original_load(zone)
+
+    @mock.patch("pytz._tzinfo_cache", {})
+    def test_stress(self) -> None:
+        self.original_load = pytz._load_tzinfo
+        barrier = threading.Barrier(self.THREADS)
+        results: List[List[Any]] = [[] for _ in range(self.THREADS)]
+
+        def request(index: int) -> None:
+            # Each thread asks for all the zones, in its own order
+            zones = random.Random(index).sample(self.zones, len(self.zones))
+            barrier.wait()
+            for zone in zones:
+                results[index].append(pytz.timezone(zone))
+
+        with mock.patch("pytz._load_tzinfo", self.load):
+            threads = [
+                threading.Thread(target=request, args=(index,))
+                for index in range(self.THREADS)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(60)
+
+        self.assertEqual(self.builds, {zone: 1 for zone in self.zones})
+        built = {zone: pytz.timezone(zone) for zone in self.zones}
+        for result in results:
+            self.assertEqual(len(result), len(self.zones))
+            for timezone in result:
+                self.assertIs(timezone, built[timezone.zone])
+        self.assertEqual(pytz._tzinfo_build_locks, {})
+
+    @mock.patch("pytz._tzinfo_cache", {})
+    def test_failed_build(self) -> None:
+        with mock.patch("pytz._load_tzinfo", side_effect=OSError):
+            with self.assertRaises(OSError):
+                pytz.timezone("Europe/Paris")
+        self.assertEqual(pytz._tzinfo_build_locks, {})
+        self.assertEqual(pytz.timezone("Europe/Paris").zone, "Europe/Paris")
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_eviction(self) -> None:
+        cache = LRUCache(3)
+        for key in "abc":
+            cache[key] = key.upper()
+        self.assertEqual(cache.get("a"), "A")  # Now the most recently used
+        cache["d"] = "D"
+
+        self.assertEqual(sorted(cache), ["a", "c", "d"])
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.info(), CacheInfo(1, 1, 1, 3, 3))
+
+    def test_setdefault(self) -> None:
+        cache = LRUCache(2)
+        self.assertEqual(cache.setdefault("a", 1), 1)
+        self.assertEqual(cache.setdefault("a", 2), 1)
+        self.assertEqual(cache["a"], 1)
+        with self.assertRaises(KeyError):
+            cache["b"]
+
+    def test_capacity(self) -> None:
+        cache = LRUCache()
+        for key in range(100):
+            cache[key] = key
+        self.assertEqual(len(cache), 100)
+
+        cache.capacity = 10
+        self.assertEqual(sorted(cache), list(range(90, 100)))
+        self.assertEqual(cache.info().evictions, 90)
+        with self.assertRaises(ValueError):
+            cache.capacity = -1
+
+
+class TestCaches(unittest.TestCase):
+    @mock.patch("pytz._tzinfo_cache", LRUCache(2))
+    def test_zones(self) -> None:
+        paris = pytz.timezone("Europe/Paris")
+        tokyo = pytz.timezone("Asia/Tokyo")
+        self.assertIs(pytz.timezone("Europe/Paris"), paris)
+        # Tokyo is the least recently used
+        pytz.timezone("America/Lima")
+
+        self.assertIs(pytz.timezone("Europe/Paris"), paris)
+        self.assertIsNot(pytz.timezone("Asia/Tokyo"), tokyo)
+        info = pytz.cache_info()["tzinfo"]
+        self.assertEqual((info.evictions, info.size, info.capacity), (2, 2, 2))
+
+    def test_all_zones_kept(self) -> None:
+        self.assertIsNone(pytz.cache_info()["tzinfo"].capacity)
+        zones = {zone: pytz.timezone(zone) for zone in pytz.all_timezones}
+        for zone, timezone in zones.items():
+            self.assertIs(pytz.timezone(zone), timezone)
+
+    @mock.patch("pytz._tzinfo_cache", LRUCache(2))
+    def test_pickle(self) -> None:
+        paris = pytz.timezone("Europe/Paris")
+        summer = paris.localize(dt.datetime(2020, 7, 1, 12))
+        restored = pickle.loads(pickle.dumps(summer))  # nosec
+        self.assertIs(restored.tzinfo, summer.tzinfo)
+
+    @mock.patch("pytz._fixed_offset_cache", LRUCache(1))
+    def test_fixed_offsets(self) -> None:
+        plus_one = pytz.FixedOffset(60)
+        self.assertIs(pytz.FixedOffset(60), plus_one)
+        self.assertIs(pickle.loads(pickle.dumps(plus_one)), plus_one)  # nosec
+        pytz.FixedOffset(120)
+        self.assertIsNot(pytz.FixedOffset(60), plus_one)
+        self.assertEqual(pytz.FixedOffset(60).utcoffset(None), dt.timedelta(hours=1))
+
+    def test_capacity(self) -> None:
+        capacity = pytz.cache_info()["ttinfo"].capacity
+        self.addCleanup(pytz.set_cache_capacity, "ttinfo", capacity)
+        pytz.set_cache_capacity("ttinfo", 1)
+        self.assertLessEqual(pytz.cache_info()["ttinfo"].size, 1)
+
+        # The zones built with evicted values are still equivalent
+        with mock.patch("pytz._tzinfo_cache", LRUCache(1)):
+            zone = pytz.timezone("America/New_York")
+            winter = zone.localize(dt.datetime(2020, 1, 1, 12))
+            self.assertEqual(winter.utcoffset(), dt.timedelta(hours=-5))
+            self.assertEqual(
+                zone.normalize(winter + dt.timedelta(days=180)).utcoffset(),
+                dt.timedelta(hours=-4),
+            )
+
+
+class TestLazy(unittest.TestCase):
+    def test_list(self) -> None:
+        names = LazyList(name for name in ["a", "b"])
+        self.assertIsInstance(names, LazyList)
+        self.assertIsNot(type(names), LazyList)
+
+        self.assertEqual(names + ["c"], ["a", "b", "c"])
+        # Filled, it is a plain subclass of list
+        self.assertIs(type(names), LazyList)
+        self.assertEqual(names, ["a", "b"])
+        self.assertEqual(pickle.loads(pickle.dumps(names)), ["a", "b"])  # nosec
+        self.assertEqual(LazyList(), [])
+
+    def test_set(self) -> None:
+        names = LazySet(LazyList(name for name in ["a", "b"]))
+        self.assertEqual({"b", "c"} & names, {"b"})
+        self.assertIs(type(names), LazySet)
+        self.assertIn("a", names)
+        self.assertEqual(pickle.loads(pickle.dumps(names)), {"a", "b"})  # nosec
+        self.assertEqual(LazySet(), set())
+
+    def test_threads(self) -> None:
+        fills: List[int] = []
+
+        def fill() -> Iterator[int]:
+            fills.append(1)
+            # Widen the window in which the other threads use the list
+            time.sleep(0.01)
+            yield from range(100)
+
+        names = LazyList(fill())
+        barrier = threading.Barrier(8)
+        lengths: List[int] = []
+
+        def use() -> None:
+            barrier.wait()
+            lengths.append(len(names))
+
+        threads = [threading.Thread(target=use) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+        self.assertEqual(fills, [1])
+        self.assertEqual(lengths, [100] * 8)
+
+    def test_pytz(self) -> None:
+        self.assertIn("Europe/Paris", pytz.all_timezones_set)
+        self.assertIn("Europe/Paris", pytz.common_timezones)
+        self.assertLessEqual(pytz.common_timezones_set, pytz.all_timezones_set)
+        self.assertEqual(len(pytz.all_timezones), len(pytz.all_timezones_set))
+        countries = pickle.loads(pickle.dumps(pytz.country_timezones))  # nosec
+        self.assertEqual(countries["fr"], ["Europe/Paris"])
+
+
+class TestExistingResources(unittest.TestCase):
+    NAMES = ["Europe/Paris", "Asia/Tokyo", "UTC", "Mars/Olympus_Mons"]
+
+    def existing(self) -> List[str]:
+        # resource_exists is only called for the names not found in bulk
+        with mock.patch("pytz.resource_exists", return_value=False) as exists:
+            names = list(pytz._existing_resources(self.NAMES))
+        self.assertEqual(exists.call_count, len(self.NAMES) - len(names))
+        return names
+
+    def test_bundle(self) -> None:
+        self.assertIsNotNone(pytz._get_bundle())
+        self.assertEqual(self.existing(), self.NAMES[:3])
+
+    def test_directory(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            os.mkdir(os.path.join(directory, "Europe"))
+            for name in ["Europe/Paris", "UTC", "Asia"]:
+                with open(os.path.join(directory, name), "wb"):
+                    pass
+            with mock.patch.dict("os.environ", {"PYTZ_TZDATADIR": directory}):
+                self.assertEqual(self.existing(), ["Europe/Paris", "UTC"])
+
+    @unittest.skipUnless(hasattr(os, "symlink"), "symbolic links unsupported")
+    def test_symlink_loop(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            os.mkdir(os.path.join(directory, "Asia"))
+            with open(os.path.join(directory, "UTC"), "wb"):
+                pass
+            os.symlink(os.path.join("..", "UTC"), os.path.join(directory, "Asia/Tokyo"))
+            # Like the posix -> . link of some system zoneinfo trees
+            os.symlink(".", os.path.join(directory, "posix"))
+            with mock.patch.dict("os.environ", {"PYTZ_TZDATADIR": directory}):
+                self.assertEqual(self.existing(), ["Asia/Tokyo", "UTC"])
+
+    def test_skip(self) -> None:
+        with mock.patch.dict("os.environ", {"PYTZ_SKIPEXISTSCHECK": "1"}):
+            self.assertEqual(list(pytz._existing_resources(self.NAMES)), self.NAMES)
+
+
+class TestAliases(unittest.TestCase):
+    def setUp(self) -> None:
+        patches: List[Any] = [
+            mock.patch("pytz._tzinfo_cache", LRUCache()),
+            mock.patch("pytz._bundle_zones", weakref.WeakValueDictionary()),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_shared(self) -> None:
+        lisbon: Any = pytz.timezone("Europe/Lisbon")
+        portugal: Any = pytz.timezone("Portugal")
+        self.assertEqual((lisbon.zone, portugal.zone), ("Europe/Lisbon", "Portugal"))
+        self.assertIsNot(type(portugal), type(lisbon))
+        for name in ["_utc_transition_epochs", "_transition_info", "_tz_rule"]:
+            self.assertIs(getattr(portugal, name), getattr(lisbon, name))
+        self.assertIsNot(portugal._tzinfos, lisbon._tzinfos)
+
+        summer = portugal.localize(dt.datetime(2020, 7, 1, 12))
+        self.assertEqual(str(summer.tzinfo), "Portugal")
+        restored = pickle.loads(pickle.dumps(summer))  # nosec
+        self.assertIs(restored.tzinfo, summer.tzinfo)
+        self.assertEqual(summer, lisbon.localize(dt.datetime(2020, 7, 1, 12)))
+
+    def test_lazy_data(self) -> None:
+        warsaw: Any = pytz.timezone("Europe/Warsaw")
+        poland: Any = pytz.timezone("Poland")
+        # Computed for the alias, and then shared with the first zone
+        poland.localize(dt.datetime(2020, 1, 1))
+        self.assertIs(warsaw._local_index, poland._local_index)
+        self.assertIs(warsaw._utc_transition_times, poland._utc_transition_times)
+
+    def test_static(self) -> None:
+        zulu = pytz.timezone("Zulu")
+        universal = pytz.timezone("Universal")
+        self.assertEqual(str(universal), "Universal")
+        self.assertEqual(universal.utcoffset(None), zulu.utcoffset(None))
+
+    def test_not_bundled(self) -> None:
+        with mock.patch("pytz._get_bundle", return_value=None):
+            lisbon: Any = pytz.timezone("Europe/Lisbon")
+            portugal: Any = pytz.timezone("Portugal")
+        self.assertIsNot(portugal._utc_transition_epochs, lisbon._utc_transition_epochs)
+        self.assertEqual(portugal._utc_transition_epochs, lisbon._utc_transition_epochs)
+
+
+@unittest.skipUnless(HAS_ZONEINFO, "zoneinfo needs Python 3.9+")
+class TestPosixRule(unittest.TestCase):
+    def check(self, zone: str) -> None:
+        # The standard library implementation, reading the same data.
+        bundled: Any = pytz._get_bundle()
+        data = bundled.get(zone)
+        reference = zoneinfo.ZoneInfo.from_file(io.BytesIO(bytes(data)), key=zone)
+        tz = pytz.timezone(zone)
+        for year in range(2036, 2101, 3):
+            for month in range(1, 13):
+                utc = dt.datetime(year, month, 10, 12, tzinfo=dt.timezone.utc)
+                self.assertEqual(
+                    utc.astimezone(tz).utcoffset(),
+                    utc.astimezone(reference).utcoffset(),
+                )
+
+    def test_far_future(self) -> None:
+        for zone in ("Europe/Paris", "Australia/Sydney", "America/New_York"):
+            with self.subTest(zone=zone):
+                self.check(zone)
+
+    def test_negative_dst(self) -> None:
+        self.check("Europe/Dublin")
+
+    def test_localize(self) -> None:
+        paris = pytz.timezone("Europe/Paris")
+        summer = paris.localize(dt.datetime(2045, 7, 1, 12))
+        winter = paris.localize(dt.datetime(2045, 1, 1, 12))
+        self.assertEqual(summer.tzname(), "CEST")
+        self.assertEqual(winter.tzname(), "CET")
+
+        with self.assertRaises(pytz.NonExistentTimeError):
+            paris.localize(dt.datetime(2045, 3, 26, 2, 30), is_dst=None)
+        with self.assertRaises(pytz.AmbiguousTimeError):
+            paris.localize(dt.datetime(2045, 10, 29, 2, 30), is_dst=None)
+
+    def test_last_year(self) -> None:
+        # The rule of the following year is out of the range of datetime
+        for zone, summer, winter in (
+            ("Europe/Paris", dt.timedelta(hours=2), dt.timedelta(hours=1)),
+            ("America/New_York", dt.timedelta(hours=-4), dt.timedelta(hours=-5)),
+            ("Australia/Sydney", dt.timedelta(hours=10), dt.timedelta(hours=11)),
+        ):
+            with self.subTest(zone=zone):
+                tz = pytz.timezone(zone)
+                june = tz.localize(dt.datetime(9999, 6, 1, 12))
+                self.assertEqual(june.utcoffset(), summer)
+                late = tz.localize(dt.datetime(9998, 12, 31, 23, 30))
+                self.assertEqual(late.utcoffset(), winter)
+                utc = dt.datetime(9999, 12, 31, 12, tzinfo=pytz.utc)
+                self.assertEqual(utc.astimezone(tz).utcoffset(), winter)
+
+    def test_before_1901(self) -> None:
+        # Only in the 64-bit data of version 2+ files.
+        amsterdam = pytz.timezone("Europe/Amsterdam")
+        utc = dt.datetime(1880, 1, 1, tzinfo=pytz.utc)
+        self.assertEqual(utc.astimezone(amsterdam).tzname(), "AMT")
+
+
+class TestLocalIndex(unittest.TestCase):
+    def test_same_as_probing(self) -> None:
+        for zone in ("Europe/Amsterdam", "US/Pacific", "Australia/Lord_Howe"):
+            tz: Any = pytz.timezone(zone)
+            epochs = tz._utc_transition_epochs
+            offsets = tz._utc_offsets
+            for idx in range(1, len(epochs)):
+                # Around the start and the end of each gap or fold
+                for offset in (offsets[idx - 1], offsets[idx]):
+                    for minutes in (-30, 0, 30):
+                        time = dt.datetime(1970, 1, 1) + dt.timedelta(
+                            seconds=epochs[idx] + offset, minutes=minutes
+                        )
+                        for is_dst in (True, False, None):
+                            with self.subTest(zone=zone, time=time, is_dst=is_dst):
+                                self.assertEqual(
+                                    self.localize(tz.localize, time, is_dst),
+                                    self.localize(tz._localize_probing, time, is_dst),
+                                )
+
+    @staticmethod
+    def localize(localize: Any, time: dt.datetime, is_dst: Optional[bool]) -> Any:
+        try:
+            result = localize(time, is_dst)
+        except (pytz.AmbiguousTimeError, pytz.NonExistentTimeError) as error:
+            return type(error)
+        return result, result.tzinfo
@@ -0,0 +1,72 @@
+import unittest
+
+import ultz.search as search
+import ultz.tzwrap as tzwrap
+
+
+class TestComplete(unittest.TestCase):
+    def test_shorthand(self) -> None:
+        candidates = search.complete("Par")
+        self.assertEqual(candidates[0], search.Candidate("PARIS", "Europe/Paris"))
+
+    def test_zone_name(self) -> None:
+        candidates = search.complete("america/new")
+        self.assertIn(
+            search.Candidate("America/New_York", "America/New_York"), candidates
+        )
+
+    def test_trailing_component(self) -> None:
+        zones = [candidate.zone for candidate in search.complete("Argentina/S")]
+        self.assertIn("America/Argentina/Salta", zones)
+
+    def test_ranking(self) -> None:
+        # The exact name first, then the shortest
+        names = [candidate.name for candidate in search.complete("lima", 10)]
+        self.assertEqual(names[0], "LIMA")
+        self.assertEqual(len(names), len(set(names)))
+
+    def test_resolves(self) -> None:
+        for prefix in ("A", "Eu", "GMT", "Etc/", "US"):
+            for candidate in search.complete(prefix, 50):
+                with self.subTest(candidate=candidate):
+                    timezone = tzwrap.timezone(candidate.name)
+                    self.assertIsNotNone(timezone)
+                    self.assertEqual(str(timezone), candidate.zone)
+
+    def test_limit(self) -> None:
+        self.assertEqual(len(search.complete("A", 3)), 3)
+        zones = [candidate.zone for candidate in search.complete("A", 1000)]
+        self.assertEqual(len(zones), len(set(zones)))
+
+    def test_none(self) -> None:
+        self.assertEqual(search.complete("Hyrule"), [])
+        self.assertEqual(search.complete("  "), [])
+
+
+class TestFuzzy(unittest.TestCase):
+    def test_misspelled(self) -> None:
+        for query, zone in (
+            ("Tokio", "Asia/Tokyo"),
+            ("Sao_Paolo", "America/Sao_Paulo"),
+            ("Lndon", "Europe/London"),
+            ("america/nwe_york", "America/New_York"),
+        ):
+            with self.subTest(query=query):
+                self.assertEqual(search.fuzzy(query)[0].zone, zone)
+
+    def test_exact_first(self) -> None:
+        self.assertEqual(search.fuzzy("Rome")[0].name, "ROME")
+
+    def test_distance(self) -> None:
+        self.assertEqual(search.fuzzy("Tkoiyo", max_distance=1), [])
+        self.assertEqual(search.fuzzy("Tkoiyo", max_distance=3)[0].name, "TOKYO")
+
+    def test_none(self) -> None:
+        self.assertEqual(search.fuzzy("XYZXYZ"), [])
+        self.assertEqual(search.fuzzy(""), [])
+
+    def test_edit_distance(self) -> None:
+        self.assertEqual(search.edit_distance("KITTEN", "SITTING", 5), 3)
+        self.assertEqual(search.edit_distance("KITTEN", "SITTING", 2), 3)
+        self.assertEqual(search.edit_distance("", "ABC", 5), 3)
+        self.assertEqual(search.edit_distance("SAME", "SAME", 0), 0)
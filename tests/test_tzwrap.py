@@ -1,4 +1,5 @@
 import logging
+import threading
 import unittest
 import unittest.mock as mock
 
@@ -25,11 +26,64 @@ class TestTzWrap(unittest.TestCase):
     def test_none(self) -> None:
         self.assertIsNone(tzwrap.timezone(None))
 
+    def test_spellings(self) -> None:
+        for spelling, zone in [
+            ("europe/paris", "Europe/Paris"),
+            ("PORT-AU-PRINCE", "America/Port-au-Prince"),
+            ("America/Port_minus_au_minus_Prince", "America/Port-au-Prince"),
+            ("Etc/GMT_plus_5", "Etc/GMT+5"),
+            ("etc/gmt+5", "Etc/GMT-5"),  # A shorthand comes first
+            ("GMT+5", "Etc/GMT-5"),
+            ("Etc/GMT-5", "Etc/GMT+5"),
+            ("utc", "UTC"),
+        ]:
+            with self.subTest(spelling=spelling):
+                self.assertIs(tzwrap.timezone(spelling), pytz.timezone(zone))
+
+    def test_one_lookup(self) -> None:
+        tzwrap.timezone("Paris")
+        with mock.patch("pytz.timezone") as pytz_timezone:
+            self.assertEqual(str(tzwrap.timezone("paris")), "Europe/Paris")
+            self.assertEqual(str(tzwrap.timezone("us/eastern")), "US/Eastern")
+        pytz_timezone.assert_not_called()
+
+    @mock.patch("ultz.tzwrap._SHORTHANDS", {"ATLANTIS": "Atlantic/Atlantis"})
+    @mock.patch("ultz.tzwrap._NAMES", None)
+    def test_missing_zone(self) -> None:
+        with self.assertRaises(tzwrap.UnknownTimeZoneError):
+            tzwrap.timezone("Atlantis")
+
     @mock.patch("builtins.open", new_callable=mock.mock_open)
     @mock.patch("ultz.tzwrap._SHORTHANDS", None)  # Reset to default state
+    @mock.patch("ultz.tzwrap._NAMES", None)
     def test_missing_file(self, mopen: TMagicMock) -> None:
         logging.disable(logging.WARNING)
         mopen.side_effect = OSError()
         with self.assertRaises(pytz.UnknownTimeZoneError):
             print(tzwrap.timezone("Dublin"))
         logging.disable(logging.NOTSET)
+
+
+class TestWarmUp(unittest.TestCase):
+    @mock.patch("ultz.tzwrap._SHORTHANDS", None)  # Reset to default state
+    @mock.patch("pytz._tzinfo_cache", {})
+    def test_warm_up(self) -> None:
+        tzwrap.warm_up(["Tokyo", "America/Lima"])
+        self.assertIsNotNone(tzwrap._SHORTHANDS)
+        self.assertIn("Asia/Tokyo", pytz._tzinfo_cache)
+        self.assertIn("America/Lima", pytz._tzinfo_cache)
+
+    @mock.patch("ultz.tzwrap._SHORTHANDS", None)
+    def test_unknown(self) -> None:
+        logging.disable(logging.WARNING)
+        tzwrap.warm_up(["ChozoPlanet", "Tokyo"])
+        logging.disable(logging.NOTSET)
+        self.assertEqual(tzwrap.timezone("Tokyo"), pytz.timezone("Asia/Tokyo"))
+
+    @mock.patch("ultz.tzwrap._SHORTHANDS", None)
+    def test_concurrent_first_query(self) -> None:
+        warming = threading.Thread(target=tzwrap.warm_up, args=(["Tokyo"],))
+        warming.start()
+        tz = tzwrap.timezone("Monrovia")
+        warming.join()
+        self.assertEqual(tz, pytz.timezone("Africa/Monrovia"))
@@ -1,5 +1,6 @@
 import datetime as dt
 import unittest
+import unittest.mock as mock
 
 from freezegun import freeze_time
 
@@ -61,6 +62,7 @@ class TestReverseTrip(unittest.TestCase):
 class TestProcessing(unittest.TestCase):
     def setUp(self) -> None:
         self.ok_icon: str = "images/icon.png"
+        ultz.clear_cache()
 
     def assert_is_error(self, _: str, description: str, icon: str) -> None:
         self.assertEqual(description, "")
@@ -76,6 +78,21 @@ class TestProcessing(unittest.TestCase):
         self.assert_is_error(result, description, icon)
         self.assertEqual(result, ultz.get_error_msg(ultz.ErrCode.EXPR))
 
+    def test_last_year(self) -> None:
+        for expression, zone in (
+            ("9999-06-01 12:00 in Paris", "Europe/Paris"),
+            ("9999-12-31 12:00 in New_York", "America/New_York"),
+        ):
+            with self.subTest(expression=expression):
+                result, _, icon = ultz.process_input(expression)
+                expected = expression.split(" in ")[0]
+                when = dt.datetime.fromisoformat(expected)
+                self.assertEqual(icon, self.ok_icon)
+                self.assertEqual(
+                    result,
+                    ultz.format_datetime(when.astimezone(pytz.timezone(zone))),
+                )
+
     @freeze_time("2019")
     def test_dtin(self) -> None:
         mm: int = 12
@@ -153,3 +170,170 @@ class TestProcessing(unittest.TestCase):
         result, description, icon = ultz.process_input(expression)
         self.assertEqual(result, ultz.get_error_msg(ultz.ErrCode.TZ))
         self.assert_is_error(result, description, icon)
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self) -> None:
+        ultz.clear_cache()
+        patcher = mock.patch("ultz.ultz.compute_results", wraps=ultz.compute_results)
+        self.compute: mock.MagicMock = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        ultz.set_cache_size(ultz.DEFAULT_CACHE_SIZE)
+
+    def test_relative(self) -> None:
+        with freeze_time("2020-03-04 12:00:10") as frozen:
+            first = ultz.process_input("Asia/Tokyo")
+            frozen.tick(dt.timedelta(seconds=40))
+            self.assertEqual(ultz.process_input("Asia/Tokyo"), first)
+            self.assertEqual(self.compute.call_count, 1)
+
+            frozen.tick(dt.timedelta(seconds=20))
+            self.assertNotEqual(ultz.process_input("Asia/Tokyo"), first)
+            self.assertEqual(self.compute.call_count, 2)
+
+    def test_absolute(self) -> None:
+        expression = "2020-05-01 12:00 in Asia/Tokyo"
+        with freeze_time("2020-03-04 12:00") as frozen:
+            first = ultz.process_input(expression)
+            frozen.tick(dt.timedelta(days=2))
+            self.assertEqual(ultz.process_input(expression), first)
+            self.assertEqual(self.compute.call_count, 1)
+
+            # Another format is another query
+            ultz.process_input(expression, "ALT")
+            self.assertEqual(self.compute.call_count, 2)
+
+    def test_short_date(self) -> None:
+        # The year of the date is the current one
+        expression = "05-01 12:00 in Asia/Tokyo"
+        with freeze_time("2020-12-31 12:00") as frozen:
+            first = ultz.process_input(expression)
+            frozen.tick(dt.timedelta(days=1))
+            self.assertNotEqual(ultz.process_input(expression), first)
+            self.assertEqual(self.compute.call_count, 2)
+
+    @freeze_time("2020-03-04 12:00")
+    def test_eviction(self) -> None:
+        ultz.set_cache_size(2)
+        for expression in ("Asia/Tokyo", "Europe/Paris", "Asia/Tokyo", "UTC"):
+            ultz.process_input(expression)
+        self.assertEqual(self.compute.call_count, 3)
+
+        # Europe/Paris was the least recently used
+        ultz.process_input("Asia/Tokyo")
+        ultz.process_input("Europe/Paris")
+        self.assertEqual(self.compute.call_count, 4)
+
+    @freeze_time("2020-03-04 12:00")
+    def test_disabled(self) -> None:
+        ultz.set_cache_size(0)
+        ultz.process_input("Asia/Tokyo")
+        ultz.process_input("Asia/Tokyo")
+        self.assertEqual(self.compute.call_count, 2)
+
+
+class TestProcessQuery(unittest.TestCase):
+    def setUp(self) -> None:
+        ultz.clear_cache()
+
+    @freeze_time("2020-03-04 12:00")
+    def test_known(self) -> None:
+        results = ultz.process_query("Asia/Tokyo")
+        self.assertEqual(results, [ultz.process_input("Asia/Tokyo")])
+
+    @freeze_time("2020-03-04 12:00")
+    def test_suggestions(self) -> None:
+        results = ultz.process_query("12:00 in Par", limit=2)
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0], ultz.process_input("12:00 in PARIS"))
+
+    @freeze_time("2020-03-04 12:00")
+    def test_misspelled(self) -> None:
+        results = ultz.process_query("Tokio")
+        self.assertEqual(results, [ultz.process_input("TOKYO")])
+
+    def test_no_suggestion(self) -> None:
+        results = ultz.process_query("12:00 in Hyrule")
+        self.assertEqual(results, [ultz.process_input("12:00 in Hyrule")])
+
+    def test_invalid(self) -> None:
+        results = ultz.process_query("25:89 in Par")
+        self.assertEqual(results, [ultz.process_input("25:89 in Par")])
+
+    @mock.patch("ultz.ultz.compute_results", wraps=ultz.compute_results)
+    def test_visible_only(self, compute: mock.MagicMock) -> None:
+        ultz.process_query("A", limit=3)
+        compute.assert_called_once()
+        self.assertEqual(len(compute.call_args[0][1]), 3)
+
+    @freeze_time("2020-03-04 12:00")
+    def test_cached(self) -> None:
+        for expression in ["Asia/Tokyo", "12:00 in Par"]:
+            with self.subTest(expression=expression):
+                first = ultz.process_query(expression, limit=2)
+                with mock.patch(
+                    "ultz.parser.parse_expression_parts"
+                ) as parse, mock.patch("ultz.ultz.get_tz") as get_tz:
+                    self.assertEqual(ultz.process_query(expression, limit=2), first)
+                parse.assert_not_called()
+                get_tz.assert_not_called()
+
+    @freeze_time("2020-03-04 12:00")
+    def test_not_inputs(self) -> None:
+        # The results without suggestions are not the ones of the query
+        ultz.process_inputs("12:00 in Par")
+        self.assertEqual(len(ultz.process_query("12:00 in Par", limit=2)), 2)
+
+    @freeze_time("2020-03-04 12:00")
+    def test_several_zones(self) -> None:
+        results = ultz.process_query("12:00 in Asia/Tokyo, Par", limit=2)
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0], ultz.process_input("12:00 in Asia/Tokyo"))
+        self.assertEqual(results[1], ultz.process_input("12:00 in PARIS"))
+
+
+class TestSeveralZones(unittest.TestCase):
+    def setUp(self) -> None:
+        ultz.clear_cache()
+
+    @freeze_time("2020-03-04 12:00")
+    def test_datein(self) -> None:
+        zones = ["Europe/Paris", "Asia/Tokyo", "America/New_York"]
+        results = ultz.process_inputs("15:00 in " + ", ".join(zones))
+        self.assertEqual(
+            results, [ultz.process_input(f"15:00 in {zone}") for zone in zones]
+        )
+
+    @freeze_time("2020-03-04 12:00")
+    def test_dateat(self) -> None:
+        results = ultz.process_inputs("Paris, Tokyo at 15:00")
+        self.assertEqual(
+            results,
+            [
+                ultz.process_input("Paris at 15:00"),
+                ultz.process_input("Tokyo at 15:00"),
+            ],
+        )
+
+    def test_single_instant(self) -> None:
+        for query in ["UTC, Etc/UTC, Etc/Universal", "12:00 in UTC, Etc/UTC"]:
+            with self.subTest(query=query):
+                with mock.patch("ultz.ultz.dt.datetime", wraps=dt.datetime) as datetime:
+                    results = ultz.process_inputs(query)
+                # The cache key, the missing date and the conversion share it
+                self.assertEqual(datetime.now.call_count, 1)
+                self.assertEqual(len({result for result, _, _ in results}), 1)
+
+    def test_unknown_zone(self) -> None:
+        results = ultz.process_inputs("12:00 in Asia/Tokyo, Hyrule, ,")
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[1][0], ultz.get_error_msg(ultz.ErrCode.TZ))
+
+    def test_first(self) -> None:
+        with freeze_time("2020-03-04 12:00"):
+            self.assertEqual(
+                ultz.process_input("Europe/Paris, Asia/Tokyo"),
+                ultz.process_input("Europe/Paris"),
+            )
@@ -0,0 +1,104 @@
+import threading
+import unittest
+from typing import Dict, List, Tuple
+
+from freezegun import freeze_time
+
+import ultz.ultz as ultz
+from ultz.parser import IncrementalParser
+from ultz.worker import QueryDispatcher
+
+_Results = List[Tuple[str, str, str]]
+
+
+class StandInEvent:
+    def __init__(self, argument: str) -> None:
+        self.argument = argument
+
+    def get_argument(self) -> str:
+        return self.argument
+
+
+class StandInExtension:
+    """Records what would be rendered by ulauncher."""
+
+    def __init__(self) -> None:
+        self.preferences: Dict[str, str] = {"date-format": "ISO"}
+        self.rendered: List[Tuple[str, _Results]] = []
+
+
+class TestQueryDispatcher(unittest.TestCase):
+    def setUp(self) -> None:
+        self.extension = StandInExtension()
+        self.parser = IncrementalParser()
+        self.first_started = threading.Event()
+        self.release = threading.Event()
+        self.handled: List[str] = []
+        self.dispatcher: QueryDispatcher[StandInEvent, _Results] = QueryDispatcher(
+            self.handle, self.send
+        )
+
+    def handle(self, event: StandInEvent) -> _Results:
+        self.handled.append(event.get_argument())
+        if len(self.handled) == 1:
+            # As slow as the build of a cold timezone
+            self.first_started.set()
+            self.release.wait(5)
+        return ultz.process_query(
+            event.get_argument(), self.extension.preferences["date-format"], self.parser
+        )
+
+    def send(self, event: StandInEvent, results: _Results) -> None:
+        self.extension.rendered.append((event.get_argument(), results))
+
+    @freeze_time("2020-03-04 12:00")
+    def test_burst(self) -> None:
+        expression = "15:30 in Asia/Tokyo"
+        self.dispatcher.submit(StandInEvent(expression[:1]))
+        self.assertTrue(self.first_started.wait(5))
+        for end in range(2, len(expression) + 1):
+            self.dispatcher.submit(StandInEvent(expression[:end]))
+        self.release.set()
+        self.assertTrue(self.dispatcher.wait_idle(5))
+
+        # The first query was superseded while processed, the others before
+        self.assertEqual(self.handled, [expression[:1], expression])
+        self.assertEqual(
+            self.extension.rendered, [(expression, ultz.process_query(expression))]
+        )
+
+    def test_cancel(self) -> None:
+        self.dispatcher.submit(StandInEvent("Asia/Tokyo"))
+        self.assertTrue(self.first_started.wait(5))
+        self.dispatcher.cancel()
+        self.release.set()
+        self.assertTrue(self.dispatcher.wait_idle(5))
+        self.assertEqual(self.extension.rendered, [])
+
+    def test_sequential(self) -> None:
+        self.release.set()
+        for expression in ("Asia/Tokyo", "Europe/Paris"):
+            self.dispatcher.submit(StandInEvent(expression))
+            self.assertTrue(self.dispatcher.wait_idle(5))
+        self.assertEqual(
+            [expression for expression, _ in self.extension.rendered],
+            ["Asia/Tokyo", "Europe/Paris"],
+        )
+
+    def test_error(self) -> None:
+        def fail(_: StandInEvent) -> _Results:
+            raise ValueError
+
+        dispatcher: QueryDispatcher[StandInEvent, _Results] = QueryDispatcher(
+            fail, self.send
+        )
+        with self.assertLogs("ultz.worker", "ERROR"):
+            dispatcher.submit(StandInEvent("Asia/Tokyo"))
+            self.assertTrue(dispatcher.wait_idle(5))
+
+        # The worker survives
+        dispatcher._handler = self.handle  # pylint: disable=protected-access
+        self.release.set()
+        dispatcher.submit(StandInEvent("Asia/Tokyo"))
+        self.assertTrue(dispatcher.wait_idle(5))
+        self.assertEqual(len(self.extension.rendered), 1)
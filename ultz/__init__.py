@@ -0,0 +1,16 @@
+"""Timezone conversion for ulauncher.
+
+:func:`convert_many` is loaded on first access only, to keep the import of the
+extension's own modules lean.
+"""
+
+from typing import Any
+
+
+def __getattr__(name: str) -> Any:
+    # pylint: disable=import-outside-toplevel
+    if name == "convert_many":
+        from ultz.bulk import convert_many
+
+        return convert_many
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
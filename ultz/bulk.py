@@ -0,0 +1,157 @@
+"""Bulk conversion of UTC timestamps to local time.
+
+Converting timestamps one :py:class:`datetime` at a time goes through pytz's
+``fromutc`` for each of them. Here, the transition table of the timezone is extracted
+once, and all the timestamps are looked up in it in one go: with a single
+``searchsorted`` if `NumPy <https://numpy.org/>`_ is available, with :py:mod:`bisect`
+otherwise.
+"""
+
+import bisect
+import datetime as dt
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import ultz.tzwrap as tzwrap
+
+numpy: Any
+try:
+    import numpy  # type: ignore
+except ImportError:  # pragma: nocover  # NumPy is optional
+    numpy = None
+
+_SECOND = dt.timedelta(seconds=1)
+
+_Table = Tuple[List[int], List[int], List[bool]]
+
+
+class Conversion(NamedTuple):
+    """Result of :func:`convert_many`, one element per converted timestamp.
+
+    The fields are NumPy arrays if NumPy was used, lists otherwise.
+    """
+
+    offsets: Any
+    """The UTC offsets, in seconds."""
+
+    local: Any
+    """The local timestamps, i.e. the UTC timestamps shifted by their offset."""
+
+    dst: Any
+    """If daylight saving time was in effect."""
+
+
+def transition_table(timezone: tzwrap.PyTzInfo, until: Optional[int] = None) -> _Table:
+    """Extract the transition table of a timezone.
+
+    :param timezone: The timezone.
+    :param until: The last timestamp to convert. The transitions following the last
+                  explicit one of the timezone are computed from its rule up to it.
+    :returns: - The UTC transition times, in seconds since the epoch, sorted.
+              - The UTC offset, in seconds, starting at each transition.
+              - If daylight saving time is in effect, starting at each transition.
+    """
+
+    epochs = getattr(timezone, "_utc_transition_epochs", None)
+    if not epochs:
+        # StaticTzInfo or UTC: a single, infinite, period.
+        offset = timezone.utcoffset(None)
+        seconds = int(offset // _SECOND) if offset else 0
+        return [0], [seconds], [False]
+
+    times = list(epochs)
+    offsets = list(getattr(timezone, "_utc_offsets"))
+    dsts = [bool(info[1]) for info in getattr(timezone, "_transition_info")]
+
+    rule = getattr(timezone, "_tz_rule", None)
+    if rule is not None and until is not None and until > times[-1]:
+        for time, info in rule.transitions_between(times[-1] + 1, until + 1):
+            times.append(time)
+            offsets.append(info[0])
+            dsts.append(bool(info[1]))
+
+    return times, offsets, dsts
+
+
+def convert_many(
+    epochs: Sequence[int],
+    zone: Union[str, tzwrap.PyTzInfo],
+    use_numpy: Optional[bool] = None,
+) -> Conversion:
+    """Convert UTC timestamps to local time in a timezone.
+
+    :param epochs: The UTC timestamps, in seconds since the epoch. Can be a NumPy
+                   array.
+    :param zone: The timezone, or its name or shorthand.
+    :param use_numpy: Force the use (or not) of NumPy. By default, NumPy is used if it
+                      is installed.
+    :returns: The offsets, local timestamps and DST flags.
+    :raises UnknownTimeZoneError: If ``zone`` is an unknown timezone name.
+    :raises ImportError: If ``use_numpy`` is true but NumPy is not installed.
+    """
+
+    if isinstance(zone, str):
+        timezone = tzwrap.timezone(zone)
+        if timezone is None:
+            raise tzwrap.UnknownTimeZoneError(zone)
+    else:
+        timezone = zone
+
+    if use_numpy and numpy is None:
+        raise ImportError("use_numpy requires NumPy, which is not installed")
+    numpy_module = None if use_numpy is False else numpy
+
+    until = None
+    if len(epochs) > 0:
+        if numpy_module is not None:
+            until = int(numpy_module.max(epochs))
+        else:
+            until = max(epochs)
+    times, offsets, dsts = transition_table(timezone, until)
+
+    if numpy_module is not None:
+        return _convert_numpy(numpy_module, epochs, times, offsets, dsts)
+    return _convert_python(epochs, times, offsets, dsts)
+
+
+def _convert_numpy(
+    numpy_module: Any,
+    epochs: Sequence[int],
+    times: List[int],
+    offsets: List[int],
+    dsts: List[bool],
+) -> Conversion:
+    """Vectorized implementation of :func:`convert_many`, with the NumPy module."""
+
+    epochs_array = numpy_module.asarray(epochs, dtype=numpy_module.int64)
+    indices = numpy_module.searchsorted(
+        numpy_module.asarray(times, dtype=numpy_module.int64),
+        epochs_array,
+        side="right",
+    )
+    numpy_module.subtract(indices, 1, out=indices)
+    numpy_module.maximum(indices, 0, out=indices)
+
+    offsets_array = numpy_module.asarray(offsets, dtype=numpy_module.int64)[indices]
+    return Conversion(
+        offsets_array,
+        epochs_array + offsets_array,
+        numpy_module.asarray(dsts, dtype=bool)[indices],
+    )
+
+
+def _convert_python(
+    epochs: Sequence[int], times: List[int], offsets: List[int], dsts: List[bool]
+) -> Conversion:
+    """Pure-Python implementation of :func:`convert_many`."""
+
+    result_offsets: List[int] = []
+    result_local: List[int] = []
+    result_dst: List[bool] = []
+    bisect_right = bisect.bisect_right
+    for epoch in epochs:
+        index = max(0, bisect_right(times, epoch) - 1)
+        offset = offsets[index]
+        result_offsets.append(offset)
+        result_local.append(epoch + offset)
+        result_dst.append(dsts[index])
+    return Conversion(result_offsets, result_local, result_dst)
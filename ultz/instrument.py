@@ -0,0 +1,208 @@
+"""Optional measurement of the duration of each stage of a query.
+
+When enabled, :func:`ultz.ultz.process_inputs` and :func:`ultz.ultz.process_query`
+time their stages: the parsing, the search of the timezones suggested, the lookup of
+the timezones (which may load the shorthands and read a zoneinfo file), the
+localization of the datetime, the conversions and the formatting of the results. The
+durations of each query are logged at debug level, and accumulated in histograms read
+with :func:`histograms`.
+
+It is disabled by default, and then only costs the check of :func:`stopwatch`. It is
+enabled at import by setting the ``ULTZ_INSTRUMENT`` environment variable to ``1``, or
+with :func:`enable`.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+_logger = logging.getLogger(__name__)
+
+ENV_VAR = "ULTZ_INSTRUMENT"
+"""The environment variable enabling the instrumentation."""
+
+BUCKETS = 24
+"""The number of buckets of the histograms: the bucket ``k`` counts the durations
+between ``2**(k-1)`` and ``2**k`` microseconds, the last one all the longer ones."""
+
+PARSE = "parse"
+SEARCH = "search"
+TIMEZONE = "timezone"
+LOCALIZE = "localize"
+CONVERT = "convert"
+FORMAT = "format"
+CACHE = "cache"
+TOTAL = "total"
+
+
+def _from_environment() -> bool:
+    """Tell if the environment enables the instrumentation."""
+
+    return os.environ.get(ENV_VAR, "") not in ("", "0")
+
+
+_ENABLED = _from_environment()
+
+
+class Histogram:
+    """The distribution of the durations of a stage, in buckets of powers of two."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        """The sum of the durations, in seconds."""
+        self.maximum = 0.0
+        """The longest duration, in seconds."""
+        self.buckets = [0] * BUCKETS
+
+    def add(self, seconds: float) -> None:
+        """Count a duration.
+
+        :param seconds: The duration.
+        """
+
+        self.count += 1
+        self.total += seconds
+        self.maximum = max(self.maximum, seconds)
+        self.buckets[min(int(seconds * 1e6).bit_length(), BUCKETS - 1)] += 1
+
+    def mean(self) -> float:
+        """The mean duration, in seconds, ``0`` without durations."""
+
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        """An upper bound of a percentile of the durations.
+
+        :param fraction: The percentile, between ``0`` and ``1``.
+        :returns: The upper bound of the bucket of the percentile, in seconds, but no
+                  more than the longest duration. ``0`` without durations.
+        """
+
+        rank = fraction * self.count
+        cumulated = 0
+        # The last bucket has no upper bound
+        for bucket, count in enumerate(self.buckets[:-1]):
+            cumulated += count
+            if count and cumulated >= rank:
+                return min(float(2 ** bucket) * 1e-6, self.maximum)
+        return self.maximum
+
+    def copy(self) -> "Histogram":
+        """A copy of the histogram, not updated any more."""
+
+        histogram = Histogram()
+        histogram.count = self.count
+        histogram.total = self.total
+        histogram.maximum = self.maximum
+        histogram.buckets = list(self.buckets)
+        return histogram
+
+
+_histograms: Dict[str, Histogram] = {}
+_histograms_lock = threading.Lock()
+
+
+class Stopwatch:
+    """Time the successive stages of a query.
+
+    Each call to :meth:`lap` attributes the time elapsed since the previous one to a
+    stage. The durations of a stage done several times are summed.
+    """
+
+    def __init__(self) -> None:
+        self._start = self._last = time.perf_counter()
+        self.durations: Dict[str, float] = {}
+        """The duration of each stage, in seconds."""
+
+    def lap(self, stage: str) -> None:
+        """End a stage.
+
+        :param stage: The name of the stage which just ended.
+        """
+
+        now = time.perf_counter()
+        self.durations[stage] = self.durations.get(stage, 0.0) + now - self._last
+        self._last = now
+
+    def stop(self, query: Optional[str]) -> None:
+        """Record the durations of the stages and of the whole query, and log them.
+
+        :param query: The query, for the log.
+        """
+
+        self.durations[TOTAL] = time.perf_counter() - self._start
+        with _histograms_lock:
+            for stage, seconds in self.durations.items():
+                histogram = _histograms.get(stage)
+                if histogram is None:
+                    histogram = _histograms[stage] = Histogram()
+                histogram.add(seconds)
+        if _logger.isEnabledFor(logging.DEBUG):
+            _logger.debug(
+                "Stages of %r: %s",
+                query,
+                " ".join(
+                    f"{stage}={seconds * 1e6:.1f}us"
+                    for stage, seconds in self.durations.items()
+                ),
+            )
+
+
+def stopwatch() -> Optional[Stopwatch]:
+    """Start timing a query, if the instrumentation is enabled.
+
+    :returns: A new stopwatch, ``None`` if the instrumentation is disabled.
+    """
+
+    return Stopwatch() if _ENABLED else None
+
+
+def enable(enabled: bool = True) -> None:
+    """Enable or disable the instrumentation.
+
+    :param enabled: ``True`` to enable it.
+    """
+
+    global _ENABLED  # pylint: disable=global-statement
+    _ENABLED = enabled
+
+
+def is_enabled() -> bool:
+    """Tell if the instrumentation is enabled."""
+
+    return _ENABLED
+
+
+def histograms() -> Dict[str, Histogram]:
+    """The distribution of the durations of each stage since the last :func:`reset`.
+
+    :returns: A copy of the histogram of each stage.
+    """
+
+    with _histograms_lock:
+        return {stage: histogram.copy() for stage, histogram in _histograms.items()}
+
+
+def reset() -> None:
+    """Forget the durations recorded."""
+
+    with _histograms_lock:
+        _histograms.clear()
+
+
+def summary() -> List[str]:
+    """Describe the histograms, one line per stage with the number of queries and the
+    mean, median, 95th percentile and maximum durations."""
+
+    lines = []
+    for stage, histogram in sorted(histograms().items()):
+        lines.append(
+            f"{stage}: n={histogram.count} mean={histogram.mean() * 1e6:.1f}us "
+            f"p50<={histogram.percentile(0.5) * 1e6:.1f}us "
+            f"p95<={histogram.percentile(0.95) * 1e6:.1f}us "
+            f"max={histogram.maximum * 1e6:.1f}us"
+        )
+    return lines
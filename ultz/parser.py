@@ -5,9 +5,64 @@
     month, day, hour, minute, etc).
 """
 
+import calendar
 import datetime as dt
+import re
+import time as _time
 from enum import Enum
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
+
+_SHORT_DATE = re.compile(r"([0-9]{1,2})-([0-9]{1,2})")
+"""``mm-dd`` or ``dd-mm``, depending on the format."""
+
+_ISO_DATE = re.compile(r"([0-9]{4})-([0-9]{2})-([0-9]{2})")
+"""``yyyy-mm-dd``"""
+
+_ALT_DATE = re.compile(r"([0-9]{1,2})-([0-9]{1,2})-([0-9]{1,4})")
+"""``dd-mm-yyyy``"""
+
+_TIME = re.compile(
+    r"([0-9]{2})(?::([0-9]{2})(?::([0-9]{2})(?:\.([0-9]{3}(?:[0-9]{3})?))?)?)?"
+    r"(?:([+-])([0-9]{2}):([0-9]{2})(?::([0-9]{2})(?:\.([0-9]{6}))?)?)?"
+)
+"""``HH[:MM[:SS[.fff[fff]]]][+HH:MM[:SS[.ffffff]]]``"""
+
+_DAYS_IN_MONTH = (0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def _make_date(year: int, month: int, day: int) -> Optional[dt.date]:
+    """The date, if valid, checked before building it rather than by catching the
+    exception of :py:class:`datetime.date`."""
+
+    if not (
+        1 <= year <= 9999 and 1 <= month <= 12 and 1 <= day <= _DAYS_IN_MONTH[month]
+    ):
+        return None
+    if month == 2 and day == 29 and not calendar.isleap(year):
+        return None
+    return dt.date(year, month, day)
+
+
+def _match_date(expr: str, start: int, end: int, form: str) -> Optional[dt.date]:
+    """:func:`parse_date` on ``expr[start:end]``, without slicing it."""
+
+    match = _SHORT_DATE.fullmatch(expr, start, end)
+    if match:
+        month, day = int(match[1]), int(match[2])
+        if form == "ALT":
+            # Reverse
+            month, day = day, month
+        return _make_date(dt.date.today().year, month, day)
+
+    if form == "ALT":
+        match = _ALT_DATE.fullmatch(expr, start, end)
+        if match:
+            return _make_date(int(match[3]), int(match[2]), int(match[1]))
+    else:
+        match = _ISO_DATE.fullmatch(expr, start, end)
+        if match:
+            return _make_date(int(match[1]), int(match[2]), int(match[3]))
+    return None
 
 
 def parse_date(expr: str, form: str = "ISO") -> Optional[dt.date]:
@@ -22,97 +77,116 @@ def parse_date(expr: str, form: str = "ISO") -> Optional[dt.date]:
         - Complete format: ``dd-mm-yyyy`` (like 13-05-2019).
         - Shortened format: ``dd-mm`` format (like 24-11) that sets the year to the current one.
 
+    The format is matched with a regular expression before building the date, so that
+    the partial dates typed on the way are rejected without raising any exception.
+
     :param expr: The date to parse.
     :param form: The format of the date to parse
     :returns: The date if ``expr`` was correctly passed, ``None`` otherwise
     """
 
-    print("=============== {} ===========".format(form))
-    alternative = form == "ALT"
-
-    # Try to find a date in the short format first
-    month_day = expr.split("-")
-    if len(month_day) == 2:
-        try:
-            year = dt.date.today().year
-            month = (int)(month_day[0])
-            day = (int)(month_day[1])
-            if alternative:
-                # Reverse
-                month, day = day, month
-            date = dt.date(year, month, day)
-            return date
-        except ValueError:  # pragma: nocover  # Test the next format
-            pass
-
-    # Then try the complete date
-    try:
-        if not alternative:
-            date = dt.date.fromisoformat(expr)
-            return date
-
-        # else:
-        day_month_year = expr.split("-")
-        if len(day_month_year) != 3:
-            raise ValueError
-        day = (int)(month_day[0])
-        month = (int)(month_day[1])
-        year = (int)(month_day[2])
-        date = dt.date(year, month, day)
-        return date
-    except ValueError:  # pragma: nocover
-        pass
+    return _match_date(expr, 0, len(expr), form)
 
-    return None
+
+def _match_time(expr: str, start: int, end: int) -> Optional[dt.time]:
+    """:func:`parse_time` on ``expr[start:end]``, without slicing it."""
+
+    match = _TIME.fullmatch(expr, start, end)
+    if not match:
+        return None
+    hour = int(match[1])
+    minute = int(match[2] or 0)
+    second = int(match[3] or 0)
+    if hour > 23 or minute > 59 or second > 59:
+        return None
+    # Milliseconds or microseconds
+    fraction = match[4]
+    microsecond = int(fraction.ljust(6, "0")) if fraction else 0
+
+    sign = match[5]
+    if not sign:
+        return dt.time(hour, minute, second, microsecond)
+
+    off_hours = int(match[6])
+    off_minutes = int(match[7])
+    off_seconds = int(match[8] or 0)
+    if off_hours > 23 or off_minutes > 59 or off_seconds > 59:
+        return None
+    offset = dt.timedelta(
+        hours=off_hours,
+        minutes=off_minutes,
+        seconds=off_seconds,
+        microseconds=int(match[9] or 0),
+    )
+    tzinfo = dt.timezone(-offset if sign == "-" else offset)
+    return dt.time(hour, minute, second, microsecond, tzinfo)
 
 
 def parse_time(expr: str) -> Optional[dt.time]:
     """Parse a string to a time
 
-    The format supported is the same as :py:meth:`datetime.time.fromisoformat`, meaning
-    a string in the format: ``HH[:MM[:SS[.fff[fff]]]][+HH:MM[:SS[.ffffff]]]``
+    The format supported is the same as :py:meth:`datetime.time.fromisoformat` before
+    Python 3.11, meaning a string in the format:
+    ``HH[:MM[:SS[.fff[fff]]]][+HH:MM[:SS[.ffffff]]]``
 
     :param expr: The time to parse.
     :returns: The time if ``expr`` was correctly parsed, ``None`` otherwise
     """
 
-    try:
-        time = dt.time.fromisoformat(expr)
-        return time
-    except ValueError:
-        pass
+    return _match_time(expr, 0, len(expr))
 
-    return None
 
+DatetimeParts = Tuple[Optional[dt.date], Optional[dt.time]]
+"""The date and time explicitly given in an expression, ``None`` for the missing
+one."""
 
-def parse_datetime(datetime_expr: str, form: str = "ISO") -> Optional[dt.datetime]:
-    """Parse a string into a full datetime
 
-    The format supported is the combination of :func:`parse_date` and func:`parse_time`,
-    in the format `date time`, date and time being optional if the other is present.
+Span = Tuple[int, int]
+"""The start and end indices of a part of an expression."""
 
-    :param expr: The datetime to parse.
-    :param form: The format for parsing the date part.
-    :returns: The datetime if ``expr`` was correctly parsed, ``None`` otherwise
+
+def _strip_span(expr: str, start: int, end: int) -> Span:
+    """The span of ``expr[start:end].strip()``."""
+
+    if start < end and (expr[start].isspace() or expr[end - 1].isspace()):
+        while start < end and expr[start].isspace():
+            start += 1
+        while end > start and expr[end - 1].isspace():
+            end -= 1
+    return start, end
+
+
+def _datetime_spans(expr: str, start: int, end: int) -> Optional[Tuple[Span, Span]]:
+    """Find the date and time components of the datetime ``expr[start:end]``.
+
+    :returns: The spans of the date and of the time, the same one if there is a single
+              component. ``None`` if there are too many components.
     """
 
-    # Try to split into the two components.
-    datetime_split = list(map(str.strip, datetime_expr.split(" ")))
-    num = len(datetime_split)
-    if num > 2:
+    spaces = expr.count(" ", start, end)
+    if spaces > 1:
         # Too much components, wrong expression.
         return None
-
-    if num == 2:
-        # The two components are here, extract them.
-        date_str, time_str = datetime_split[:2]
-    else:
+    if spaces == 0:
         # Only one of them, we don't know which yet.
-        date_str = time_str = datetime_split[0]
+        span = _strip_span(expr, start, end)
+        return span, span
+    pos = expr.find(" ", start, end)
+    return _strip_span(expr, start, pos), _strip_span(expr, pos + 1, end)
+
+
+def _parse_spans(
+    expr: str, spans: Optional[Tuple[Span, Span]], form: str
+) -> Optional[DatetimeParts]:
+    """Parse the date and time components found by :func:`_datetime_spans`."""
+
+    if spans is None:
+        return None
+    (date_start, date_end), (time_start, time_end) = spans
 
     # Parse both of them
-    date = parse_date(date_str, form)
-    time = parse_time(time_str)
+    date = _match_date(expr, date_start, date_end, form)
+    time = _match_time(expr, time_start, time_end)
 
     # None of them were correctly parsed
     if not (date or time):
@@ -123,17 +197,66 @@ def parse_datetime(datetime_expr: str, form: str = "ISO") -> Optional[dt.datetim
     # same time. Not necessary now, but may be in the future where we could have an
     # ambiguity between a day and a hour.
 
+    return date, time
+
+
+def parse_datetime_parts(
+    datetime_expr: str, form: str = "ISO"
+) -> Optional[DatetimeParts]:
+    """Parse a string into the date and time it contains
+
+    The format supported is the combination of :func:`parse_date` and func:`parse_time`,
+    in the format `date time`, date and time being optional if the other is present.
+
+    :param expr: The datetime to parse.
+    :param form: The format for parsing the date part.
+    :returns: The date and time found if ``expr`` was correctly parsed, ``None``
+              otherwise. One of them may be ``None``.
+    """
+
+    spans = _datetime_spans(datetime_expr, 0, len(datetime_expr))
+    return _parse_spans(datetime_expr, spans, form)
+
+
+def complete_datetime(
+    parts: Optional[DatetimeParts], now: Optional[dt.datetime] = None
+) -> Optional[dt.datetime]:
+    """Build a full datetime from the result of :func:`parse_datetime_parts`
+
+    :param parts: The parsed date and time. Can be ``None``.
+    :param now: The current datetime, if already read. Else, it is read if needed.
+    :returns: The datetime, the missing date or time being set to the current one.
+              ``None`` if ``parts`` is ``None``.
+    """
+
+    if parts is None:
+        return None
+    date, time = parts
+
     # If one of them is wrongly parsed, set it to current date/time
     if not date:
-        date = dt.date.today()
+        date = now.date() if now is not None else dt.date.today()
 
     if not time:
-        time = dt.datetime.now().time()
+        time = (now if now is not None else dt.datetime.now()).time()
 
     datetime = dt.datetime.combine(date, time)
     return datetime
 
 
+def parse_datetime(datetime_expr: str, form: str = "ISO") -> Optional[dt.datetime]:
+    """Parse a string into a full datetime
+
+    See :func:`parse_datetime_parts` for the supported format.
+
+    :param expr: The datetime to parse.
+    :param form: The format for parsing the date part.
+    :returns: The datetime if ``expr`` was correctly parsed, ``None`` otherwise
+    """
+
+    return complete_datetime(parse_datetime_parts(datetime_expr, form))
+
+
 class ExprCode(Enum):
     """Enumeration for the possible results of :func:`parse_expression`"""
 
@@ -152,7 +275,192 @@ class ExprCode(Enum):
     datetime``"""
 
 
+def split_zones(where: str) -> List[str]:
+    """Split the timezone part of an expression into a list of timezones.
+
+    :param where: The timezone found by :func:`parse_expression`, possibly a
+                  comma-separated list of timezones.
+    :returns: The timezones, stripped. Empty ones are skipped.
+    """
+
+    return [zone.strip() for zone in where.split(",") if zone.strip()]
+
+
+Tokens = Tuple[ExprCode, Optional[Span], Optional[Tuple[Span, Span]]]
+"""The structure of an expression found by :func:`tokenize`: its format, the span of
+its timezone, and the spans of its date and time as in :func:`parse_datetime_parts`.
+The timezone is ``None`` for an invalid expression, the datetime if the expression has
+no valid one."""
+
+_ERR_TOKENS: Tokens = (ExprCode.ERR, None, None)
+
+_SEPARATOR_LENGTH = len(" in ")
+
+# The members of an enumeration are looked up through a descriptor, as slow as the
+# scan itself.
+_TZ_ONLY = ExprCode.TZ_ONLY
+_TZ_DATEIN = ExprCode.TZ_DATEIN
+_TZ_DATEAT = ExprCode.TZ_DATEAT
+
+_Separators = Tuple[Tuple[int, str], ...]
+"""The positions and words of the first separators of an expression, up to two."""
+
+
+def _scan(expr: str, found: _Separators = (), start: int = 0) -> _Separators:
+    """Find the first two separators of an expression, stopping at the second one.
+
+    Each separator is searched with :py:meth:`str.find`: on these short expressions,
+    it is faster than a regular expression or a loop over the characters. A separator
+    overlapping a previous one of the same word, like in `` in in ``, does not
+    separate: the semantic is the same as :py:meth:`str.split` for each of them.
+
+    :param expr: The expression to scan.
+    :param found: The separators already found, ending before ``start``.
+    :param start: The position the scan goes on from.
+    :returns: The separators found, by position, the ones of ``found`` first.
+    """
+
+    start_in = start_at = start
+    for pos, word in found:
+        if word == "in":
+            start_in = max(start_in, pos + _SEPARATOR_LENGTH)
+        else:
+            start_at = max(start_at, pos + _SEPARATOR_LENGTH)
+    pos_in = expr.find(" in ", start_in)
+    pos_at = expr.find(" at ", start_at)
+
+    while len(found) < 2:
+        if pos_at < 0 or 0 <= pos_in < pos_at:
+            if pos_in < 0:
+                break
+            found += ((pos_in, "in"),)
+            pos_in = expr.find(" in ", pos_in + _SEPARATOR_LENGTH)
+        else:
+            found += ((pos_at, "at"),)
+            pos_at = expr.find(" at ", pos_at + _SEPARATOR_LENGTH)
+    return found
+
+
+def _split(
+    expr: str, separators: _Separators
+) -> Tuple[ExprCode, Optional[Span], Optional[Span]]:
+    """Split an expression around its separators found by :func:`_scan`.
+
+    :param expr: The expression to split.
+    :param separators: Its separators.
+    :returns: The format of the expression, the span of its timezone, ``None`` if the
+              expression is invalid, and the span of its datetime, ``None`` if it has
+              none.
+    """
+
+    end = len(expr)
+    if not separators:
+        # [location]
+        return ExprCode.TZ_ONLY, _strip_span(expr, 0, end), None
+    if len(separators) > 1:
+        # Both separators, or one of them twice
+        return ExprCode.ERR, None, None
+
+    pos, word = separators[0]
+    following = pos + _SEPARATOR_LENGTH
+    if word == "in":
+        # [time] in [location]
+        return (
+            ExprCode.TZ_DATEIN,
+            _strip_span(expr, following, end),
+            _strip_span(expr, 0, pos),
+        )
+    # [location] at [time]
+    return (
+        ExprCode.TZ_DATEAT,
+        _strip_span(expr, 0, pos),
+        _strip_span(expr, following, end),
+    )
+
+
+def tokenize(expr: Optional[str]) -> Tokens:
+    """Find the format, the timezone and the datetime of an expression.
+
+    The expression is scanned for the `` in `` and `` at `` separators with
+    :py:meth:`str.find`, stopping at the second occurrence of either, and only the
+    spans of its components are kept. The scan is the one of :func:`_scan`, inlined
+    as this is the hot path of every query.
+
+    :param expr: The expression to parse, see :func:`parse_expression`.
+    :returns: The format of the expression and the spans of its components.
+    """
+
+    if not expr:
+        return _ERR_TOKENS
+
+    end = len(expr)
+    pos_in = expr.find(" in ")
+    pos_at = expr.find(" at ")
+    if pos_in < 0:
+        if pos_at < 0:
+            # [location]
+            if expr[0].isspace() or expr[-1].isspace():
+                return _TZ_ONLY, _strip_span(expr, 0, end), None
+            return _TZ_ONLY, (0, end), None
+        if expr.find(" at ", pos_at + _SEPARATOR_LENGTH) >= 0:
+            # The same separator twice
+            return _ERR_TOKENS
+        # [location] at [time]
+        code = _TZ_DATEAT
+        zone_start, zone_end = 0, pos_at
+        start, stop = pos_at + _SEPARATOR_LENGTH, end
+    elif pos_at >= 0 or expr.find(" in ", pos_in + _SEPARATOR_LENGTH) >= 0:
+        # Both separators, or the same one twice
+        return _ERR_TOKENS
+    else:
+        # [time] in [location]
+        code = _TZ_DATEIN
+        zone_start, zone_end = pos_in + _SEPARATOR_LENGTH, end
+        start, stop = 0, pos_in
+
+    # The calls to _strip_span and _datetime_spans are only made when needed: they
+    # cost more than the scan.
+    if zone_start < zone_end and (
+        expr[zone_start].isspace() or expr[zone_end - 1].isspace()
+    ):
+        zone_start, zone_end = _strip_span(expr, zone_start, zone_end)
+    if start < stop and (expr[start].isspace() or expr[stop - 1].isspace()):
+        start, stop = _strip_span(expr, start, stop)
+    if expr.find(" ", start, stop) < 0:
+        # Only one component, we don't know which yet.
+        return code, (zone_start, zone_end), ((start, stop), (start, stop))
+    return code, (zone_start, zone_end), _datetime_spans(expr, start, stop)
+
+
 _ParsingResult = Tuple[ExprCode, Optional[str], Optional[dt.datetime]]
+_PartsParsingResult = Tuple[ExprCode, Optional[str], Optional[DatetimeParts]]
+
+
+def parse_expression_parts(
+    expr: Optional[str], form: str = "ISO"
+) -> _PartsParsingResult:
+    """Parse an expression querying a timezone and optionally date, without completing
+    the date and time from the current ones.
+
+    See :func:`parse_expression` for the supported formats.
+
+    :param expr: The expression to parse.
+    :param form: The format for parsing the date.
+    :returns: - A return code indicating if the expression was correctly parsed and if\
+    so the format
+              - A raw ``str`` timezone if applicable, ``None`` otherwise
+              - The date and time, as returned by :func:`parse_datetime_parts`, if\
+    applicable, ``None`` otherwise
+    """
+
+    code, zone, datetime = tokenize(expr)
+    if expr is None or zone is None:
+        return ExprCode.ERR, None, None
+
+    location = expr[zone[0] : zone[1]]
+    if code == ExprCode.TZ_ONLY:
+        return code, location, None
+    return code, location, _parse_spans(expr, datetime, form)
 
 
 def parse_expression(expr: Optional[str], form: str = "ISO") -> _ParsingResult:
@@ -164,6 +472,9 @@ def parse_expression(expr: Optional[str], form: str = "ISO") -> _ParsingResult:
     * ``datetime in timezone``
     * ``timezone at datetime``
 
+    ``timezone`` may be a comma-separated list of timezones, returned as-is: see
+    :func:`split_zones`.
+
     :param expr: The expression to parse.
     :param form: The format for parsing the date.
     :returns: - A return code indicating if the expression was correctly parsed and if\
@@ -172,31 +483,98 @@ def parse_expression(expr: Optional[str], form: str = "ISO") -> _ParsingResult:
               - A full ``datetime`` if applicable, ``None`` otherwise
     """
 
-    if expr is None or expr == "":
-        return ExprCode.ERR, None, None
+    code, where, parts = parse_expression_parts(expr, form)
+    return code, where, complete_datetime(parts)
 
-    # Split & Strip
-    split_in = list(map(str.strip, expr.split(" in ")))
-    len_in = len(split_in)
 
-    split_at = list(map(str.strip, expr.split(" at ")))
-    len_at = len(split_at)
+class IncrementalParser:
+    """Parser of successive versions of an expression, as typed by the user.
 
-    if len_in == 1 and len_at == 1:
-        # [location]
-        location = split_in[0]
-        return ExprCode.TZ_ONLY, location, None
+    Give the same results as :func:`parse_expression_parts` and
+    :func:`parse_expression`, but reuse the work done on the previous expression: only
+    the end of the expression not shared with the previous one is searched for the
+    `` in `` and `` at `` separators, and the datetime part is only parsed again if it
+    changed.
 
-    if len_in == 2 and len_at == 1:
-        # [time] in [location]
-        location = split_in[1]
-        date = parse_datetime(split_in[0], form)
-        return ExprCode.TZ_DATEIN, location, date
-
-    if len_in == 1 and len_at == 2:
-        # [location] at [time]
-        location = split_at[0]
-        date = parse_datetime(split_at[1], form)
-        return ExprCode.TZ_DATEAT, location, date
+    Not thread-safe: each thread needs its own instance.
+    """
 
-    return ExprCode.ERR, None, None
+    def __init__(self) -> None:
+        self._expr = ""
+        self._form = ""
+        self._separators: _Separators = ()
+        self._datetime_expr: Optional[str] = None
+        self._parts: Optional[DatetimeParts] = None
+        self._parts_expiry = 0.0
+
+    def _update_matches(self, expr: str, form: str) -> None:
+        """Update the positions of the separators from the previous expression."""
+
+        previous = self._expr
+        if form != self._form:
+            common = 0
+            self._form = form
+            self._datetime_expr = None
+        elif expr.startswith(previous):
+            common = len(previous)
+        elif previous.startswith(expr):
+            common = len(expr)
+        else:
+            common = 0
+        self._expr = expr
+        # Only the separators entirely in the common prefix are still valid, the scan
+        # goes on from the first one which may not be
+        kept = tuple(
+            (pos, word)
+            for pos, word in self._separators
+            if pos + _SEPARATOR_LENGTH <= common
+        )
+        self._separators = _scan(expr, kept, max(0, common - _SEPARATOR_LENGTH + 1))
+
+    def _parse_datetime(self, datetime_expr: str, form: str) -> Optional[DatetimeParts]:
+        """:func:`parse_datetime_parts`, if ``datetime_expr`` changed or if the year,
+        used by the short date formats, is over."""
+
+        if datetime_expr != self._datetime_expr or _time.time() >= self._parts_expiry:
+            self._parts = parse_datetime_parts(datetime_expr, form)
+            self._datetime_expr = datetime_expr
+            next_year = dt.datetime(dt.date.today().year + 1, 1, 1)
+            self._parts_expiry = next_year.timestamp()
+        return self._parts
+
+    def parse_parts(
+        self, expr: Optional[str], form: str = "ISO"
+    ) -> _PartsParsingResult:
+        """Incremental version of :func:`parse_expression_parts`
+
+        :param expr: The expression to parse.
+        :param form: The format for parsing the date.
+        :returns: The same as :func:`parse_expression_parts`
+        """
+
+        if expr is None or expr == "":
+            return ExprCode.ERR, None, None
+
+        self._update_matches(expr, form)
+        code, zone, datetime = _split(expr, self._separators)
+        if zone is None:
+            return ExprCode.ERR, None, None
+
+        location = expr[zone[0] : zone[1]]
+        if datetime is None:
+            return code, location, None
+        parts = self._parse_datetime(expr[datetime[0] : datetime[1]], form)
+        return code, location, parts
+
+    def parse(self, expr: Optional[str], form: str = "ISO") -> _ParsingResult:
+        """Incremental version of :func:`parse_expression`
+
+        The missing date or time is always completed with the current one.
+
+        :param expr: The expression to parse.
+        :param form: The format for parsing the date.
+        :returns: The same as :func:`parse_expression`
+        """
+
+        code, where, parts = self.parse_parts(expr, form)
+        return code, where, complete_datetime(parts)
@@ -0,0 +1,288 @@
+"""Search of timezones from a partial name, to suggest them while the user types.
+
+The names searched are the shorthands of :mod:`tzwrap`, the timezone names of `pytz
+<https://pythonhosted.org/pytz/>`_ and their trailing components (``Buenos_Aires`` for
+``America/Argentina/Buenos_Aires``). They are indexed once, upper-cased, in a sorted
+list: the names starting with a prefix are then a contiguous range of it, found with
+two binary searches.
+
+Misspelled names are matched with a trigram inverted index: as an edit changes at most
+3 trigrams of a name, only the names sharing enough trigrams with the query have their
+edit distance to it computed.
+"""
+
+import bisect
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import pytz
+import ultz.tzwrap as tzwrap
+
+_logger = logging.getLogger(__name__)
+
+
+class Candidate(NamedTuple):
+    """A timezone matching a search."""
+
+    name: str
+    """The name to query it with: a shorthand or a timezone name."""
+
+    zone: str
+    """The full name of the timezone."""
+
+
+_Index = Tuple[List[str], List[int], List[Candidate]]
+
+_INDEX: Optional[_Index] = None
+"""The sorted upper-case names, their rank in the results, and the corresponding
+candidates."""
+
+_INDEX_LOCK = threading.Lock()
+
+_Trigrams = Tuple[Dict[str, List[int]], List[int]]
+
+_TRIGRAMS: Optional[_Trigrams] = None
+"""For each trigram, the indices of the names of ``_INDEX`` containing it, and the
+number of distinct trigrams of each name."""
+
+_TRIGRAMS_LOCK = threading.Lock()
+
+
+def _build_index() -> _Index:
+    """Index the shorthands and the timezone names.
+
+    A name resolves to a timezone the same way as with :func:`tzwrap.timezone`: a
+    shorthand takes precedence over a timezone of the same name.
+    """
+
+    shorthands = tzwrap.shorthands()
+    entries = {}
+    for key, zone in shorthands.items():
+        if zone in pytz.all_timezones_set:
+            entries[key] = Candidate(key, zone)
+
+    def add(key: str, zone: str) -> None:
+        # Shorthands to a missing timezone hide it, as in tzwrap.timezone
+        if key not in shorthands:
+            entries.setdefault(key, Candidate(zone, zone))
+
+    for zone in pytz.all_timezones:
+        add(zone.upper(), zone)
+    # The trailing components of the deprecated names would only add noise
+    for zone in pytz.common_timezones:
+        components = zone.upper().split("/")
+        for start in range(1, len(components)):
+            add("/".join(components[start:]), zone)
+
+    names = sorted(entries)
+    # The position of each name when sorted by length first
+    ranks = [0] * len(names)
+    by_length = sorted(range(len(names)), key=lambda idx: (len(names[idx]), names[idx]))
+    for rank, idx in enumerate(by_length):
+        ranks[idx] = rank
+    return names, ranks, [entries[name] for name in names]
+
+
+def _ensure_index() -> _Index:
+    """Build the index lazily and only once, even with concurrent callers."""
+
+    global _INDEX  # pylint: disable=global-statement
+    index = _INDEX
+    if index is None:
+        with _INDEX_LOCK:
+            index = _INDEX
+            if index is None:
+                _logger.info("Building the timezone search index")
+                index = _INDEX = _build_index()
+    return index
+
+
+def _trigrams(name: str) -> List[str]:
+    """The trigrams of ``name``, padded to count its first and last letters as much as
+    the others."""
+
+    padded = "  " + name + " "
+    return [padded[idx : idx + 3] for idx in range(len(padded) - 2)]
+
+
+def _build_trigrams(names: List[str]) -> _Trigrams:
+    """Index the names by trigram."""
+
+    trigrams: Dict[str, List[int]] = defaultdict(list)
+    counts = []
+    for idx, name in enumerate(names):
+        distinct = set(_trigrams(name))
+        for trigram in distinct:
+            trigrams[trigram].append(idx)
+        counts.append(len(distinct))
+    return dict(trigrams), counts
+
+
+def _ensure_trigrams() -> _Trigrams:
+    """Build the trigram index lazily and only once, even with concurrent callers."""
+
+    global _TRIGRAMS  # pylint: disable=global-statement
+    trigrams = _TRIGRAMS
+    if trigrams is None:
+        names = _ensure_index()[0]
+        with _TRIGRAMS_LOCK:
+            trigrams = _TRIGRAMS
+            if trigrams is None:
+                trigrams = _TRIGRAMS = _build_trigrams(names)
+    return trigrams
+
+
+def warm_up() -> None:
+    """Build the indexes ahead of the first search."""
+
+    _ensure_index()
+    _ensure_trigrams()
+
+
+def complete(prefix: str, limit: int = 5) -> List[Candidate]:
+    """Search the timezones with a name starting with ``prefix``, case-insensitively.
+
+    The shortest names, i.e. the closest to ``prefix``, come first, then the names are
+    sorted alphabetically. Each timezone is only suggested once, with its best name.
+
+    :param prefix: The beginning of the name.
+    :param limit: The maximum number of candidates.
+    :returns: The candidates, best first.
+    """
+
+    prefix = prefix.strip().upper()
+    if not prefix:
+        return []
+
+    names, ranks, candidates = _ensure_index()
+    start = bisect.bisect_left(names, prefix)
+    end = bisect.bisect_left(names, prefix + "\U0010ffff", start)
+
+    ranked = sorted(range(start, end), key=ranks.__getitem__)
+    return _distinct_zones(ranked, candidates, limit)
+
+
+def _distinct_zones(
+    ranked: Iterable[int], candidates: List[Candidate], limit: int
+) -> List[Candidate]:
+    """The best candidates of distinct timezones.
+
+    :param ranked: The indices of the candidates, best first.
+    :param candidates: The candidates of the index.
+    :param limit: The maximum number of candidates.
+    :returns: The first candidate of each timezone, best first.
+    """
+
+    result: List[Candidate] = []
+    zones = set()
+    for idx in ranked:
+        candidate = candidates[idx]
+        if candidate.zone not in zones:
+            zones.add(candidate.zone)
+            result.append(candidate)
+            if len(result) == limit:
+                break
+    return result
+
+
+def edit_distance(first: str, second: str, limit: int) -> int:
+    """The Levenshtein distance between two strings, if at most ``limit``.
+
+    :param first: A string.
+    :param second: Another string.
+    :param limit: The maximum distance of interest.
+    :returns: The distance, or ``limit + 1`` if it is greater than ``limit``.
+    """
+
+    if abs(len(first) - len(second)) > limit:
+        return limit + 1
+    previous = list(range(len(second) + 1))
+    for row, char in enumerate(first, 1):
+        current = [row]
+        for col, other in enumerate(second, 1):
+            current.append(
+                min(
+                    previous[col] + 1,
+                    current[col - 1] + 1,
+                    previous[col - 1] + (char != other),
+                )
+            )
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return min(previous[-1], limit + 1)
+
+
+def _shared_trigrams(query_trigrams: Set[str]) -> Dict[int, int]:
+    """Count the trigrams each name of the index shares with ``query_trigrams``.
+
+    :returns: The number of shared trigrams, by index of name. The names sharing none
+              are left out.
+    """
+
+    trigrams = _ensure_trigrams()[0]
+    counts: Dict[int, int] = defaultdict(int)
+    for trigram in query_trigrams:
+        for idx in trigrams.get(trigram, ()):
+            counts[idx] += 1
+    return counts
+
+
+def _close_names(query: str, max_distance: int) -> List[Tuple[int, int]]:
+    """Find the names of the index within an edit distance of ``query``.
+
+    The names are first filtered on the trigrams they share with ``query``, and only
+    the remaining ones are compared to it.
+
+    :param query: The upper-case name, possibly misspelled.
+    :param max_distance: The maximum edit distance.
+    :returns: The edit distance and the index of each name close to ``query``.
+    """
+
+    names = _ensure_index()[0]
+    trigram_counts = _ensure_trigrams()[1]
+    query_trigrams = set(_trigrams(query))
+
+    # An edit changes at most 3 trigrams, of the query as of the name, and at most one
+    # character of the length.
+    edits = 3 * max_distance
+    query_threshold = max(1, len(query_trigrams) - edits)
+    close = []
+    for idx, count in _shared_trigrams(query_trigrams).items():
+        name = names[idx]
+        if (
+            count >= query_threshold
+            and count >= trigram_counts[idx] - edits
+            and abs(len(name) - len(query)) <= max_distance
+        ):
+            distance = edit_distance(query, name, max_distance)
+            if distance <= max_distance:
+                close.append((distance, idx))
+    return close
+
+
+def fuzzy(query: str, limit: int = 5, max_distance: int = 2) -> List[Candidate]:
+    """Search the timezones with a name close to ``query``, case-insensitively.
+
+    The names are sorted by edit distance to ``query``, then as by :func:`complete`.
+    Only the names sharing at least a trigram with ``query`` are found.
+
+    :param query: The name, possibly misspelled.
+    :param limit: The maximum number of candidates.
+    :param max_distance: The maximum edit distance, i.e. the number of inserted,
+                         deleted or substituted characters.
+    :returns: The candidates, best first.
+    """
+
+    query = query.strip().upper()
+    if not query:
+        return []
+
+    _, ranks, candidates = _ensure_index()
+    matches = sorted(
+        (distance, ranks[idx], idx)
+        for distance, idx in _close_names(query, max_distance)
+    )
+    return _distinct_zones((idx for _, _, idx in matches), candidates, limit)
@@ -3,7 +3,8 @@
 import csv
 import logging
 import os
-from typing import TYPE_CHECKING, Dict, Optional, Union
+import threading
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Union
 
 import pytz
 
@@ -17,6 +18,18 @@ For example, ``Paris`` could be a shorthand for ``Europe/Paris``.
 
 _SHORTCUTS_FILENAME = "tz-shorthands.csv"
 
+_NAMES: Optional[Dict[str, str]] = None
+"""A dictionary linking every accepted spelling of a timezone, in upper case, to its
+name in ``pytz.all_timezones``.
+
+The spellings are the shorthands, the timezone names, and the names munged by older
+versions of pytz, with ``_plus_`` and ``_minus_`` for ``+`` and ``-``.
+"""
+
+_SHORTHANDS_LOCK = threading.Lock()
+"""Serialize the population of ``_SHORTHANDS`` and ``_NAMES``, which can happen both in
+a background warm-up and in the first query."""
+
 
 def _populate_shorthands() -> None:
     """Populate the ``_shorthands`` dictionary
@@ -24,11 +37,14 @@ def _populate_shorthands() -> None:
     Read the csv file indicated by ``_shortcuts_filename`` and insert it into
     ``_shorthands``.
 
+    The dictionary is filled before being published, so a concurrent reader never sees
+    it partially populated.
+
     If the file could not be read, logs a warning a continue.
     """
 
     global _SHORTHANDS
-    _SHORTHANDS = {}
+    loaded: Dict[str, str] = {}
     try:
         curr_dir = os.path.dirname(os.path.realpath(__file__))
         file_name = _SHORTCUTS_FILENAME
@@ -36,9 +52,56 @@ def _populate_shorthands() -> None:
         with open(full_path) as csv_file:
             csv_reader = csv.reader(csv_file, delimiter=",")
             for row in csv_reader:
-                _SHORTHANDS[row[0]] = row[1]
+                loaded[row[0]] = row[1]
     except OSError:
         _logger.warning("Error while opening the data file, shortcuts inaccessible")
+    _SHORTHANDS = loaded
+
+
+def _populate_names() -> None:
+    """Populate the ``_NAMES`` dictionary from ``_SHORTHANDS`` and pytz's timezones.
+
+    A shorthand takes precedence over a timezone of the same name. A shorthand to a
+    timezone missing from pytz is kept as is, for :func:`pytz.canonical_timezone` to
+    reject it.
+    """
+
+    global _NAMES
+    zones = {zone.upper(): zone for zone in pytz.all_timezones}
+    names = dict(zones)
+    for zone in pytz.all_timezones:
+        munged = zone.replace("+", "_plus_").replace("-", "_minus_")
+        if munged != zone:
+            names[munged.upper()] = zone
+    # The targets are timezone names, never other shorthands: ETC/GMT+1 is Etc/GMT-1,
+    # whatever the shorthand ETC/GMT-1 stands for
+    for shorthand, zone in (_SHORTHANDS or {}).items():
+        names[shorthand.upper()] = zones.get(zone.upper(), zone)
+    _NAMES = names
+
+
+def _ensure_shorthands() -> None:
+    """Populate ``_SHORTHANDS`` and ``_NAMES`` lazily and only once, even with
+    concurrent callers."""
+
+    if _SHORTHANDS is None or _NAMES is None:
+        with _SHORTHANDS_LOCK:
+            if _SHORTHANDS is None:
+                _logger.info("Populating _shortcuts for the first time")
+                _populate_shorthands()
+            if _NAMES is None:
+                _populate_names()
+
+
+def shorthands() -> Dict[str, str]:
+    """Return the shorthands, loading them on first use.
+
+    :returns: The dictionary linking the upper-case shorthands to their full timezone
+              name. It is shared, and must not be modified.
+    """
+
+    _ensure_shorthands()
+    return _SHORTHANDS if _SHORTHANDS is not None else {}
 
 
 # Due to the limitation of ulauncher, pytz is imported as-is as a directory, so a lot of
@@ -60,9 +123,10 @@ def timezone(
     """Return a `pytz <https://pythonhosted.org/pytz/>`_'s :py:class:`tzinfo` from a string
 
     This simple wrapper allow the use of shorthands defined in a separate file, whose
-    filename is in ``_shorthands``. It first checks if a shorthand exists, and if so
-    replace the query by the full name. Then, it simply forwards the queried timezone
-    name to `pytz.timezone() <https://pythonhosted.org/pytz/>`_.
+    filename is in ``_shorthands``. The shorthands and the spellings of the timezone
+    names accepted by pytz are resolved to the full name with a single lookup in
+    ``_NAMES``. The other queries are forwarded to `pytz.timezone()
+    <https://pythonhosted.org/pytz/>`_.
 
     :param zone: The queried timezone. Can be ``None``.
     :returns: The corresponding and appropriate `pytz
@@ -72,20 +136,29 @@ def timezone(
               Python's :py:class:`tzinfo`. So they are not interchangeable.
     """
 
-    global _SHORTHANDS
-
     if not zone:
         return None
 
-    # Follow the default format of pytz.
-    zone = zone.upper()
+    _ensure_shorthands()
+
+    name = _NAMES.get(zone.upper()) if _NAMES is not None else None
+    if name is not None:
+        return pytz.canonical_timezone(name)
+    return pytz.timezone(zone)
 
-    # Populate _shorthands lazily and only once.
-    if _SHORTHANDS is None:
-        _logger.info("Populating _shortcuts for the first time")
-        _populate_shorthands()
 
-    if _SHORTHANDS is not None and zone in _SHORTHANDS:
-        zone = _SHORTHANDS[zone]
+def warm_up(zones: Iterable[str] = ()) -> None:
+    """Load the shorthands and build the given timezones ahead of the first query.
 
-    return pytz.timezone(zone)
+    Meant to be run in a background thread: it is safe against a concurrent call to
+    :func:`timezone`. Unknown timezones are logged and skipped.
+
+    :param zones: The timezones (or shorthands) to build.
+    """
+
+    _ensure_shorthands()
+    for zone in zones:
+        try:
+            timezone(zone)
+        except UnknownTimeZoneError:
+            _logger.warning("Cannot warm up unknown timezone %s", zone)
@@ -3,16 +3,36 @@ for ulauncher."""
 
 import datetime as dt
 import logging
+import threading
+from collections import OrderedDict
 from enum import Enum
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple, Union
 
+import ultz.instrument as instrument
+import ultz.parser
+import ultz.search as search
 import ultz.tzwrap as tzwrap
-from ultz.parser import ExprCode, parse_expression
+from ultz.parser import DatetimeParts, ExprCode, IncrementalParser
 
 _logger = logging.getLogger(__name__)
 
+_Result = Tuple[str, str, str]
+_CacheKey = Tuple[Optional[str], str, int, Union[int, dt.datetime]]
 
-def get_datetime(code: ExprCode, when: Optional[dt.datetime]) -> Optional[dt.datetime]:
+DEFAULT_SUGGESTIONS = 5
+"""Default maximum number of timezones suggested by :func:`process_query`."""
+
+DEFAULT_CACHE_SIZE = 256
+"""Default maximum number of results kept by :func:`process_inputs`."""
+
+_cache: "OrderedDict[_CacheKey, List[_Result]]" = OrderedDict()
+_CACHE_SIZE = DEFAULT_CACHE_SIZE
+_cache_lock = threading.Lock()
+
+
+def get_datetime(
+    code: ExprCode, when: Optional[dt.datetime], now: Optional[dt.datetime] = None
+) -> Optional[dt.datetime]:
     """Provide a :py:class:`datetime` from the result of :func:`parse_expression`
 
     This function simply checks if :func:`parse_expression` found a valid date, and if
@@ -20,17 +40,14 @@ def get_datetime(code: ExprCode, when: Optional[dt.datetime]) -> Optional[dt.dat
 
     :param code: The result code of :func:`parse_expression`
     :param when: The datetime found by the parser. Can be ``None``.
+    :param now: The current datetime, if already read. Else, it is read if needed.
     :returns: `when` if both `code` and `when` are valid, ``None`` if ``code`` isn't
-              valid, :py:func:`datetime.now()` otherwise.
+              valid, `now` or :py:func:`datetime.now()` otherwise.
     """
 
-    date: Optional[dt.datetime] = dt.datetime.now()  # Test
     if code in (ExprCode.TZ_DATEIN, ExprCode.TZ_DATEAT):
-        if when:
-            date = when
-        else:
-            date = None
-    return date
+        return when or None
+    return now if now is not None else dt.datetime.now()
 
 
 def get_tz(where: Optional[str]) -> Optional[tzwrap.PyTzInfo]:
@@ -127,7 +144,33 @@ def format_datetime(datetime: dt.datetime) -> str:
     return datetime.strftime("%Y-%m-%d %H:%M")
 
 
-def process_input(text_input: Optional[str], form: str = "ISO") -> Tuple[str, str, str]:
+def set_cache_size(size: int) -> None:
+    """Set the maximum number of results kept by :func:`process_inputs`.
+
+    The least recently used results are evicted first.
+
+    :param size: The number of results, ``0`` to disable the cache.
+    """
+
+    global _CACHE_SIZE  # pylint: disable=global-statement
+    with _cache_lock:
+        _CACHE_SIZE = max(0, size)
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def clear_cache() -> None:
+    """Forget all the results kept by :func:`process_inputs`."""
+
+    with _cache_lock:
+        _cache.clear()
+
+
+def process_input(
+    text_input: Optional[str],
+    form: str = "ISO",
+    parser: Optional[IncrementalParser] = None,
+) -> _Result:
     """Process an expression for timezone conversion.
 
     The expression must be one of the following format:
@@ -136,8 +179,13 @@ def process_input(text_input: Optional[str], form: str = "ISO") -> Tuple[str, st
     - ``datetime in timezone``: Query the time in ``timezone`` at ``datetime`` here.
     - ``timezone at datetime``: Query the time here,  at ``datetime`` in ``timezone``
 
+    ``timezone`` can also be a comma-separated list of timezones, see
+    :func:`process_inputs`.
+
     :param text_input: The expression to parse and interpret.
     :param form: The format for parsing the date.
+    :param parser: The parser of the previous expressions typed, if any, to parse
+                   ``text_input`` incrementally.
     :returns: - If ``text_input`` is correct, the datetime result. Otherwise, a
                 descriptive error message.
               - If ``text_input`` is correct, a description of the result. Otherwise,
@@ -145,28 +193,283 @@ def process_input(text_input: Optional[str], form: str = "ISO") -> Tuple[str, st
               - If ``text_input`` is correct, the path to the result icon. Otherwise,
                 empty string.
 
+              For a list of timezones, the result of the first one.
+    """
+
+    return process_inputs(text_input, form, parser)[0]
+
+
+def _cache_keys(
+    text_input: Optional[str], form: str, limit: int, now: dt.datetime
+) -> Tuple[_CacheKey, _CacheKey]:
+    """Build the keys the results of a query are cached under.
+
+    :param text_input: The expression queried.
+    :param form: The format for parsing the date.
+    :param limit: The maximum number of timezones suggested, ``0`` for none.
+    :param now: The current datetime.
+    :returns: The key of the results kept for the current year, and the one of the
+              results kept for the current minute.
+    """
+
+    return (
+        (text_input, form, limit, now.year),
+        (text_input, form, limit, now.replace(second=0, microsecond=0)),
+    )
+
+
+def _get_cached(
+    keys: Tuple[_CacheKey, _CacheKey],
+    text_input: Optional[str],
+    stopwatch: Optional[instrument.Stopwatch],
+) -> Optional[List[_Result]]:
+    """Look up the cached results of a query.
+
+    :param keys: The keys the results may be cached under, see :func:`_cache_keys`.
+    :param text_input: The expression queried.
+    :param stopwatch: Stopped if the results are found, if given.
+    :returns: A copy of the results of the first key found, marked as the most recently
+              used. ``None`` if none is.
+    """
+
+    with _cache_lock:
+        for key in keys:
+            cached = _cache.get(key)
+            if cached is not None:
+                _cache.move_to_end(key)
+                break
+        else:
+            return None
+    if stopwatch:
+        stopwatch.lap(instrument.CACHE)
+        stopwatch.stop(text_input)
+    return list(cached)
+
+
+def _set_cached(
+    keys: Tuple[_CacheKey, _CacheKey],
+    parts: Optional[DatetimeParts],
+    results: List[_Result],
+) -> None:
+    """Cache the results of a query.
+
+    :param keys: The keys of the query, see :func:`_cache_keys`.
+    :param parts: The parsed date and time of the query. Can be ``None``.
+    :param results: The results of the query.
     """
 
-    code, where, when = parse_expression(text_input, form)
-    _logger.debug("parse returned: where=%s, when=%s, code=%s", where, when, code)
+    absolute = parts is not None and None not in parts
+    with _cache_lock:
+        if _CACHE_SIZE:
+            _cache[keys[0] if absolute else keys[1]] = results
+            while len(_cache) > _CACHE_SIZE:
+                _cache.popitem(last=False)
+
+
+def _parse(
+    text_input: Optional[str],
+    form: str,
+    parser: Optional[IncrementalParser],
+    stopwatch: Optional[instrument.Stopwatch],
+) -> Tuple[ExprCode, List[str], Optional[DatetimeParts]]:
+    """Parse a query, incrementally if a parser is given.
+
+    :param text_input: The expression to parse.
+    :param form: The format for parsing the date.
+    :param parser: The parser of the previous expressions typed, if any.
+    :param stopwatch: Times the parsing, if given.
+    :returns: The result code, the timezones and the date and time parts found.
+    """
+
+    if parser is not None:
+        code, where, parts = parser.parse_parts(text_input, form)
+    else:
+        code, where, parts = ultz.parser.parse_expression_parts(text_input, form)
+    zones = ultz.parser.split_zones(where) if where else []
+    if stopwatch:
+        stopwatch.lap(instrument.PARSE)
+    _logger.debug("parse returned: where=%s, parts=%s, code=%s", where, parts, code)
+    return code, zones, parts
+
+
+def process_inputs(
+    text_input: Optional[str],
+    form: str = "ISO",
+    parser: Optional[IncrementalParser] = None,
+    stopwatch: Optional[instrument.Stopwatch] = None,
+) -> List[_Result]:
+    """Process an expression for timezone conversion, with one or several timezones.
+
+    The expression has the same format as for :func:`process_input`, the timezone
+    possibly being a comma-separated list, like ``15:00 in Paris, Tokyo, New_York``.
+    The datetime is parsed once, and the current time is read once: without a
+    ``timezone at datetime`` query, all the timezones are converted from the same
+    instant.
+
+    As ulauncher sends the query again at each keystroke, the results are kept in a
+    least recently used cache (see :func:`set_cache_size`). The results depending on the
+    current time are kept for the current minute only. The ones of queries giving both
+    a date and a time are kept for the current year, as the year of a short date is the
+    current one.
+
+    :param text_input: The expression to parse and interpret.
+    :param form: The format for parsing the date.
+    :param parser: The parser of the previous expressions typed, if any, to parse
+                   ``text_input`` incrementally.
+    :param stopwatch: Times the stages of the query, if given. Else, a new one is
+                      started if the instrumentation is enabled.
+    :returns: The result of each timezone, in the format of :func:`process_input`. A
+              single error if the expression or its datetime is invalid.
+    """
+
+    if stopwatch is None:
+        stopwatch = instrument.stopwatch()
+    now = dt.datetime.now()
+    keys = _cache_keys(text_input, form, 0, now)
+    cached = _get_cached(keys, text_input, stopwatch)
+    if cached is not None:
+        return cached
+
+    code, zones, parts = _parse(text_input, form, parser, stopwatch)
+    results = compute_results(
+        code, zones, ultz.parser.complete_datetime(parts, now), stopwatch, now
+    )
+    _set_cached(keys, parts, results)
+    if stopwatch:
+        stopwatch.stop(text_input)
+    return list(results)
+
+
+def process_query(
+    text_input: Optional[str],
+    form: str = "ISO",
+    parser: Optional[IncrementalParser] = None,
+    limit: int = DEFAULT_SUGGESTIONS,
+) -> List[_Result]:
+    """Process an expression for timezone conversion, suggesting timezones for an
+    incomplete or misspelled one.
+
+    The results are cached as in :func:`process_inputs`, and looked up before the
+    expression is parsed.
+
+    :param text_input: The expression to parse and interpret.
+    :param form: The format for parsing the date.
+    :param parser: The parser of the previous expressions typed, if any, to parse
+                   ``text_input`` incrementally.
+    :param limit: The maximum number of timezones suggested.
+    :returns: The results of :func:`process_inputs` if the last timezone is known or
+              if the expression is otherwise invalid. Else, the same results with the
+              last timezone replaced by each of the timezones starting with it or, if
+              there is none, with a name close to it (see :mod:`search`). Only these
+              are computed.
+    """
+
+    stopwatch = instrument.stopwatch()
+    now = dt.datetime.now()
+    keys = _cache_keys(text_input, form, limit, now)
+    cached = _get_cached(keys, text_input, stopwatch)
+    if cached is not None:
+        return cached
+
+    code, zones, parts = _parse(text_input, form, parser, stopwatch)
+    when = ultz.parser.complete_datetime(parts, now)
+    if code != ExprCode.ERR and zones and get_tz(zones[-1]) is None:
+        # The timezones starting with the query, else the ones with a close name
+        candidates = search.complete(zones[-1], limit) or search.fuzzy(zones[-1], limit)
+        if candidates and get_datetime(code, when, now):
+            zones = zones[:-1] + [candidate.name for candidate in candidates]
+            if stopwatch:
+                stopwatch.lap(instrument.SEARCH)
+
+    results = compute_results(code, zones, when, stopwatch, now)
+    _set_cached(keys, parts, results)
+    if stopwatch:
+        stopwatch.stop(text_input)
+    return list(results)
+
+
+def compute_result(
+    code: ExprCode, where: Optional[str], when: Optional[dt.datetime]
+) -> _Result:
+    """Interpret a parsed expression, without caching.
+
+    :param code: The result code of :func:`parse_expression`.
+    :param where: The timezone found by the parser. Can be ``None``.
+    :param when: The datetime found by the parser. Can be ``None``.
+    :returns: The same as :func:`process_input`.
+    """
+
+    return compute_results(code, [where] if where else [], when)[0]
+
+
+def compute_results(
+    code: ExprCode,
+    zones: List[str],
+    when: Optional[dt.datetime],
+    stopwatch: Optional[instrument.Stopwatch] = None,
+    now: Optional[dt.datetime] = None,
+) -> List[_Result]:
+    """Interpret a parsed expression for several timezones, without caching.
+
+    :param code: The result code of :func:`parse_expression`.
+    :param zones: The timezones found by the parser.
+    :param when: The datetime found by the parser. Can be ``None``.
+    :param stopwatch: Times the stages of the computation, if given.
+    :param now: The current datetime, if already read, see :func:`get_datetime`.
+    :returns: The same as :func:`process_inputs`.
+    """
 
     if code == ExprCode.ERR:
-        return get_error_msg(ErrCode.EXPR), "", ""
+        return [(get_error_msg(ErrCode.EXPR), "", "")]
 
-    datetime = get_datetime(code, when)
+    datetime = get_datetime(code, when, now)
     if not datetime:
-        return get_error_msg(ErrCode.DATE), "", ""
-
-    timezone = get_tz(where)
-    if not timezone:
-        return get_error_msg(ErrCode.TZ), "", ""
+        return [(get_error_msg(ErrCode.DATE), "", "")]
+
+    if not zones:
+        return [(get_error_msg(ErrCode.TZ), "", "")]
+
+    results = []
+    for where in zones:
+        timezone = get_tz(where)
+        if stopwatch:
+            stopwatch.lap(instrument.TIMEZONE)
+        if not timezone:
+            results.append((get_error_msg(ErrCode.TZ), "", ""))
+            continue
+        results.append(_convert(code, where, timezone, datetime, stopwatch))
+    return results
+
+
+def _convert(
+    code: ExprCode,
+    where: str,
+    timezone: tzwrap.PyTzInfo,
+    datetime: dt.datetime,
+    stopwatch: Optional[instrument.Stopwatch],
+) -> _Result:
+    """Convert a parsed expression to a timezone, for :func:`compute_results`.
+
+    :param code: The result code of :func:`parse_expression`.
+    :param where: The name of the timezone, as queried.
+    :param timezone: The timezone.
+    :param datetime: The datetime of the expression, local if naive.
+    :param stopwatch: Times the stages of the conversion, if given.
+    :returns: The result of the timezone, as in :func:`process_input`.
+    """
 
     if code == ExprCode.TZ_DATEAT:
-        datetime, timezone = reverse_trip(datetime, timezone)
-
-    raw_result = datetime.astimezone(timezone)
-    result = format_datetime(raw_result)
+        datetime, here = reverse_trip(datetime, timezone)
+        if stopwatch:
+            stopwatch.lap(instrument.LOCALIZE)
+        raw_result = datetime.astimezone(here)
+    else:
+        raw_result = datetime.astimezone(timezone)
+    if stopwatch:
+        stopwatch.lap(instrument.CONVERT)
 
     description = generate_description(code, where, datetime)
-
-    return result, description, "images/icon.png"
+    result = (format_datetime(raw_result), description, "images/icon.png")
+    if stopwatch:
+        stopwatch.lap(instrument.FORMAT)
+    return result
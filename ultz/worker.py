@@ -0,0 +1,102 @@
+"""Processing of the queries in a background thread.
+
+ulauncher sends a query at each keystroke. Processing them in the event handler would
+make the newer keystrokes wait behind a slow query, for example one building a
+timezone for the first time. Instead, the queries are handed to a worker thread which
+only processes the latest one, and drops the results of the queries superseded while
+they were processed.
+"""
+
+import logging
+import threading
+from typing import Callable, Generic, Optional, Tuple, TypeVar
+
+_logger = logging.getLogger(__name__)
+
+Query = TypeVar("Query")
+Result = TypeVar("Result")
+
+
+class QueryDispatcher(Generic[Query, Result]):
+    """Process the latest query in a worker thread, and deliver its result if it is
+    still the latest once processed.
+
+    :param handler: Compute the result of a query, in the worker thread.
+    :param on_result: Deliver the result of a query, in the worker thread.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Query], Result],
+        on_result: Callable[[Query, Result], None],
+    ) -> None:
+        self._handler = handler
+        self._on_result = on_result
+        self._condition = threading.Condition()
+        self._generation = 0
+        """Incremented by each new query or cancellation."""
+        self._pending: Optional[Tuple[int, Query]] = None
+        self._busy = False
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, query: Query) -> None:
+        """Process ``query`` in the background, superseding the previous queries.
+
+        :param query: The query.
+        """
+
+        with self._condition:
+            self._generation += 1
+            self._pending = (self._generation, query)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="query-worker", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify_all()
+
+    def cancel(self) -> None:
+        """Drop the pending query and the result of the one being processed."""
+
+        with self._condition:
+            self._generation += 1
+            self._pending = None
+            self._condition.notify_all()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Wait for all the submitted queries to be processed or dropped.
+
+        :param timeout: The maximum time to wait, in seconds.
+        :returns: ``False`` if the timeout expired, ``True`` otherwise.
+        """
+
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: self._pending is None and not self._busy, timeout
+            )
+
+    def _is_current(self, generation: int) -> bool:
+        with self._condition:
+            return generation == self._generation
+
+    def _run(self) -> None:
+        """The loop of the worker thread."""
+
+        while True:
+            with self._condition:
+                self._busy = False
+                self._condition.notify_all()
+                while self._pending is None:
+                    self._condition.wait()
+                generation, query = self._pending
+                self._pending = None
+                self._busy = True
+
+            try:
+                result = self._handler(query)
+                if self._is_current(generation):
+                    self._on_result(query, result)
+                else:
+                    _logger.debug("Dropped the result of a superseded query")
+            except Exception:  # pylint: disable=broad-except
+                _logger.exception("Error while processing a query")